@@ -4,10 +4,17 @@ from pathlib import Path
 import logging
 
 from app.db.session import db_session
-from app.db.models import Certificate, ExtractedField, Student, User
-from app.services.images import save_and_process_file, is_allowed_file
-from app.services.ocr import run_ocr
-from app.services.extract import extract_fields_with_ai, generate_ai_summary, verify_certificate_with_university
+from app.db.models import Certificate, CertificateSummary, CertificateVerification, ExtractedField, Student, User
+from app.services.images import save_and_process_file, is_allowed_file, count_uploaded_files, iter_uploaded_files
+from app.services.extract import verify_certificate_with_university, get_openai_client_stats, get_portal_client_stats
+from app.utils.circuit_breaker import get_circuit_breaker_stats
+from app.services.pipeline import process_certificate, compute_mismatch_report, save_verification_record, save_certificate_summary, NoTextExtractedError
+from app.services.jobs import new_job_id, enqueue_job, get_job, create_upload_batch, get_upload_batch
+from app.services.reverify import parse_filters, enqueue_reverify_job, get_reverify_job
+from app.services.listing import fetch_summary_page, InvalidCursorError
+from app.services.ocr_cache import ocr_cache
+from app.services.llm_cache import llm_cache
+from app.services.verification_cache import verification_cache
 from app.services.auth import generate_token, require_auth, require_user_type, get_current_user
 from app.core.config import settings
 
@@ -15,71 +22,6 @@ logger = logging.getLogger(__name__)
 api_bp = Blueprint("api", __name__)
 
 
-def _normalize_text(s: str) -> str:
-    try:
-        import re
-        s = (s or "").lower().strip()
-        s = re.sub(r"\s+", " ", s)
-        s = re.sub(r"[^a-z0-9\s]", "", s)
-        return s
-    except Exception:
-        return (s or "").strip().lower()
-
-def _parse_float(val):
-    try:
-        if val is None:
-            return None
-        s = str(val).strip()
-        if s == "" or s.lower() in {"na", "n/a", "null", "none", "-"}:
-            return None
-        return float(s)
-    except Exception:
-        return None
-
-def _compute_mismatch_report(extracted_fields: dict, verification: dict) -> dict:
-    """Compare extracted vs university data and compute simple status + per-field mismatches."""
-    report = {
-        "name": "not_available",
-        "cgpa": "not_available",
-        "sgpa": "not_available",
-    }
-
-    if not verification or not verification.get("student_verified"):
-        return {
-            "report": report,
-            "simple_status": "not verified",
-        }
-
-    matched = verification.get("matched_student") or verification.get("matched_certificate") or {}
-
-    # Name comparison
-    ext_name = extracted_fields.get("student_name")
-    uni_name = matched.get("student_name") or matched.get("name")
-    if ext_name and uni_name:
-        report["name"] = "match" if _normalize_text(ext_name) == _normalize_text(uni_name) else "mismatch"
-    else:
-        report["name"] = "not_available"
-
-    # CGPA comparison
-    ext_cgpa = _parse_float(extracted_fields.get("cgpa"))
-    uni_cgpa = _parse_float(matched.get("cgpa"))
-    if ext_cgpa is not None and uni_cgpa is not None:
-        report["cgpa"] = "match" if abs(ext_cgpa - uni_cgpa) <= 0.05 else "mismatch"
-    else:
-        report["cgpa"] = "not_available"
-
-    # SGPA comparison - usually not available in university summary; mark not_available if uni missing
-    ext_sgpa = _parse_float(extracted_fields.get("sgpa"))
-    uni_sgpa = _parse_float(matched.get("sgpa"))
-    if ext_sgpa is not None and uni_sgpa is not None:
-        report["sgpa"] = "match" if abs(ext_sgpa - uni_sgpa) <= 0.05 else "mismatch"
-    else:
-        report["sgpa"] = "not_available"
-
-    any_mismatch = any(v == "mismatch" for v in report.values())
-    simple_status = "mismatch" if any_mismatch else "verified"
-    return {"report": report, "simple_status": simple_status}
-
 # Authentication endpoints
 @api_bp.route("/auth/register", methods=['POST'])
 def register():
@@ -236,6 +178,13 @@ def simple_university_verification(extracted_fields: dict) -> dict:
         logger.error(f"Verification failed: {str(e)}")
         return verification_result
 
+def _wants_async_upload() -> bool:
+    """Async mode is chosen per request (?async=1 or form field) and defaults to ASYNC_UPLOADS."""
+    flag = request.args.get('async', request.form.get('async'))
+    if flag is None:
+        return settings.ASYNC_UPLOADS
+    return flag.strip().lower() in ('1', 'true', 'yes')
+
 @api_bp.route("/certificates/upload", methods=['POST'])
 def upload_certificate():
     try:
@@ -251,120 +200,109 @@ def upload_certificate():
 
         filename = secure_filename(file.filename)
         upload_path = Path(settings.UPLOAD_DIR)
+
+        if _wants_async_upload():
+            # Persist the file and hand the OCR/LLM stages to the job workers
+            job_id = new_job_id()
+            file_path = upload_path / f"{job_id}_{filename}"
+            processed_path, file_type = save_and_process_file(file.stream, file_path)
+            job = enqueue_job(job_id, processed_path, filename, file_type)
+            status_url = f"/api/v1/certificates/jobs/{job_id}"
+            response = jsonify({
+                "job_id": job_id,
+                "status": job["status"],
+                "stage": job["stage"],
+                "progress": job["progress"],
+                "status_url": status_url
+            })
+            response.headers['Location'] = status_url
+            return response, 202
+
         file_path = upload_path / filename
         
         processed_path, file_type = save_and_process_file(file.stream, file_path)
-        ocr_text = run_ocr(processed_path)
-        
-        if not ocr_text.strip():
-            return jsonify({"error": "No text could be extracted from the certificate. Please ensure the image is clear and readable."}), 400
-        
-        extracted_fields = extract_fields_with_ai(ocr_text)
-        summary = generate_ai_summary(extracted_fields)
+        result = process_certificate(db_session, processed_path, filename, file_type)
+        return jsonify(result), 201
         
-        # Verify certificate against university database
-        verification = verify_certificate_with_university(extracted_fields)
+    except NoTextExtractedError as e:
+        db_session.rollback()
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        db_session.rollback()
+        logger.error(f"Certificate upload failed: {str(e)}")
+        return jsonify({"error": f"Processing failed: {str(e)}"}), 500
 
-        # Compute simple status + mismatch report (name, cgpa, sgpa)
-        mismatch = _compute_mismatch_report(extracted_fields, verification)
-        
-        cert = Certificate(
-            image_path=str(processed_path), 
-            status='processed',
-            user_id=None,  # No authentication required
-            original_filename=filename
-        )
-        db_session.add(cert)
-        db_session.flush()
-        
-        # Store extracted fields with proper typing
-        for key, value in extracted_fields.items():
-            if value and value != "null":
-                field = ExtractedField(
-                    certificate_id=cert.id, 
-                    key=key, 
-                    value=str(value), 
-                    confidence=0.9,  # High confidence for AI extraction
-                    field_type='extracted'
-                )
-                db_session.add(field)
-        
-        # Store AI summary
-        summary_field = ExtractedField(
-            certificate_id=cert.id, 
-            key='ai_summary', 
-            value=summary, 
-            confidence=1.0,
-            field_type='ai_summary'
-        )
-        db_session.add(summary_field)
-        
-        # Store verification results
-        verification_field = ExtractedField(
-            certificate_id=cert.id,
-            key='verification_result',
-            value=str(verification),
-            confidence=verification.get('confidence_score', 0.0),
-            field_type='verification'
-        )
-        db_session.add(verification_field)
-
-        # Store simple status and mismatch report as separate fields for retrieval
-        simple_status_field = ExtractedField(
-            certificate_id=cert.id,
-            key='verification_simple_status',
-            value=mismatch.get('simple_status'),
-            confidence=1.0,
-            field_type='verification'
-        )
-        db_session.add(simple_status_field)
-
-        mismatch_report_field = ExtractedField(
-            certificate_id=cert.id,
-            key='verification_mismatch_report',
-            value=str(mismatch.get('report')),
-            confidence=1.0,
-            field_type='verification'
-        )
-        db_session.add(mismatch_report_field)
+@api_bp.route("/certificates/upload/batch", methods=['POST'])
+def upload_certificate_batch():
+    """Queue many certificates at once (several 'files' and/or ZIP archives) as background jobs."""
+    saved_paths = []
+    try:
+        uploads = request.files.getlist('files') + request.files.getlist('file')
+        if not any(upload.filename for upload in uploads):
+            return jsonify({"error": "No files provided"}), 400
 
-        db_session.commit()
-        
-        # Create structured tabular response with enhanced fields
-        tabular_data = {
-            "student_name": extracted_fields.get("student_name", "-"),
-            "enrollment_number": extracted_fields.get("enrollment_number", "-"),
-            "degree": extracted_fields.get("degree", "-"),
-            "branch": extracted_fields.get("branch", "-"),
-            "university_name": extracted_fields.get("university_name", "-"),
-            "graduation_date": extracted_fields.get("graduation_date", "-"),
-            "date_of_birth": extracted_fields.get("date_of_birth", "-"),
-            "grade": extracted_fields.get("grade", "-"),
-            "certificate_type": extracted_fields.get("certificate_type", "-"),
-            "semester": extracted_fields.get("semester", "-"),
-            "academic_year": extracted_fields.get("academic_year", "-"),
-            "sgpa": extracted_fields.get("sgpa", "-"),
-            "cgpa": extracted_fields.get("cgpa", "-"),
-            "total_credits": extracted_fields.get("total_credits", "-"),
-            "earned_credits": extracted_fields.get("earned_credits", "-"),
-            "subjects": extracted_fields.get("subjects", [])
-        }
+        if count_uploaded_files(uploads) > settings.UPLOAD_BATCH_MAX_FILES:
+            return jsonify({"error": f"Too many files (max {settings.UPLOAD_BATCH_MAX_FILES} per batch)"}), 413
+
+        upload_path = Path(settings.UPLOAD_DIR)
+        batch_id = new_job_id()
+        items = []
+        accepted = []
+        for filename, stream, error in iter_uploaded_files(uploads):
+            item = {"index": len(items), "filename": filename, "job_id": None}
+            items.append(item)
+            if error:
+                item["error"] = error
+                continue
+
+            job_id = new_job_id()
+            safe_name = secure_filename(filename.rsplit('/', 1)[-1]) or "certificate"
+            try:
+                processed_path, file_type = save_and_process_file(stream, upload_path / f"{job_id}_{safe_name}")
+            except ValueError as e:
+                item["error"] = str(e)
+                continue
+            saved_paths.append(processed_path)
+            item["job_id"] = job_id
+            accepted.append((job_id, processed_path, safe_name, file_type))
+
+        batch = create_upload_batch(batch_id, items, accepted)
+        status_url = f"/api/v1/certificates/upload/batch/{batch_id}"
+        response = jsonify({**batch, "status_url": status_url})
+        response.headers['Location'] = status_url
+        return response, 202
+
+    except Exception as e:
+        for path in saved_paths:
+            path.unlink(missing_ok=True)
+        logger.error(f"Batch upload failed: {str(e)}")
+        return jsonify({"error": f"Batch upload failed: {str(e)}"}), 500
+
+@api_bp.route("/certificates/upload/batch/<batch_id>", methods=['GET'])
+def get_upload_batch_status(batch_id: str):
+    """Report per-item status of a batch upload."""
+    try:
+        batch = get_upload_batch(batch_id)
+        if not batch:
+            return jsonify({"error": "Batch not found"}), 404
+        return jsonify(batch)
         
-        return jsonify({
-            "id": cert.id,
-            "file_type": file_type,
-            "summary": summary,
-            "tabular_data": tabular_data,
-            "verification": verification,
-            "mismatch": mismatch.get('report'),
-            "simple_status": mismatch.get('simple_status'),
-            "confidence_score": verification.get('confidence_score', 0.0)
-        }), 201
+    except Exception as e:
+        logger.error(f"Failed to get upload batch {batch_id}: {str(e)}")
+        return jsonify({"error": "Failed to fetch batch status"}), 500
+
+@api_bp.route("/certificates/jobs/<job_id>", methods=['GET'])
+def get_processing_job(job_id: str):
+    """Report the status/progress of a background upload job."""
+    try:
+        job = get_job(job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(job)
         
     except Exception as e:
-        db_session.rollback()
-        logger.error(f"Certificate upload failed: {str(e)}")
-        return jsonify({"error": f"Processing failed: {str(e)}"}), 500
+        logger.error(f"Failed to get job {job_id}: {str(e)}")
+        return jsonify({"error": "Failed to fetch job status"}), 500
 
 @api_bp.route("/certificates", methods=['GET'])
 def list_certificates():
@@ -372,49 +310,44 @@ def list_certificates():
         limit = min(int(request.args.get('limit', 20)), 100)
         offset = int(request.args.get('offset', 0))
         
-        certs = db_session.query(Certificate).order_by(Certificate.created_at.desc()).limit(limit).offset(offset).all()
+        cursor = request.args.get('cursor')
+        
+        # Single-table read from the denormalized listing rows (?cursor= selects keyset paging)
+        rows, next_cursor = fetch_summary_page(db_session, limit, offset=offset, cursor=cursor)
         
         result = []
-        for cert in certs:
-            # Build map of extracted fields for quick lookup
-            fields_map = {}
-            verification_map = None
-            for f in cert.fields:
-                if f.field_type == 'extracted':
-                    fields_map[f.key] = f.value
-                elif f.field_type == 'verification' and f.key == 'verification_result':
-                    try:
-                        import ast
-                        verification_map = ast.literal_eval(f.value)
-                    except Exception:
-                        verification_map = None
-            
-            # Simple status for listing
-            mismatch = _compute_mismatch_report(fields_map, verification_map or {})
-
+        for row in rows:
             tabular_data = {
-                "student_name": fields_map.get("student_name", "-"),
-                "degree": fields_map.get("degree", "-"),
-                "branch": fields_map.get("branch", "-"),
-                "university_name": fields_map.get("university_name", "-"),
-                "enrollment_number": fields_map.get("enrollment_number", "-"),
-                "sgpa": fields_map.get("sgpa", "-"),
-                "cgpa": fields_map.get("cgpa", "-"),
-                "semester": fields_map.get("semester", "-"),
-                "academic_year": fields_map.get("academic_year", "-")
+                "student_name": row.student_name or "-",
+                "degree": row.degree or "-",
+                "branch": row.branch or "-",
+                "university_name": row.university_name or "-",
+                "enrollment_number": row.enrollment_number or "-",
+                "sgpa": row.sgpa or "-",
+                "cgpa": row.cgpa or "-",
+                "semester": row.semester or "-",
+                "academic_year": row.academic_year or "-"
             }
             
             result.append({
-                "id": cert.id,
-                "status": cert.status,
-                "created_at": cert.created_at.isoformat(),
-                "original_filename": cert.original_filename,
+                "id": row.certificate_id,
+                "status": row.status,
+                "created_at": row.created_at.isoformat(),
+                "original_filename": row.original_filename,
                 "tabular_data": tabular_data,
-                "simple_status": mismatch.get('simple_status')
+                "simple_status": row.simple_status
             })
         
-        return jsonify({"certificates": result, "count": len(result), "limit": limit, "offset": offset})
+        return jsonify({
+            "certificates": result,
+            "count": len(result),
+            "limit": limit,
+            "offset": offset if cursor is None else None,
+            "next_cursor": next_cursor
+        })
         
+    except InvalidCursorError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Failed to list certificates: {str(e)}")
         return jsonify({"error": "Failed to fetch certificates"}), 500
@@ -429,20 +362,18 @@ def get_certificate(cert_id: int):
         # Extract structured data from fields
         extracted_fields = {}
         summary = ""
-        verification = {}
         
         for field in cert.fields:
             if field.field_type == 'ai_summary':
                 summary = field.value
-            elif field.field_type == 'verification':
-                if field.key == 'verification_result':
-                    try:
-                        import ast
-                        verification = ast.literal_eval(field.value)
-                    except:
-                        verification = {"student_verified": False, "enrollment_verified": False, "confidence_score": 0.0}
             elif field.field_type == 'extracted':
                 extracted_fields[field.key] = {"value": field.value, "confidence": field.confidence}
+
+        record = cert.verification_record
+        verification = (record.verification if record else None) or {
+            "student_verified": False, "enrollment_verified": False, "confidence_score": 0.0
+        }
+        stored_extraction = (record.extracted if record else None) or {}
         
         # Create structured tabular data with enhanced fields
         tabular_data = {
@@ -461,12 +392,14 @@ def get_certificate(cert_id: int):
             "cgpa": extracted_fields.get("cgpa", {}).get("value", "-"),
             "total_credits": extracted_fields.get("total_credits", {}).get("value", "-"),
             "earned_credits": extracted_fields.get("earned_credits", {}).get("value", "-"),
-            "subjects": extracted_fields.get("subjects", {}).get("value", [])
+            "subjects": stored_extraction.get("subjects") or extracted_fields.get("subjects", {}).get("value", [])
         }
         
-        # Compute mismatch and simple status on the fly
-        flat_extracted = {k: v.get('value') for k, v in extracted_fields.items()}
-        mismatch = _compute_mismatch_report(flat_extracted, verification)
+        if record and record.simple_status:
+            mismatch = {"report": record.mismatch_report, "simple_status": record.simple_status}
+        else:
+            flat_extracted = {k: v.get('value') for k, v in extracted_fields.items()}
+            mismatch = compute_mismatch_report(flat_extracted, verification)
 
         return jsonify({
             "id": cert.id,
@@ -546,8 +479,8 @@ def export_certificate_data(cert_id: int):
         summary = summary_field.value if summary_field else None
         
         # Get verification data
-        verification_field = next((f for f in cert.fields if f.key == 'verification'), None)
-        verification = verification_field.value if verification_field else None
+        record = cert.verification_record
+        verification = record.verification if record else None
         
         export_data = {
             "certificate_id": cert.id,
@@ -580,66 +513,14 @@ def reverify_certificate(cert_id: int):
             if field.field_type == 'extracted':
                 extracted_fields[field.key] = field.value
         
-        # Re-verify with university
-        verification = verify_certificate_with_university(extracted_fields)
+        # Re-verify with university (?refresh=1 bypasses the verification cache)
+        use_cache = request.args.get('refresh', '').lower() not in ('1', 'true', 'yes')
+        verification = verify_certificate_with_university(extracted_fields, use_cache=use_cache)
         
-        # Update verification field in database
-        verification_field = db_session.query(ExtractedField).filter(
-            ExtractedField.certificate_id == cert_id,
-            ExtractedField.key == 'verification_result'
-        ).first()
-        
-        if verification_field:
-            verification_field.value = str(verification)
-            verification_field.confidence = verification.get('confidence_score', 0.0)
-        else:
-            verification_field = ExtractedField(
-                certificate_id=cert.id,
-                key='verification_result',
-                value=str(verification),
-                confidence=verification.get('confidence_score', 0.0),
-                field_type='verification'
-            )
-            db_session.add(verification_field)
-
-        # Recompute and store simple status + mismatch report
-        extracted_fields_flat = {}
-        for field in cert.fields:
-            if field.field_type == 'extracted':
-                extracted_fields_flat[field.key] = field.value
-        mismatch = _compute_mismatch_report(extracted_fields_flat, verification)
-
-        # simple status
-        simple_status_field = db_session.query(ExtractedField).filter(
-            ExtractedField.certificate_id == cert_id,
-            ExtractedField.key == 'verification_simple_status'
-        ).first()
-        if simple_status_field:
-            simple_status_field.value = mismatch.get('simple_status')
-        else:
-            db_session.add(ExtractedField(
-                certificate_id=cert.id,
-                key='verification_simple_status',
-                value=mismatch.get('simple_status'),
-                confidence=1.0,
-                field_type='verification'
-            ))
-
-        # mismatch report
-        mismatch_field = db_session.query(ExtractedField).filter(
-            ExtractedField.certificate_id == cert_id,
-            ExtractedField.key == 'verification_mismatch_report'
-        ).first()
-        if mismatch_field:
-            mismatch_field.value = str(mismatch.get('report'))
-        else:
-            db_session.add(ExtractedField(
-                certificate_id=cert.id,
-                key='verification_mismatch_report',
-                value=str(mismatch.get('report')),
-                confidence=1.0,
-                field_type='verification'
-            ))
+        # Recompute simple status + mismatch report and update the JSON verification record
+        mismatch = compute_mismatch_report(extracted_fields, verification)
+        save_verification_record(db_session, cert.id, verification, mismatch)
+        save_certificate_summary(db_session, cert, simple_status=mismatch.get('simple_status'))
         
         db_session.commit()
         
@@ -656,6 +537,43 @@ def reverify_certificate(cert_id: int):
         logger.error(f"Re-verification failed: {str(e)}")
         return jsonify({"error": f"Re-verification failed: {str(e)}"}), 500
 
+@api_bp.route("/certificates/reverify-all", methods=['POST'])
+def reverify_all_certificates():
+    """Queue a background job that re-verifies all (or filtered) certificates in portal batches."""
+    try:
+        args = {**request.args.to_dict(), **(request.get_json(silent=True) or {})}
+        try:
+            filters = parse_filters(args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        job, created = enqueue_reverify_job(new_job_id(), filters)
+        status_url = f"/api/v1/certificates/reverify-all/{job['job_id']}"
+        response = jsonify({
+            **job,
+            "created": created,
+            "status_url": status_url
+        })
+        response.headers['Location'] = status_url
+        return response, 202
+        
+    except Exception as e:
+        logger.error(f"Failed to queue re-verification: {str(e)}")
+        return jsonify({"error": f"Failed to queue re-verification: {str(e)}"}), 500
+
+@api_bp.route("/certificates/reverify-all/<job_id>", methods=['GET'])
+def get_reverify_all_job(job_id: str):
+    """Report progress and throughput of a bulk re-verification job."""
+    try:
+        job = get_reverify_job(job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(job)
+        
+    except Exception as e:
+        logger.error(f"Failed to get re-verification job {job_id}: {str(e)}")
+        return jsonify({"error": "Failed to fetch job status"}), 500
+
 @api_bp.route("/certificates/my-certificates", methods=['GET'])
 def get_my_certificates():
     """Get certificates for the current user"""
@@ -663,24 +581,31 @@ def get_my_certificates():
         limit = min(int(request.args.get('limit', 20)), 100)
         offset = int(request.args.get('offset', 0))
         
-        query = db_session.query(Certificate)  # Return all certificates since no auth
-        certs = query.order_by(Certificate.created_at.desc()).limit(limit).offset(offset).all()
+        cursor = request.args.get('cursor')
+        
+        # Return all certificates since no auth
+        rows, next_cursor = fetch_summary_page(db_session, limit, offset=offset, cursor=cursor)
         
         result = []
-        for cert in certs:
-            summary_field = next((f for f in cert.fields if f.key == 'ai_summary'), None)
-            summary = summary_field.value if summary_field else "No summary available"
-            
+        for row in rows:
             result.append({
-                "id": cert.id,
-                "status": cert.status,
-                "created_at": cert.created_at.isoformat(),
-                "original_filename": cert.original_filename,
-                "summary": summary[:200] + "..." if len(summary) > 200 else summary
+                "id": row.certificate_id,
+                "status": row.status,
+                "created_at": row.created_at.isoformat(),
+                "original_filename": row.original_filename,
+                "summary": row.summary or "No summary available"
             })
         
-        return jsonify({"certificates": result, "count": len(result), "limit": limit, "offset": offset})
+        return jsonify({
+            "certificates": result,
+            "count": len(result),
+            "limit": limit,
+            "offset": offset if cursor is None else None,
+            "next_cursor": next_cursor
+        })
         
+    except InvalidCursorError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Failed to get user certificates: {str(e)}")
         return jsonify({"error": "Failed to fetch certificates"}), 500
@@ -697,6 +622,8 @@ def delete_all_certificates():
             return jsonify({"message": "No certificates to delete", "deleted": 0})
         
         # Delete all certificates (cascade will delete extracted fields)
+        db_session.query(CertificateSummary).delete()
+        db_session.query(CertificateVerification).delete()
         db_session.query(Certificate).delete()
         db_session.commit()
         
@@ -725,6 +652,12 @@ def health_check():
             "service": "University Certificate Verifier API",
             "ai_status": api_key_status,
             "version": "1.0.0",
+            "ocr_cache": ocr_cache.get_stats(),
+            "llm_client": get_openai_client_stats(),
+            "llm_cache": llm_cache.get_stats(),
+            "university_portal": get_portal_client_stats(),
+            "circuit_breakers": get_circuit_breaker_stats(),
+            "verification_cache": verification_cache.get_stats(),
             "features": [
                 "AI-powered certificate extraction",
                 "OCR text recognition", 
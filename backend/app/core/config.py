@@ -11,6 +11,36 @@ class Settings:
         self.OPENAI_API_KEY: str | None = os.environ.get("OPENAI_API_KEY")
         # Optional: custom base URL for OpenAI-compatible APIs (e.g., OpenRouter)
         self.OPENAI_BASE_URL: str | None = os.environ.get("OPENAI_BASE_URL")
+        # Return the one-line summary from the extraction call instead of a second LLM round trip
+        self.AI_COMBINED_EXTRACTION: bool = os.environ.get("AI_COMBINED_EXTRACTION", "true").lower() in ("1", "true", "yes")
+        # Local cache of extraction responses keyed on normalized OCR text + prompt version + model
+        self.LLM_CACHE_ENABLED: bool = os.environ.get("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.LLM_CACHE_PATH: str = os.environ.get("LLM_CACHE_PATH", "./llm_cache.db")
+        self.LLM_CACHE_TTL_SECONDS: int = int(os.environ.get("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+        self.LLM_CACHE_MAX_ENTRIES: int = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "5000"))
+        # Connection pool for the shared OpenAI/OpenRouter HTTP client
+        self.OPENAI_MAX_CONNECTIONS: int = int(os.environ.get("OPENAI_MAX_CONNECTIONS", "20"))
+        self.OPENAI_MAX_KEEPALIVE: int = int(os.environ.get("OPENAI_MAX_KEEPALIVE", "10"))
+        self.OPENAI_KEEPALIVE_EXPIRY: float = float(os.environ.get("OPENAI_KEEPALIVE_EXPIRY", "120"))
+        self.OPENAI_HTTP2: bool = os.environ.get("OPENAI_HTTP2", "true").lower() in ("1", "true", "yes")
+        # University portal verification: pooled keep-alive session with connect retries
+        self.UNIVERSITY_PORTAL_URL: str = os.environ.get("UNIVERSITY_PORTAL_URL", "http://localhost:3000").rstrip("/")
+        self.PORTAL_POOL_SIZE: int = int(os.environ.get("PORTAL_POOL_SIZE", "10"))
+        self.PORTAL_CONNECT_TIMEOUT: float = float(os.environ.get("PORTAL_CONNECT_TIMEOUT", "3.05"))
+        self.PORTAL_READ_TIMEOUT: float = float(os.environ.get("PORTAL_READ_TIMEOUT", "10"))
+        self.PORTAL_MAX_RETRIES: int = int(os.environ.get("PORTAL_MAX_RETRIES", "3"))
+        self.PORTAL_BACKOFF_FACTOR: float = float(os.environ.get("PORTAL_BACKOFF_FACTOR", "0.2"))
+        # Cache of portal verification results keyed on normalized enrollment number + name
+        self.VERIFICATION_CACHE_ENABLED: bool = os.environ.get("VERIFICATION_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.VERIFICATION_CACHE_TTL_SECONDS: int = int(os.environ.get("VERIFICATION_CACHE_TTL_SECONDS", "3600"))
+        self.VERIFICATION_CACHE_NEGATIVE_TTL_SECONDS: int = int(os.environ.get("VERIFICATION_CACHE_NEGATIVE_TTL_SECONDS", "300"))
+        self.VERIFICATION_CACHE_MAX_ENTRIES: int = int(os.environ.get("VERIFICATION_CACHE_MAX_ENTRIES", "10000"))
+        # Circuit breakers around the portal and the LLM provider (per process)
+        self.BREAKER_FAILURE_RATE: float = float(os.environ.get("BREAKER_FAILURE_RATE", "0.5"))
+        self.BREAKER_MIN_CALLS: int = int(os.environ.get("BREAKER_MIN_CALLS", "5"))
+        self.BREAKER_WINDOW_SECONDS: float = float(os.environ.get("BREAKER_WINDOW_SECONDS", "60"))
+        self.BREAKER_OPEN_SECONDS: float = float(os.environ.get("BREAKER_OPEN_SECONDS", "30"))
+        self.BREAKER_HALF_OPEN_CALLS: int = int(os.environ.get("BREAKER_HALF_OPEN_CALLS", "1"))
         self.UPLOAD_DIR: str = os.environ.get("UPLOAD_DIR", "./uploads")
         self.MAX_FILE_SIZE: int = int(os.environ.get("MAX_FILE_SIZE", "10485760"))  # 10MB
         self.LOG_LEVEL: str = os.environ.get("LOG_LEVEL", "INFO")
@@ -18,6 +48,31 @@ class Settings:
         self.JWT_SECRET: str = os.environ.get("JWT_SECRET", "default-secret-change-in-production")
         self.PORT: int = int(os.environ.get("PORT", "5000"))
         self.HOST: str = os.environ.get("HOST", "0.0.0.0")
+
+        # OCR: rasterization DPI, language and process pool size for multi-page scanned PDFs
+        self.OCR_DPI: int = int(os.environ.get("OCR_DPI", "300"))
+        self.OCR_LANG: str = os.environ.get("OCR_LANG", "eng")
+        self.OCR_WORKERS: int = int(os.environ.get("OCR_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+        # OCR result cache keyed on file content + OCR settings
+        self.OCR_CACHE_ENABLED: bool = os.environ.get("OCR_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.OCR_CACHE_DIR: str = os.environ.get("OCR_CACHE_DIR", "./ocr_cache")
+        self.OCR_CACHE_MAX_BYTES: int = int(os.environ.get("OCR_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))  # 256MB
+        self.OCR_CACHE_MEMORY_ENTRIES: int = int(os.environ.get("OCR_CACHE_MEMORY_ENTRIES", "128"))
+
+        # Background upload processing (POST /certificates/upload?async=1)
+        self.ASYNC_UPLOADS: bool = os.environ.get("ASYNC_UPLOADS", "false").lower() in ("1", "true", "yes")
+        self.JOB_WORKERS: int = int(os.environ.get("JOB_WORKERS", "2"))
+        self.JOB_POLL_INTERVAL: float = float(os.environ.get("JOB_POLL_INTERVAL", "2"))
+        self.JOB_STALE_SECONDS: int = int(os.environ.get("JOB_STALE_SECONDS", "900"))
+        # Batch uploads (POST /certificates/upload/batch) and per-process stage concurrency:
+        # at most OCR_MAX_CONCURRENCY items are OCR'd and LLM_MAX_CONCURRENCY sent to the
+        # provider at once, whatever JOB_WORKERS is set to
+        self.UPLOAD_BATCH_MAX_FILES: int = int(os.environ.get("UPLOAD_BATCH_MAX_FILES", "500"))
+        self.OCR_MAX_CONCURRENCY: int = int(os.environ.get("OCR_MAX_CONCURRENCY", str(os.cpu_count() or 1)))
+        self.LLM_MAX_CONCURRENCY: int = int(os.environ.get("LLM_MAX_CONCURRENCY", "4"))
+        # Bulk re-verification (POST /certificates/reverify-all): certificates per portal batch / commit
+        self.REVERIFY_BATCH_SIZE: int = int(os.environ.get("REVERIFY_BATCH_SIZE", "200"))
         
         # Create upload directory
         Path(self.UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
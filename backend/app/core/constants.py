@@ -21,6 +21,23 @@ class CertificateStatus:
     COMPLETED = "completed"
     FAILED = "failed"
 
+# Background Job Status
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+# Background Job Stages (stage name -> progress percentage)
+JOB_STAGE_PROGRESS = {
+    "queued": 0,
+    "ocr": 10,
+    "extraction": 40,
+    "verification": 75,
+    "saving": 90,
+    "done": 100,
+}
+
 # User Types
 class UserType:
     STUDENT = "student"
@@ -51,6 +68,7 @@ class ResponseMessages:
 class StatusCode:
     OK = 200
     CREATED = 201
+    ACCEPTED = 202
     BAD_REQUEST = 400
     UNAUTHORIZED = 401
     FORBIDDEN = 403
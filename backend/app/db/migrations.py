@@ -0,0 +1,139 @@
+"""
+Data migrations run at application startup (and from the standalone scripts).
+"""
+import ast
+import logging
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload
+
+from app.db.models import Certificate, CertificateSummary, CertificateVerification, ExtractedField
+
+logger = logging.getLogger(__name__)
+
+LEGACY_VERIFICATION_KEYS = ('verification_result', 'verification_simple_status', 'verification_mismatch_report')
+
+
+def _literal(value):
+    try:
+        return ast.literal_eval(value) if value else None
+    except Exception:
+        return None
+
+
+def convert_legacy_verification_fields(session, batch_size: int = 500) -> int:
+    """
+    Move verification results stored as str(dict) in extracted_fields into
+    certificate_verifications JSON columns, then delete the legacy rows.
+
+    Certificates are processed in batches and each batch is committed, so the
+    conversion can be interrupted and resumed. Returns the number of
+    certificates converted.
+    """
+    converted = 0
+    while True:
+        cert_ids = [
+            row[0] for row in session.query(ExtractedField.certificate_id)
+            .filter(ExtractedField.key.in_(LEGACY_VERIFICATION_KEYS))
+            .distinct()
+            .limit(batch_size)
+            .all()
+        ]
+        if not cert_ids:
+            break
+
+        legacy_rows = session.query(ExtractedField).filter(
+            ExtractedField.certificate_id.in_(cert_ids),
+            ExtractedField.key.in_(LEGACY_VERIFICATION_KEYS)
+        ).all()
+        existing = {
+            rec.certificate_id: rec for rec in session.query(CertificateVerification)
+            .filter(CertificateVerification.certificate_id.in_(cert_ids))
+            .all()
+        }
+        valid_ids = {
+            row[0] for row in session.query(Certificate.id).filter(Certificate.id.in_(cert_ids)).all()
+        }
+
+        by_cert: dict[int, dict] = {}
+        for row in legacy_rows:
+            by_cert.setdefault(row.certificate_id, {})[row.key] = row
+
+        for cert_id, rows in by_cert.items():
+            # Rows left behind by deleted certificates are simply dropped;
+            # certificates already migrated keep their JSON record
+            if cert_id in valid_ids and cert_id not in existing:
+                verification = _literal(rows['verification_result'].value) if 'verification_result' in rows else None
+                status_row = rows.get('verification_simple_status')
+                report_row = rows.get('verification_mismatch_report')
+                session.add(CertificateVerification(
+                    certificate_id=cert_id,
+                    verification=verification if isinstance(verification, dict) else None,
+                    mismatch_report=_literal(report_row.value) if report_row else None,
+                    simple_status=status_row.value if status_row else None,
+                    confidence_score=(verification or {}).get('confidence_score', 0.0) if isinstance(verification, dict) else 0.0
+                ))
+                converted += 1
+            for row in rows.values():
+                session.delete(row)
+
+        session.commit()
+
+    if converted:
+        logger.info(f"Converted verification results of {converted} certificate(s) to JSON")
+    return converted
+
+
+def backfill_certificate_summaries(session, batch_size: int = 500) -> int:
+    """
+    Build certificate_summaries rows for certificates that do not have one yet
+    (created before the table existed). Returns the number of rows written.
+    """
+    from app.services.pipeline import save_certificate_summary
+
+    written = 0
+    while True:
+        certs = (
+            session.query(Certificate)
+            .outerjoin(CertificateSummary, CertificateSummary.certificate_id == Certificate.id)
+            .filter(CertificateSummary.certificate_id.is_(None))
+            .options(selectinload(Certificate.fields), selectinload(Certificate.verification_record))
+            .limit(batch_size)
+            .all()
+        )
+        if not certs:
+            break
+
+        for cert in certs:
+            extracted = {f.key: f.value for f in cert.fields if f.field_type == 'extracted'}
+            summary = next((f.value for f in cert.fields if f.key == 'ai_summary'), None)
+            record = cert.verification_record
+            simple_status = record.simple_status if record and record.simple_status else "not verified"
+            save_certificate_summary(session, cert, extracted, summary, simple_status)
+            written += 1
+
+        session.commit()
+
+    if written:
+        logger.info(f"Backfilled {written} certificate summary row(s)")
+    return written
+
+
+def ensure_indexes(engine, tables: tuple = (CertificateSummary.__table__,)) -> list[str]:
+    """
+    Create indexes declared on the models that are missing from existing
+    tables (create_all only adds indexes when it creates the table).
+    """
+    inspector = inspect(engine)
+    created = []
+    for table in tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {ix['name'] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine)
+                created.append(index.name)
+    if created:
+        logger.info(f"Created missing indexes: {', '.join(created)}")
+    return created
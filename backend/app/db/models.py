@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, Index, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, Index, Boolean, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.session import Base
 import hashlib
 import secrets
 
+# Native JSON storage: JSONB on PostgreSQL, JSON (text-backed) elsewhere
+JSONType = JSON().with_variant(JSONB(), 'postgresql')
+
 class User(Base):
     __tablename__ = 'users'
     
@@ -79,6 +83,8 @@ class Certificate(Base):
     user = relationship('User', back_populates='certificates')
     student = relationship('Student', back_populates='certificates')
     fields = relationship('ExtractedField', back_populates='certificate', cascade='all, delete-orphan')
+    verification_record = relationship('CertificateVerification', back_populates='certificate', uselist=False, cascade='all, delete-orphan')
+    summary_record = relationship('CertificateSummary', back_populates='certificate', uselist=False, cascade='all, delete-orphan')
     
     __table_args__ = (
         Index('idx_certificates_user_id', 'user_id'),
@@ -104,4 +110,110 @@ class ExtractedField(Base):
         Index('idx_extracted_fields_key', 'key'),
         Index('idx_extracted_fields_type', 'field_type'),
         Index('idx_extracted_fields_cert_key', 'certificate_id', 'key'),  # Composite index for faster lookups
-    )
\ No newline at end of file
+    )
+
+class CertificateVerification(Base):
+    __tablename__ = 'certificate_verifications'
+    
+    id = Column(Integer, primary_key=True)
+    certificate_id = Column(Integer, ForeignKey('certificates.id', ondelete='CASCADE'), unique=True, nullable=False)
+    extracted = Column(JSONType, nullable=True)  # Validated AI extraction result (including subjects)
+    verification = Column(JSONType, nullable=True)  # University portal verification result
+    mismatch_report = Column(JSONType, nullable=True)  # Per-field match/mismatch report
+    simple_status = Column(String(20), nullable=True)  # 'verified', 'mismatch', 'not verified'
+    confidence_score = Column(Float, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    certificate = relationship('Certificate', back_populates='verification_record')
+    
+    __table_args__ = (
+        Index('idx_certificate_verifications_status', 'simple_status'),
+    )
+
+
+class CertificateSummary(Base):
+    """Denormalized listing row per certificate, kept in sync at upload/reverify time."""
+    __tablename__ = 'certificate_summaries'
+    
+    certificate_id = Column(Integer, ForeignKey('certificates.id', ondelete='CASCADE'), primary_key=True)
+    created_at = Column(DateTime, nullable=False)  # Copy of certificates.created_at for index-only listing
+    status = Column(String(50), nullable=False)
+    original_filename = Column(String(255), nullable=True)
+    student_name = Column(String(200), nullable=True)
+    enrollment_number = Column(String(100), nullable=True)
+    degree = Column(String(200), nullable=True)
+    branch = Column(String(200), nullable=True)
+    university_name = Column(String(255), nullable=True)
+    semester = Column(String(50), nullable=True)
+    academic_year = Column(String(50), nullable=True)
+    cgpa = Column(String(20), nullable=True)
+    sgpa = Column(String(20), nullable=True)
+    simple_status = Column(String(20), default='not verified', nullable=False)
+    summary = Column(Text, nullable=True)  # AI summary snippet (max ~200 chars)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    certificate = relationship('Certificate', back_populates='summary_record')
+    
+    __table_args__ = (
+        Index('idx_certificate_summaries_created_at_id', 'created_at', 'certificate_id'),  # Keyset pagination
+        Index('idx_certificate_summaries_enrollment', 'enrollment_number'),
+        Index('idx_certificate_summaries_status', 'simple_status'),
+    )
+
+
+class ProcessingJob(Base):
+    __tablename__ = 'processing_jobs'
+    
+    id = Column(String(32), primary_key=True)
+    status = Column(String(20), default='queued', nullable=False)  # 'queued', 'running', 'completed', 'failed'
+    stage = Column(String(50), default='queued', nullable=False)
+    progress = Column(Integer, default=0, nullable=False)
+    file_path = Column(String(500), nullable=False)
+    original_filename = Column(String(255), nullable=True)
+    file_type = Column(String(20), nullable=True)
+    certificate_id = Column(Integer, ForeignKey('certificates.id', ondelete='SET NULL'), nullable=True)
+    result = Column(Text, nullable=True)  # JSON payload identical to the synchronous upload response
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        Index('idx_processing_jobs_status_created', 'status', 'created_at'),
+    )
+
+
+class UploadBatch(Base):
+    """A multi-file / ZIP upload; each accepted item is a processing_jobs row."""
+    __tablename__ = 'upload_batches'
+    
+    id = Column(String(32), primary_key=True)
+    items = Column(JSONType, nullable=False)  # [{"index", "filename", "job_id" or None, "error"?}, ...]
+    total = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ReverificationJob(Base):
+    """Background re-verification of stored certificates against the university portal."""
+    __tablename__ = 'reverification_jobs'
+    
+    id = Column(String(32), primary_key=True)
+    status = Column(String(20), default='queued', nullable=False)  # 'queued', 'running', 'completed', 'failed'
+    filters = Column(JSONType, nullable=True)  # status / simple_status / created_from / created_to / refresh
+    total = Column(Integer, default=0, nullable=False)
+    processed = Column(Integer, default=0, nullable=False)
+    verified = Column(Integer, default=0, nullable=False)
+    mismatched = Column(Integer, default=0, nullable=False)
+    not_verified = Column(Integer, default=0, nullable=False)
+    last_certificate_id = Column(Integer, default=0, nullable=False)  # keyset checkpoint, so a re-queued job resumes
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        Index('idx_reverification_jobs_status_created', 'status', 'created_at'),
+    )
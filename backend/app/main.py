@@ -49,6 +49,32 @@ def create_app() -> Flask:
         print(f"Migration note: {e}")
         pass
 
+    # Convert str()-encoded verification rows to the JSON verification table and
+    # build listing summaries / indexes for data created before they existed
+    try:
+        from app.db.session import get_db_session
+        from app.db.migrations import convert_legacy_verification_fields, backfill_certificate_summaries, ensure_indexes
+        with get_db_session() as session:
+            convert_legacy_verification_fields(session)
+            backfill_certificate_summaries(session)
+        ensure_indexes(get_engine())
+    except Exception as e:
+        print(f"Migration note: {e}")
+
+    # Drop cached LLM responses produced by older extraction prompts
+    if settings.LLM_CACHE_ENABLED:
+        try:
+            from app.services.llm_cache import llm_cache
+            from app.services.extract import current_prompt_versions
+            llm_cache.purge_other_versions(current_prompt_versions())
+        except Exception as e:
+            print(f"LLM cache note: {e}")
+
+    # Drain any queued background uploads left over from a previous run
+    if settings.ASYNC_UPLOADS:
+        from app.services.jobs import ensure_workers
+        ensure_workers()
+
     @app.teardown_appcontext
     def remove_session(exception=None):
         db_session.remove()
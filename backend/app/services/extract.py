@@ -1,14 +1,58 @@
 from app.core.config import settings
+from app.services.llm_cache import llm_cache
+from app.services.verification_cache import verification_cache
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
 import openai
 import json
 import logging
 import re
 import os
+import hashlib
+import importlib.util
+import random
+import threading
+import time
 import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Shared OpenAI client (one per process) and its connection metrics
+_client: openai.OpenAI | None = None
+_client_pid: int | None = None
+_client_lock = threading.Lock()
+_client_stats = {"clients_created": 0, "requests": 0, "connections_opened": 0}
+
+# Breakers that short-circuit calls to a failing portal / LLM provider
+def _breaker(name: str) -> CircuitBreaker:
+    return CircuitBreaker(
+        name,
+        failure_rate=settings.BREAKER_FAILURE_RATE,
+        min_calls=settings.BREAKER_MIN_CALLS,
+        window_seconds=settings.BREAKER_WINDOW_SECONDS,
+        open_seconds=settings.BREAKER_OPEN_SECONDS,
+        half_open_calls=settings.BREAKER_HALF_OPEN_CALLS
+    )
+
+portal_breaker = _breaker("university_portal")
+llm_breaker = _breaker("llm_provider")
+# Provider errors that mean the dependency itself is failing (not a bad request or key)
+_LLM_OUTAGE_ERRORS = (openai.APIConnectionError, openai.InternalServerError, openai.RateLimitError)
+
+# Shared keep-alive session for university portal verification (one per process)
+_portal_session: requests.Session | None = None
+_portal_session_pid: int | None = None
+_portal_lock = threading.Lock()
+# Upper bounds (ms) of the portal latency histogram buckets; the last bucket is unbounded
+PORTAL_LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+_portal_stats = {"requests": 0, "errors": 0, "timeouts": 0, "retries": 0, "connections_opened": 0}
+_portal_latency_counts = [0] * (len(PORTAL_LATENCY_BUCKETS_MS) + 1)
+_portal_latency_sum_ms = 0.0
+
 # --- Shared Utilities ---
 
 def _clear_proxy_env_vars():
@@ -37,6 +81,21 @@ def _model_id() -> str:
     or_model = "openai/gpt-4o-mini"
     return or_model if _using_openrouter() else default_model
 
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional 'h2' package (pip install httpx[http2])."""
+    return settings.OPENAI_HTTP2 and importlib.util.find_spec("h2") is not None
+
+def _trace_connection(event_name: str, info: dict):
+    if event_name == "connection.connect_tcp.complete":
+        with _client_lock:
+            _client_stats["connections_opened"] += 1
+
+def _count_request(request: httpx.Request):
+    with _client_lock:
+        _client_stats["requests"] += 1
+    # httpcore reports connection lifecycle events through the 'trace' extension
+    request.extensions["trace"] = _trace_connection
+
 def _init_openai_client() -> openai.OpenAI:
     """Initialize OpenAI/OpenRouter client with consistent configuration."""
     if not settings.OPENAI_API_KEY:
@@ -45,11 +104,257 @@ def _init_openai_client() -> openai.OpenAI:
         )
     _clear_proxy_env_vars()
     base_url = _determine_base_url()
+    http_client = httpx.Client(
+        http2=_http2_available(),
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE,
+            keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(60.0, connect=10.0),
+        event_hooks={"request": [_count_request]}
+    )
     return openai.OpenAI(
         api_key=settings.OPENAI_API_KEY,
         base_url=base_url,
-        http_client=httpx.Client()
+        http_client=http_client
+    )
+
+def _get_openai_client() -> openai.OpenAI:
+    """
+    Return the process-wide OpenAI client, creating it on first use.
+
+    The client (and its keep-alive connection pool) is shared by all requests
+    in a process. It is keyed on the PID so that a gunicorn worker never reuses
+    sockets inherited from its parent across fork().
+    """
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = _init_openai_client()
+            _client_pid = os.getpid()
+            _client_stats["clients_created"] += 1
+            logger.info(f"Created shared OpenAI client (http2={_http2_available()}) in process {_client_pid}")
+        return _client
+
+def _reset_openai_client():
+    """Drop the inherited client in a forked child; it is re-created lazily."""
+    global _client, _client_pid
+    _client = None
+    _client_pid = None
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_openai_client)
+
+def get_openai_client_stats() -> dict:
+    """Connection reuse metrics for the shared OpenAI client in this process."""
+    with _client_lock:
+        stats = dict(_client_stats)
+    requests_made = stats["requests"]
+    reused = max(0, requests_made - stats["connections_opened"])
+    stats["connections_reused"] = reused
+    stats["reuse_ratio"] = round(reused / requests_made, 3) if requests_made else 0.0
+    stats["http2"] = _http2_available()
+    return stats
+
+class _JitteredRetry(Retry):
+    """Retry with full-jitter exponential backoff, counting every retry in the portal stats."""
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        return random.uniform(0, backoff) if backoff > 0 else 0
+
+    def increment(self, *args, **kwargs):
+        retry = super().increment(*args, **kwargs)  # raises once retries are exhausted
+        with _portal_lock:
+            _portal_stats["retries"] += 1
+        return retry
+
+def _count_portal_connection():
+    with _portal_lock:
+        _portal_stats["connections_opened"] += 1
+
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        super().connect()
+        _count_portal_connection()
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        super().connect()
+        _count_portal_connection()
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+class _PortalAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools count every new TCP connection in the portal stats."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+def _init_portal_session() -> requests.Session:
+    """Keep-alive session whose adapter retries connection failures only.
+
+    Connect errors mean the request never reached the portal, so retrying is
+    safe even for POST; read errors and HTTP error statuses are not retried.
+    """
+    retry = _JitteredRetry(
+        total=settings.PORTAL_MAX_RETRIES,
+        connect=settings.PORTAL_MAX_RETRIES,
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=settings.PORTAL_BACKOFF_FACTOR,
+        raise_on_status=False
     )
+    adapter = _PortalAdapter(
+        pool_connections=1,
+        pool_maxsize=settings.PORTAL_POOL_SIZE,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({'Content-Type': 'application/json'})
+    return session
+
+def _get_portal_session() -> requests.Session:
+    """Return the process-wide portal session, keyed on the PID like the OpenAI client."""
+    global _portal_session, _portal_session_pid
+    with _portal_lock:
+        if _portal_session is None or _portal_session_pid != os.getpid():
+            _portal_session = _init_portal_session()
+            _portal_session_pid = os.getpid()
+            logger.info(f"Created shared university portal session in process {_portal_session_pid}")
+        return _portal_session
+
+def _reset_portal_session():
+    """Drop the inherited session in a forked child; it is re-created lazily."""
+    global _portal_session, _portal_session_pid
+    _portal_session = None
+    _portal_session_pid = None
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_portal_session)
+
+def _record_portal_latency(elapsed_ms: float, error: bool = False, timeout: bool = False):
+    global _portal_latency_sum_ms
+    bucket = len(PORTAL_LATENCY_BUCKETS_MS)
+    for i, bound in enumerate(PORTAL_LATENCY_BUCKETS_MS):
+        if elapsed_ms <= bound:
+            bucket = i
+            break
+    with _portal_lock:
+        _portal_stats["requests"] += 1
+        _portal_stats["errors"] += int(error)
+        _portal_stats["timeouts"] += int(timeout)
+        _portal_latency_counts[bucket] += 1
+        _portal_latency_sum_ms += elapsed_ms
+
+def _portal_request(method: str, path: str, **kwargs) -> requests.Response:
+    """
+    Call the university portal over the shared session, recording its latency.
+
+    Raises CircuitOpenError without touching the network while the portal
+    breaker is open; connection errors, timeouts and 5xx responses count as
+    portal failures.
+    """
+    portal_breaker.before_call()
+    start = time.perf_counter()
+    try:
+        response = _get_portal_session().request(
+            method,
+            f"{settings.UNIVERSITY_PORTAL_URL}{path}",
+            timeout=(settings.PORTAL_CONNECT_TIMEOUT, settings.PORTAL_READ_TIMEOUT),
+            **kwargs
+        )
+    except requests.exceptions.Timeout:
+        _record_portal_latency((time.perf_counter() - start) * 1000, error=True, timeout=True)
+        portal_breaker.record_failure()
+        raise
+    except requests.exceptions.RequestException:
+        _record_portal_latency((time.perf_counter() - start) * 1000, error=True)
+        portal_breaker.record_failure()
+        raise
+    except BaseException:
+        # No response came back, but not because the portal is down
+        portal_breaker.release()
+        raise
+    _record_portal_latency((time.perf_counter() - start) * 1000, error=response.status_code >= 500)
+    if response.status_code >= 500:
+        portal_breaker.record_failure()
+    else:
+        portal_breaker.record_success()
+    return response
+
+def _portal_post(path: str, payload) -> requests.Response:
+    return _portal_request('POST', path, json=payload)
+
+def refresh_verification_cache_version() -> bool:
+    """
+    Invalidation hook for the verification cache: fetch the portal registry
+    version (the /api/stats ETag, which changes with metadata.last_updated)
+    and drop cached results if it moved. The request is conditional, so an
+    unchanged registry costs a bodiless 304.
+
+    Returns True if cached results were invalidated.
+    """
+    headers = {}
+    version = verification_cache.get_stats()["portal_version"]
+    if version:
+        headers['If-None-Match'] = version
+    try:
+        response = _portal_request('GET', '/api/stats', headers=headers)
+    except Exception as e:
+        logger.warning(f"Could not check university portal version: {str(e)}")
+        return False
+    if response.status_code not in (200, 304):
+        return False
+    return verification_cache.set_version(response.headers.get('ETag'))
+
+def _llm_completion(**kwargs):
+    """
+    Run a chat completion on the shared client behind the LLM breaker.
+
+    Raises CircuitOpenError immediately while the provider is considered down.
+    """
+    llm_breaker.before_call()
+    try:
+        response = _get_openai_client().chat.completions.create(**kwargs)
+    except _LLM_OUTAGE_ERRORS:
+        llm_breaker.record_failure()
+        raise
+    except BaseException:
+        # Auth/bad-request errors and interrupts say nothing about an outage
+        llm_breaker.release()
+        raise
+    llm_breaker.record_success()
+    return response
+
+def get_portal_client_stats() -> dict:
+    """Request counts and latency histogram for university portal calls in this process."""
+    with _portal_lock:
+        stats = dict(_portal_stats)
+        counts = list(_portal_latency_counts)
+        latency_sum = _portal_latency_sum_ms
+    stats["pool_size"] = settings.PORTAL_POOL_SIZE
+    stats["timeouts_s"] = {"connect": settings.PORTAL_CONNECT_TIMEOUT, "read": settings.PORTAL_READ_TIMEOUT}
+    stats["latency_ms"] = {
+        "buckets": {
+            **{f"le_{bound}": count for bound, count in zip(PORTAL_LATENCY_BUCKETS_MS, counts)},
+            "inf": counts[-1]
+        },
+        "mean": round(latency_sum / stats["requests"], 2) if stats["requests"] else 0.0
+    }
+    return stats
 
 def _clean_json_response(response_text: str) -> dict:
     """Clean and parse JSON response from OpenAI, handling markdown fences."""
@@ -80,16 +385,23 @@ def _validate_extracted_fields(result: dict) -> dict:
 
 # --- AI Extraction ---
 
-def extract_fields_with_ai(ocr_text: str) -> dict:
-    """
-    AI-powered field extraction using OpenAI API.
-    Returns structured tabular data for certificate information.
-    STRICTLY REQUIRES OpenAI API key - no fallback to pattern matching.
-    """
-    try:
-        client = _init_openai_client()
+EXTRACTION_PROMPT_VERSION = "1"
 
-        prompt = f"""
+_SUMMARY_SCHEMA_FIELD = ''',
+    "summary": "single-line summary (max 200 chars)"'''
+
+_SUMMARY_RULES = '''
+8. "summary" is a SINGLE LINE (max 200 chars) in a professional tone with no markdown.
+   Order: Name → Degree → University → Performance; include enrollment number, key dates
+   (DD/MM/YYYY) and CGPA/SGPA when available.
+   Examples: "Prashant Singh - B.Tech CSE from Jaypee University (CGPA: 6.1)",
+   "Semester 1 Result: John Doe - B.E. Electronics (SGPA: 8.2)"'''
+
+def _build_extraction_prompt(ocr_text: str, include_summary: bool = False) -> str:
+    """Build the field extraction prompt, optionally asking for the one-line summary too."""
+    summary_field = _SUMMARY_SCHEMA_FIELD if include_summary else ""
+    summary_rules = _SUMMARY_RULES if include_summary else ""
+    return f"""
 You are an AI assistant specialized in extracting structured information from university/college certificates, academic transcripts, and examination results.
 
 Analyze the following text and return ONLY a JSON object with these fields:
@@ -110,7 +422,7 @@ Analyze the following text and return ONLY a JSON object with these fields:
     "cgpa": "numerical value",
     "subjects": [{{"subject_code": "...", "subject_name": "...", "grade": "...", "credits": "..."}}],
     "total_credits": "...",
-    "earned_credits": "..."
+    "earned_credits": "..."{summary_field}
 }}
 
 CRITICAL RULES:
@@ -120,25 +432,55 @@ CRITICAL RULES:
 4. Extract embedded patterns (e.g., "Enrollment No : 231B225").
 5. Prioritize numerical grades (6.1, 8.5).
 6. Extract subjects as array of objects with code, name, grade, credits.
-7. Format dates strictly as DD/MM/YYYY.
+7. Format dates strictly as DD/MM/YYYY.{summary_rules}
 
 Text to analyze:
 {ocr_text}
-        """.strip()
+    """.strip()
+
+def _prompt_version(include_summary: bool = False) -> str:
+    """
+    Identify the prompt template used for extraction.
+
+    Bump EXTRACTION_PROMPT_VERSION for semantic changes; any edit to the
+    template text also changes the hash, so cached responses never outlive
+    the prompt that produced them.
+    """
+    template_hash = hashlib.sha256(_build_extraction_prompt("", include_summary).encode("utf-8")).hexdigest()[:12]
+    return f"{EXTRACTION_PROMPT_VERSION}:{'combined' if include_summary else 'fields'}:{template_hash}"
+
+def current_prompt_versions() -> list[str]:
+    return [_prompt_version(False), _prompt_version(True)]
+
+def _request_extraction(ocr_text: str, include_summary: bool = False) -> dict:
+    """Run the extraction prompt (or serve it from the response cache) and return the validated JSON object."""
+    cache_key = None
+    if settings.LLM_CACHE_ENABLED:
+        prompt_version = _prompt_version(include_summary)
+        model = _model_id()
+        cache_key = llm_cache.make_key(ocr_text, prompt_version, model)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            logger.info("AI extraction served from response cache")
+            return cached
+
+    raw_response = None
+    try:
+        prompt = _build_extraction_prompt(ocr_text, include_summary)
 
-        response = client.chat.completions.create(
+        response = _llm_completion(
             model=_model_id(),
             messages=[{"role": "user", "content": prompt}],
             response_format={"type": "json_object"},
             temperature=0.1,
-            max_tokens=1500
+            max_tokens=1700 if include_summary else 1500
         )
 
         raw_response = response.choices[0].message.content
         parsed = _clean_json_response(raw_response)
         validated_result = _validate_extracted_fields(parsed)
-
-        logger.info(f"AI extraction completed successfully - extracted {sum(1 for v in validated_result.values() if v)} fields")
+        if cache_key:
+            llm_cache.put(cache_key, prompt_version, model, validated_result)
         return validated_result
 
     except json.JSONDecodeError as e:
@@ -148,6 +490,37 @@ Text to analyze:
         logger.error(f"OpenAI extraction failed: {str(e)}")
         raise RuntimeError(f"AI-powered extraction failed: {str(e)}")
 
+def extract_fields_with_ai(ocr_text: str) -> dict:
+    """
+    AI-powered field extraction using OpenAI API.
+    Returns structured tabular data for certificate information.
+    STRICTLY REQUIRES OpenAI API key - no fallback to pattern matching.
+    """
+    validated_result = _request_extraction(ocr_text)
+    logger.info(f"AI extraction completed successfully - extracted {sum(1 for v in validated_result.values() if v)} fields")
+    return validated_result
+
+def extract_fields_and_summary(ocr_text: str) -> tuple[dict, str]:
+    """
+    Extract certificate fields and the one-line summary.
+
+    With AI_COMBINED_EXTRACTION enabled both come back from a single model
+    call; otherwise (or if the combined response has no usable summary) the
+    summary is generated by the separate generate_ai_summary call.
+    """
+    if not settings.AI_COMBINED_EXTRACTION:
+        extracted_fields = extract_fields_with_ai(ocr_text)
+        return extracted_fields, generate_ai_summary(extracted_fields)
+
+    validated_result = _request_extraction(ocr_text, include_summary=True)
+    summary = validated_result.pop("summary", None)
+    logger.info(f"AI combined extraction completed - extracted {sum(1 for v in validated_result.values() if v)} fields")
+
+    if not isinstance(summary, str) or not summary:
+        logger.warning("Combined extraction returned no summary - falling back to separate summary call")
+        return validated_result, generate_ai_summary(validated_result)
+    return validated_result, summary
+
 # --- AI Summary Generation ---
 
 def generate_ai_summary(extracted_fields: dict) -> str:
@@ -157,8 +530,6 @@ def generate_ai_summary(extracted_fields: dict) -> str:
     STRICTLY REQUIRES OpenAI API key.
     """
     try:
-        client = _init_openai_client()
-
         # Build summary context (excluding 'subjects' for brevity)
         fields_summary = "\n".join([
             f"{key.replace('_', ' ').title()}: {value}"
@@ -195,7 +566,7 @@ Examples:
 Return ONLY the summary text.
         """.strip()
 
-        response = client.chat.completions.create(
+        response = _llm_completion(
             model=_model_id(),
             messages=[{"role": "user", "content": prompt}],
             temperature=0.1,
@@ -314,34 +685,131 @@ def generate_summary_fallback(extracted_fields: dict) -> str:
 
 # --- University Database Verification ---
 
-def verify_certificate_with_university(extracted_data: dict) -> dict:
+def verify_certificate_with_university(extracted_data: dict, use_cache: bool = True) -> dict:
     """
     Verify extracted certificate data against the university database.
     
+    Results are served from (and stored in) the verification cache unless
+    use_cache is False.
+    
     Args:
         extracted_data: Dictionary containing extracted certificate fields
+        use_cache: Whether a cached portal answer may be returned
         
     Returns:
         Dictionary containing verification results
     """
-    try:
-        # University portal URL (from environment or fallback to localhost)
-        university_base_url = os.getenv('UNIVERSITY_PORTAL_URL', 'http://localhost:3000')
-        university_api_url = f"{university_base_url}/api/verify"
-        
-        # Extract key fields for verification
-        student_name = extracted_data.get('student_name', '').strip()
-        enrollment_number = extracted_data.get('enrollment_number', '').strip()
-        
-        if not student_name or not enrollment_number:
+    # Extract key fields for verification
+    student_name = (extracted_data.get('student_name') or '').strip()
+    enrollment_number = (extracted_data.get('enrollment_number') or '').strip()
+    
+    if not student_name or not enrollment_number:
+        return {
+            'student_verified': False,
+            'confidence_score': 0.0,
+            'message': 'Insufficient data for university verification',
+            'matched_student': None,
+            'verification_attempted': False
+        }
+    
+    if use_cache:
+        cached = verification_cache.get(enrollment_number, student_name)
+        if cached is not None:
+            logger.info(f"Verification for {enrollment_number} served from cache")
+            return cached
+    
+    result = _request_portal_verification(student_name, enrollment_number)
+    verification_cache.put(enrollment_number, student_name, result)
+    return result
+
+def _portal_answer_to_verification(university_response: dict, student_name: str) -> dict:
+    """Map one /api/verify (or /api/verify/batch item) answer to a verification result."""
+    if university_response.get('success'):
+        if university_response.get('verified'):
+            logger.info(f"Certificate verified successfully for {student_name}")
+            return {
+                'student_verified': True,
+                'confidence_score': university_response.get('confidence_score', 1.0),
+                'message': 'Certificate verified against university database',
+                'matched_student': university_response.get('matched_certificate'),
+                'verification_attempted': True,
+                'verification_timestamp': university_response.get('verification_timestamp')
+            }
+        else:
+            logger.info(f"Certificate not found in university database for {student_name}")
             return {
+                'student_verified': False,
+                'confidence_score': 0.0,
+                'message': university_response.get('message', 'Certificate not found in university database'),
+                'matched_student': None,
+                'verification_attempted': True,
+                'searched_for': university_response.get('searched_for')
+            }
+    else:
+        logger.error(f"University API returned error: {university_response.get('error')}")
+        return {
+            'student_verified': False,
+            'confidence_score': 0.0,
+            'message': f"University verification failed: {university_response.get('error')}",
+            'matched_student': None,
+            'verification_attempted': False
+        }
+
+def verify_certificates_with_university_batch(extracted_items: list[dict], use_cache: bool = True) -> list[dict]:
+    """
+    Verify many extracted records with one /api/verify/batch call.
+
+    Cached answers are used where available and only the rest is sent to the
+    portal. Unlike verify_certificate_with_university, transport failures
+    (portal unavailable, timeouts, HTTP errors) raise instead of turning into
+    "unavailable" results, so bulk callers can stop instead of overwriting
+    stored results.
+
+    Args:
+        extracted_items: Dictionaries with student_name, enrollment_number and optional cgpa
+        use_cache: Whether cached portal answers may be used
+
+    Returns:
+        list: One verification result per item, in order
+    """
+    results: list[dict | None] = [None] * len(extracted_items)
+    pending = []
+    for i, extracted in enumerate(extracted_items):
+        student_name = str(extracted.get('student_name') or '').strip()
+        enrollment_number = str(extracted.get('enrollment_number') or '').strip()
+        if not student_name or not enrollment_number:
+            results[i] = {
                 'student_verified': False,
                 'confidence_score': 0.0,
                 'message': 'Insufficient data for university verification',
                 'matched_student': None,
                 'verification_attempted': False
             }
-        
+            continue
+        cached = verification_cache.get(enrollment_number, student_name) if use_cache else None
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append((i, student_name, enrollment_number))
+
+    if pending:
+        logger.info(f"Verifying {len(pending)} certificate(s) in one portal batch ({len(extracted_items) - len(pending)} served locally)")
+        response = _portal_post('/api/verify/batch', {
+            'items': [{'student_name': name, 'enrollment_number': enrollment} for _, name, enrollment in pending]
+        })
+        if response.status_code != 200:
+            raise RuntimeError(f"University batch verification failed (HTTP {response.status_code})")
+        answers = response.json().get('results') or []
+        if len(answers) != len(pending):
+            raise RuntimeError(f"University batch verification returned {len(answers)} results for {len(pending)} items")
+        for (i, student_name, enrollment_number), answer in zip(pending, answers):
+            results[i] = _portal_answer_to_verification(answer, student_name)
+            verification_cache.put(enrollment_number, student_name, results[i])
+    return results
+
+def _request_portal_verification(student_name: str, enrollment_number: str) -> dict:
+    """Ask the portal's /api/verify about one student and map the answer to a verification result."""
+    try:
         # Prepare verification request
         verification_data = {
             'student_name': student_name,
@@ -350,47 +818,11 @@ def verify_certificate_with_university(extracted_data: dict) -> dict:
         
         logger.info(f"Verifying certificate for: {student_name} (Enrollment: {enrollment_number})")
         
-        # Send verification request to university portal
-        response = requests.post(
-            university_api_url,
-            json=verification_data,
-            headers={'Content-Type': 'application/json'},
-            timeout=10
-        )
+        # Send verification request to university portal (pooled keep-alive session)
+        response = _portal_post('/api/verify', verification_data)
         
         if response.status_code == 200:
-            university_response = response.json()
-            
-            if university_response.get('success'):
-                if university_response.get('verified'):
-                    logger.info(f"Certificate verified successfully for {student_name}")
-                    return {
-                        'student_verified': True,
-                        'confidence_score': university_response.get('confidence_score', 1.0),
-                        'message': 'Certificate verified against university database',
-                        'matched_student': university_response.get('matched_certificate'),
-                        'verification_attempted': True,
-                        'verification_timestamp': university_response.get('verification_timestamp')
-                    }
-                else:
-                    logger.info(f"Certificate not found in university database for {student_name}")
-                    return {
-                        'student_verified': False,
-                        'confidence_score': 0.0,
-                        'message': university_response.get('message', 'Certificate not found in university database'),
-                        'matched_student': None,
-                        'verification_attempted': True,
-                        'searched_for': university_response.get('searched_for')
-                    }
-            else:
-                logger.error(f"University API returned error: {university_response.get('error')}")
-                return {
-                    'student_verified': False,
-                    'confidence_score': 0.0,
-                    'message': f"University verification failed: {university_response.get('error')}",
-                    'matched_student': None,
-                    'verification_attempted': False
-                }
+            return _portal_answer_to_verification(response.json(), student_name)
         else:
             logger.error(f"University API request failed with status {response.status_code}")
             return {
@@ -401,6 +833,15 @@ def verify_certificate_with_university(extracted_data: dict) -> dict:
                 'verification_attempted': False
             }
             
+    except CircuitOpenError as e:
+        logger.warning(f"University verification skipped: {str(e)}")
+        return {
+            'student_verified': False,
+            'confidence_score': 0.0,
+            'message': 'University database is currently unavailable',
+            'matched_student': None,
+            'verification_attempted': False
+        }
     except requests.exceptions.ConnectionError:
         logger.warning("University portal is not accessible - verification skipped")
         return {
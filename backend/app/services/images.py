@@ -1,6 +1,8 @@
 from pathlib import Path
 from PIL import Image
 import logging
+import shutil
+import zipfile
 
 from app.core.config import settings
 
@@ -11,15 +13,98 @@ ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'pdf', 'tiff', 'bmp', 'webp'}
 def is_allowed_file(filename: str) -> bool:
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def is_zip_file(filename: str) -> bool:
+    return filename.lower().endswith('.zip')
+
+def _is_skipped_member(member: zipfile.ZipInfo) -> bool:
+    """Directories and OS metadata (__MACOSX/, dotfiles) are not certificates."""
+    name = member.filename
+    return member.is_dir() or name.startswith('__MACOSX/') or name.rsplit('/', 1)[-1].startswith('.')
+
+def count_uploaded_files(uploads) -> int:
+    """
+    Number of items iter_uploaded_files() will yield, read from the ZIP
+    central directories only, so a batch can be rejected before anything
+    is written to disk.
+    """
+    count = 0
+    for upload in uploads:
+        if not upload.filename:
+            continue
+        if not is_zip_file(upload.filename):
+            count += 1
+            continue
+        try:
+            with zipfile.ZipFile(upload.stream) as archive:
+                count += sum(1 for member in archive.infolist() if not _is_skipped_member(member))
+        except zipfile.BadZipFile:
+            count += 1
+        upload.stream.seek(0)
+    return count
+
+def iter_uploaded_files(uploads):
+    """
+    Yield (filename, stream, error) for every certificate in a batch upload.
+
+    Plain files are yielded as they are. ZIP archives are expanded member by
+    member: each member is read straight out of the archive, so it reaches
+    disk once (in save_and_process_file) and is never extracted separately.
+    Members that cannot be processed are yielded with stream None and an
+    error message.
+    """
+    for upload in uploads:
+        if not upload.filename:
+            continue
+        if not is_zip_file(upload.filename):
+            if is_allowed_file(upload.filename):
+                yield upload.filename, upload.stream, None
+            else:
+                yield upload.filename, None, "Invalid file type"
+            continue
+
+        try:
+            archive = zipfile.ZipFile(upload.stream)
+        except zipfile.BadZipFile:
+            yield upload.filename, None, "Invalid or corrupted ZIP archive"
+            continue
+        with archive:
+            for member in archive.infolist():
+                if _is_skipped_member(member):
+                    continue
+                name = member.filename
+                if not is_allowed_file(name.rsplit('/', 1)[-1]):
+                    yield name, None, "Invalid file type"
+                    continue
+                if member.file_size > settings.MAX_FILE_SIZE:
+                    yield name, None, f"File exceeds {settings.MAX_FILE_SIZE} bytes"
+                    continue
+                try:
+                    # Encrypted members and unsupported compression fail here
+                    stream = archive.open(member)
+                except Exception as e:
+                    yield name, None, f"Cannot read archive member: {str(e)}"
+                    continue
+                with stream:
+                    yield name, stream, None
+
 def save_and_process_file(stream, dest: Path) -> tuple[Path, str]:
     """
     Save and process uploaded file for AI processing.
     Simplified version for AI-focused certificate verifier.
+
+    Raises ValueError (and leaves nothing on disk) if the upload cannot be
+    read or is not a valid image/PDF.
     """
     dest.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(dest, 'wb') as f:
-        f.write(stream.read())
+    # Copy in chunks so large uploads (and ZIP members) never sit in memory whole.
+    # Reading a corrupt ZIP member raises zlib.error / BadZipFile mid-copy.
+    try:
+        with open(dest, 'wb') as f:
+            shutil.copyfileobj(stream, f, 1024 * 1024)
+    except Exception as e:
+        dest.unlink(missing_ok=True)
+        raise ValueError(f"Could not read uploaded file: {str(e)}")
     
     file_ext = dest.suffix.lower()
     
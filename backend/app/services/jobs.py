@@ -0,0 +1,301 @@
+"""
+Background processing of certificate uploads (and bulk re-verification jobs, see reverify.py).
+
+Jobs are rows in the processing_jobs table. Every process that serves the
+API runs a small pool of worker threads which claim queued rows with a
+conditional UPDATE, so several gunicorn workers can share one queue without
+an external broker.
+"""
+from datetime import datetime, timedelta
+from pathlib import Path
+import json
+import logging
+import os
+import threading
+import uuid
+
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.constants import JobStatus, JOB_STAGE_PROGRESS
+from app.db.models import ProcessingJob, UploadBatch
+from app.db.session import get_db_session
+from app.services.pipeline import process_certificate
+from app.services.reverify import claim_next_reverify_job, run_reverify_job, requeue_stale_reverify_jobs
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_wakeup = threading.Event()
+_workers: list[threading.Thread] = []
+_workers_pid: int | None = None
+
+
+def new_job_id() -> str:
+    """Return a fresh, URL-safe job identifier."""
+    return uuid.uuid4().hex
+
+
+def enqueue_job(job_id: str, file_path: Path, original_filename: str, file_type: str) -> dict:
+    """Persist a queued job for an already-saved upload and wake the workers."""
+    return enqueue_jobs([(job_id, file_path, original_filename, file_type)])[0]
+
+
+def enqueue_jobs(uploads: list[tuple[str, Path, str, str]]) -> list[dict]:
+    """Queue (job_id, file_path, original_filename, file_type) uploads in one transaction."""
+    with get_db_session() as session:
+        jobs = [
+            ProcessingJob(
+                id=job_id,
+                status=JobStatus.QUEUED,
+                stage="queued",
+                progress=0,
+                file_path=str(file_path),
+                original_filename=original_filename,
+                file_type=file_type
+            )
+            for job_id, file_path, original_filename, file_type in uploads
+        ]
+        session.add_all(jobs)
+        session.flush()
+        job_infos = [_serialize_job(job) for job in jobs]
+
+    ensure_workers()
+    wake_workers()
+    for job_id, _, original_filename, _ in uploads:
+        logger.info(f"Queued processing job {job_id} for {original_filename}")
+    return job_infos
+
+
+def create_upload_batch(batch_id: str, items: list[dict], uploads: list[tuple[str, Path, str, str]]) -> dict:
+    """
+    Queue the accepted files of a batch upload and record the batch.
+
+    Args:
+        batch_id: New batch identifier
+        items: One {"index", "filename", "job_id", "error"} entry per submitted file
+        uploads: (job_id, file_path, original_filename, file_type) of the accepted items
+    """
+    with get_db_session() as session:
+        session.add(UploadBatch(id=batch_id, items=items, total=len(items)))
+    if uploads:
+        enqueue_jobs(uploads)
+    logger.info(f"Queued upload batch {batch_id}: {len(uploads)} of {len(items)} file(s) accepted")
+    return get_upload_batch(batch_id)
+
+
+def get_upload_batch(batch_id: str) -> dict | None:
+    """Return a batch with the current status of each item, or None if it does not exist."""
+    with get_db_session() as session:
+        batch = session.get(UploadBatch, batch_id)
+        if batch is None:
+            return None
+        job_ids = [item["job_id"] for item in batch.items if item.get("job_id")]
+        jobs = {}
+        for start in range(0, len(job_ids), 500):
+            for job in session.query(ProcessingJob).filter(ProcessingJob.id.in_(job_ids[start:start + 500])):
+                jobs[job.id] = job
+
+        counts = {status: 0 for status in (JobStatus.QUEUED, JobStatus.RUNNING, JobStatus.COMPLETED, JobStatus.FAILED)}
+        items = []
+        for item in batch.items:
+            job = jobs.get(item.get("job_id"))
+            if job is None:
+                entry = {"index": item["index"], "filename": item["filename"], "job_id": None,
+                         "status": "rejected", "error": item.get("error")}
+            else:
+                entry = {
+                    "index": item["index"],
+                    "filename": item["filename"],
+                    "job_id": job.id,
+                    "status": job.status,
+                    "stage": job.stage,
+                    "progress": job.progress,
+                    "certificate_id": job.certificate_id,
+                }
+                if job.status == JobStatus.FAILED:
+                    entry["error"] = job.error
+                counts[job.status] = counts.get(job.status, 0) + 1
+            items.append(entry)
+
+        pending = counts[JobStatus.QUEUED] + counts[JobStatus.RUNNING]
+        return {
+            "batch_id": batch.id,
+            "status": "processing" if pending else "completed",
+            "total": batch.total,
+            "accepted": len(job_ids),
+            "rejected": batch.total - len(job_ids),
+            "counts": counts,
+            "created_at": batch.created_at.isoformat() if batch.created_at else None,
+            "items": items,
+        }
+
+
+def get_job(job_id: str) -> dict | None:
+    """Return the current state of a job, or None if it does not exist."""
+    with get_db_session() as session:
+        job = session.get(ProcessingJob, job_id)
+        return _serialize_job(job) if job else None
+
+
+def wake_workers() -> None:
+    """Make idle workers look for queued work now instead of at their next poll."""
+    _wakeup.set()
+
+
+def ensure_workers() -> None:
+    """
+    Start the worker threads for this process if they are not running.
+
+    Threads do not survive fork(), so the pool is keyed on the current PID and
+    restarted lazily inside each gunicorn worker.
+    """
+    global _workers_pid
+    with _lock:
+        pid = os.getpid()
+        if _workers_pid == pid and all(t.is_alive() for t in _workers):
+            return
+
+        _workers.clear()
+        _workers_pid = pid
+        _requeue_stale_jobs()
+        requeue_stale_reverify_jobs()
+        for i in range(max(1, settings.JOB_WORKERS)):
+            thread = threading.Thread(target=_worker_loop, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            _workers.append(thread)
+        logger.info(f"Started {len(_workers)} job worker thread(s) in process {pid}")
+
+
+def _serialize_job(job: ProcessingJob) -> dict:
+    data = {
+        "job_id": job.id,
+        "status": job.status,
+        "stage": job.stage,
+        "progress": job.progress,
+        "original_filename": job.original_filename,
+        "certificate_id": job.certificate_id,
+        "attempts": job.attempts,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+    if job.status == JobStatus.COMPLETED and job.result:
+        data["result"] = json.loads(job.result)
+    if job.status == JobStatus.FAILED:
+        data["error"] = job.error
+    return data
+
+
+def _update_job(job_id: str, **values) -> None:
+    values["updated_at"] = datetime.utcnow()
+    with get_db_session() as session:
+        session.execute(update(ProcessingJob).where(ProcessingJob.id == job_id).values(**values))
+
+
+def _requeue_stale_jobs() -> None:
+    """Put jobs whose worker died mid-run (no update for JOB_STALE_SECONDS) back in the queue."""
+    try:
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.JOB_STALE_SECONDS)
+        with get_db_session() as session:
+            result = session.execute(
+                update(ProcessingJob)
+                .where(ProcessingJob.status == JobStatus.RUNNING, ProcessingJob.updated_at < cutoff)
+                .values(status=JobStatus.QUEUED, stage="queued", progress=0, updated_at=datetime.utcnow())
+            )
+            if result.rowcount:
+                logger.warning(f"Re-queued {result.rowcount} stale processing job(s)")
+    except Exception as e:
+        logger.error(f"Failed to re-queue stale jobs: {str(e)}")
+
+
+def _claim_next_job() -> str | None:
+    """Atomically move the oldest queued job to 'running' and return its id."""
+    with get_db_session() as session:
+        candidates = (
+            session.query(ProcessingJob.id)
+            .filter(ProcessingJob.status == JobStatus.QUEUED)
+            .order_by(ProcessingJob.created_at)
+            .limit(5)
+            .all()
+        )
+        for (job_id,) in candidates:
+            now = datetime.utcnow()
+            result = session.execute(
+                update(ProcessingJob)
+                .where(ProcessingJob.id == job_id, ProcessingJob.status == JobStatus.QUEUED)
+                .values(
+                    status=JobStatus.RUNNING,
+                    attempts=ProcessingJob.attempts + 1,
+                    updated_at=now
+                )
+            )
+            if result.rowcount == 1:
+                return job_id
+    return None
+
+
+def _run_job(job_id: str) -> None:
+    with get_db_session() as session:
+        job = session.get(ProcessingJob, job_id)
+        file_path = Path(job.file_path)
+        filename = job.original_filename
+        file_type = job.file_type
+
+    def on_stage(stage: str):
+        _update_job(job_id, stage=stage, progress=JOB_STAGE_PROGRESS.get(stage, 0))
+
+    try:
+        with get_db_session() as session:
+            payload = process_certificate(session, file_path, filename, file_type, on_stage=on_stage)
+        _update_job(
+            job_id,
+            status=JobStatus.COMPLETED,
+            stage="done",
+            progress=JOB_STAGE_PROGRESS["done"],
+            certificate_id=payload["id"],
+            result=json.dumps(payload),
+            finished_at=datetime.utcnow()
+        )
+        logger.info(f"Processing job {job_id} completed (certificate {payload['id']})")
+    except Exception as e:
+        logger.error(f"Processing job {job_id} failed: {str(e)}")
+        _update_job(
+            job_id,
+            status=JobStatus.FAILED,
+            error=f"Processing failed: {str(e)}",
+            finished_at=datetime.utcnow()
+        )
+
+
+def _worker_loop() -> None:
+    while True:
+        try:
+            job_id = _claim_next_job()
+        except Exception as e:
+            logger.error(f"Failed to claim processing job: {str(e)}")
+            job_id = None
+
+        if job_id:
+            try:
+                _run_job(job_id)
+            except Exception as e:
+                logger.error(f"Worker crashed while running job {job_id}: {str(e)}")
+            continue
+
+        # Uploads first; bulk re-verification only runs on otherwise idle workers
+        try:
+            reverify_job_id = claim_next_reverify_job()
+        except Exception as e:
+            logger.error(f"Failed to claim re-verification job: {str(e)}")
+            reverify_job_id = None
+
+        if reverify_job_id:
+            try:
+                run_reverify_job(reverify_job_id)
+            except Exception as e:
+                logger.error(f"Worker crashed while running re-verification job {reverify_job_id}: {str(e)}")
+            continue
+
+        _wakeup.wait(settings.JOB_POLL_INTERVAL)
+        _wakeup.clear()
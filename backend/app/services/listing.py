@@ -0,0 +1,67 @@
+"""
+Paging over the certificate_summaries listing rows.
+
+Two modes are supported:
+- offset: ORDER BY created_at DESC, id DESC LIMIT/OFFSET (kept for compatibility)
+- keyset: WHERE (created_at, id) < cursor ORDER BY ... LIMIT, which walks the
+  (created_at, certificate_id) index and costs the same at any depth
+"""
+from datetime import datetime
+import base64
+import json
+
+from sqlalchemy import tuple_
+
+from app.db.models import CertificateSummary
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(created_at: datetime, certificate_id: int) -> str:
+    """Encode the position after a row as an opaque, URL-safe cursor."""
+    payload = json.dumps({"c": created_at.isoformat(), "i": certificate_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except Exception:
+        raise InvalidCursorError("Invalid pagination cursor")
+
+
+def fetch_summary_page(session, limit: int, offset: int = 0, cursor: str | None = None) -> tuple[list, str | None]:
+    """
+    Return one page of listing rows (newest first) and the cursor for the next page.
+
+    Args:
+        session: SQLAlchemy session
+        limit: Page size
+        offset: Rows to skip (offset mode only)
+        cursor: Cursor from a previous page; None selects offset mode, "" the first keyset page
+
+    Returns:
+        tuple: (rows, next_cursor) where next_cursor is None on the last page
+    """
+    query = session.query(CertificateSummary)
+    if cursor:
+        created_at, certificate_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(CertificateSummary.created_at, CertificateSummary.certificate_id) < (created_at, certificate_id)
+        )
+
+    query = query.order_by(CertificateSummary.created_at.desc(), CertificateSummary.certificate_id.desc())
+    if cursor is None and offset:
+        query = query.offset(offset)
+
+    # Fetch one extra row to learn whether another page exists
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].certificate_id) if has_more and rows else None
+    return rows, next_cursor
@@ -0,0 +1,148 @@
+"""
+Persistent cache for LLM extraction responses.
+
+Entries are keyed on a hash of the normalized OCR text, the prompt version
+and the model id, and stored in a local SQLite file so they survive restarts
+and are shared by every gunicorn worker on the host. Entries expire after a
+TTL and the least recently used ones are evicted past a size limit. Because
+the prompt version is part of the key, changing the prompt template
+invalidates old entries automatically; purge_other_versions() reclaims their
+space.
+"""
+from contextlib import contextmanager
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from app.core.config import settings
+from app.utils.normalization import normalize_ocr_text
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._initialized = False
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stores": 0, "evictions": 0}
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            if not self._initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS llm_responses (
+                        cache_key TEXT PRIMARY KEY,
+                        prompt_version TEXT NOT NULL,
+                        model TEXT NOT NULL,
+                        response TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        last_access REAL NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_last_access ON llm_responses (last_access)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_created_at ON llm_responses (created_at)")
+                self._initialized = True
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[name] += amount
+
+    @staticmethod
+    def make_key(ocr_text: str, prompt_version: str, model: str) -> str:
+        digest = hashlib.sha256()
+        for part in (prompt_version, model, normalize_ocr_text(ocr_text)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        try:
+            now = time.time()
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT response, created_at FROM llm_responses WHERE cache_key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self._count("misses")
+                    return None
+                if now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM llm_responses WHERE cache_key = ?", (key,))
+                    self._count("expired")
+                    self._count("misses")
+                    return None
+                conn.execute("UPDATE llm_responses SET last_access = ? WHERE cache_key = ?", (now, key))
+            self._count("hits")
+            return json.loads(row[0])
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {str(e)}")
+            self._count("misses")
+            return None
+
+    def put(self, key: str, prompt_version: str, model: str, response: dict) -> None:
+        try:
+            now = time.time()
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses "
+                    "(cache_key, prompt_version, model, response, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, prompt_version, model, json.dumps(response), now, now)
+                )
+                # Drop expired rows, then, only when over max_entries, the least
+                # recently used ones; both walk an index instead of sorting the table
+                conn.execute("DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl_seconds,))
+                excess = conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] - self.max_entries
+                evicted = 0
+                if excess > 0:
+                    evicted = conn.execute("""
+                        DELETE FROM llm_responses WHERE cache_key IN (
+                            SELECT cache_key FROM llm_responses ORDER BY last_access LIMIT ?
+                        )
+                    """, (excess,)).rowcount
+            self._count("stores")
+            if evicted > 0:
+                self._count("evictions", evicted)
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {str(e)}")
+
+    def purge_other_versions(self, prompt_versions: list[str]) -> int:
+        """Delete entries produced by prompt versions other than the given ones."""
+        placeholders = ",".join("?" for _ in prompt_versions) or "''"
+        with self._connect() as conn:
+            deleted = conn.execute(
+                f"DELETE FROM llm_responses WHERE prompt_version NOT IN ({placeholders})",
+                tuple(prompt_versions)
+            ).rowcount
+        logger.info(f"Purged {deleted} LLM cache entries from old prompt versions")
+        return deleted
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM llm_responses")
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+llm_cache = LLMResponseCache(
+    path=settings.LLM_CACHE_PATH,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES
+)
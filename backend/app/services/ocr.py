@@ -1,28 +1,108 @@
 from pathlib import Path
 from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import logging
+import multiprocessing
+import os
+import threading
 from io import BytesIO
 import pytesseract
 
+from app.core.config import settings
+from app.services.ocr_cache import ocr_cache
+
 logger = logging.getLogger(__name__)
 
+# Process pool for per-page OCR of scanned PDFs. Tesseract is CPU-bound, so
+# pages are fanned out to separate processes. The pool is created lazily and
+# keyed on the PID so each gunicorn worker builds its own after fork.
+_page_pool: ProcessPoolExecutor | None = None
+_page_pool_pid: int | None = None
+_page_pool_size: int = 0
+_page_pool_lock = threading.Lock()
+
 def _ocr_image(img: Image.Image) -> str:
     try:
         # Basic preprocessing: convert to grayscale
         if img.mode != 'L':
             img = img.convert('L')
-        text = pytesseract.image_to_string(img)
+        text = pytesseract.image_to_string(img, lang=settings.OCR_LANG)
         return text
     except Exception as e:
         logger.error(f"pytesseract OCR failed: {str(e)}")
         raise
 
 
+def _ocr_pdf_page(pdf_path: str, page_index: int, dpi: int) -> str:
+    """Render a single PDF page and OCR it (runs inside a pool worker)."""
+    try:
+        import fitz  # PyMuPDF
+        with fitz.open(pdf_path) as doc:
+            pix = doc[page_index].get_pixmap(dpi=dpi)
+        img = Image.open(BytesIO(pix.tobytes('png')))
+        return _ocr_image(img)
+    except Exception as e:
+        # Re-raise as a plain RuntimeError: some library exceptions cannot be
+        # pickled back to the parent and would otherwise break the pool
+        raise RuntimeError(f"OCR failed on page {page_index + 1}: {str(e)}")
+
+
+def _get_page_pool(workers: int) -> ProcessPoolExecutor:
+    global _page_pool, _page_pool_pid, _page_pool_size
+    with _page_pool_lock:
+        if _page_pool is None or _page_pool_pid != os.getpid() or _page_pool_size != workers:
+            if _page_pool is not None and _page_pool_pid == os.getpid():
+                _page_pool.shutdown(wait=False)
+            # 'spawn' keeps children independent of the parent's threads and DB connections
+            _page_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _page_pool_pid = os.getpid()
+            _page_pool_size = workers
+            logger.info(f"OCR page pool started with {workers} worker(s)")
+        return _page_pool
+
+
+def _reset_page_pool() -> None:
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is not None and _page_pool_pid == os.getpid():
+            _page_pool.shutdown(wait=False, cancel_futures=True)
+        _page_pool = None
+
+
+def ocr_pdf_pages(pdf_path: Path, page_count: int, dpi: int | None = None, workers: int | None = None) -> list[str]:
+    """
+    Rasterize and OCR every page of a PDF, returning page texts in page order.
+
+    Pages are distributed over the OCR process pool when more than one page
+    and more than one worker are available; otherwise they run in-process.
+    """
+    dpi = dpi or settings.OCR_DPI
+    workers = settings.OCR_WORKERS if workers is None else workers
+    indices = range(page_count)
+
+    if page_count > 1 and workers > 1:
+        try:
+            pool = _get_page_pool(workers)
+            # map() yields results in submission order, so page text is reassembled in order
+            return list(pool.map(_ocr_pdf_page, [str(pdf_path)] * page_count, indices, [dpi] * page_count))
+        except BrokenProcessPool as e:
+            logger.warning(f"OCR page pool broke, falling back to serial OCR: {str(e)}")
+            _reset_page_pool()
+
+    return [_ocr_pdf_page(str(pdf_path), i, dpi) for i in indices]
+
+
 def run_ocr(file_path: Path) -> str:
     """
     Extract text from uploaded files using Tesseract OCR.
     - For images: run OCR directly
     - For PDFs: try to extract embedded text; if none, render pages and OCR
+      them in parallel across the OCR process pool
+    Results are cached by file content, so identical re-uploads skip OCR.
     """
     try:
         ext = file_path.suffix.lower()
@@ -33,47 +113,62 @@ def run_ocr(file_path: Path) -> str:
         if ext not in ['.pdf', '.jpg', '.jpeg', '.png', '.tiff', '.bmp', '.webp']:
             raise RuntimeError(f"Unsupported file format: {ext}")
 
-        if ext == '.pdf':
-            # Try to extract text directly using PyMuPDF
-            try:
-                import fitz  # PyMuPDF
-                doc = fitz.open(str(file_path))
-                text_parts = []
-                for page in doc:
-                    t = page.get_text().strip()
-                    if t:
-                        text_parts.append(t)
-                text = "\n".join(text_parts)
-                # Fallback to image rendering + OCR if no embedded text
-                if not text.strip():
-                    for page in doc:
-                        pix = page.get_pixmap(dpi=300)
-                        img = Image.open(BytesIO(pix.tobytes('png')))
-                        text_parts.append(_ocr_image(img))
-                    text = "\n".join(text_parts)
-                if not text.strip():
-                    raise RuntimeError("No text found in PDF")
-                logger.info(f"Extracted {len(text)} characters from PDF for AI processing")
-                return text
-            except Exception as e:
-                logger.warning(f"PDF text extraction failed, falling back to OCR: {str(e)}")
-                # As a last resort, try to rasterize the first page using PIL
-                raise
-        else:
-            # Image OCR path
-            try:
-                img = Image.open(file_path)
-                width, height = img.size
-                logger.info(f"Processing image {ext}: {width}x{height} pixels")
-            except Exception as e:
-                raise RuntimeError(f"Cannot read image file: {str(e)}")
-
-            text = _ocr_image(img)
-            if not text.strip():
-                raise RuntimeError("No text detected in image")
-            logger.info(f"Extracted {len(text)} characters from image for AI processing")
-            return text
+        if not settings.OCR_CACHE_ENABLED:
+            return _extract_text(file_path, ext)
+
+        cache_key = ocr_cache.key_for_file(file_path)
+        cached = ocr_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"OCR cache hit for {file_path.name} ({len(cached)} characters)")
+            return cached
+
+        text = _extract_text(file_path, ext)
+        ocr_cache.put(cache_key, text)
+        return text
 
     except Exception as e:
         logger.error(f"Text extraction failed for {file_path}: {str(e)}")
         raise RuntimeError(f"Failed to extract text from file: {str(e)}")
+
+
+def _extract_text(file_path: Path, ext: str) -> str:
+    """Run embedded-text extraction / OCR for a validated upload (no caching)."""
+    if ext == '.pdf':
+        # Try to extract text directly using PyMuPDF
+        try:
+            import fitz  # PyMuPDF
+            doc = fitz.open(str(file_path))
+            text_parts = []
+            for page in doc:
+                t = page.get_text().strip()
+                if t:
+                    text_parts.append(t)
+            text = "\n".join(text_parts)
+            # Fallback to image rendering + OCR if no embedded text
+            if not text.strip():
+                page_count = doc.page_count
+                doc.close()
+                text_parts = ocr_pdf_pages(file_path, page_count)
+                text = "\n".join(text_parts)
+            if not text.strip():
+                raise RuntimeError("No text found in PDF")
+            logger.info(f"Extracted {len(text)} characters from PDF for AI processing")
+            return text
+        except Exception as e:
+            logger.warning(f"PDF text extraction failed, falling back to OCR: {str(e)}")
+            # As a last resort, try to rasterize the first page using PIL
+            raise
+    else:
+        # Image OCR path
+        try:
+            img = Image.open(file_path)
+            width, height = img.size
+            logger.info(f"Processing image {ext}: {width}x{height} pixels")
+        except Exception as e:
+            raise RuntimeError(f"Cannot read image file: {str(e)}")
+
+        text = _ocr_image(img)
+        if not text.strip():
+            raise RuntimeError("No text detected in image")
+        logger.info(f"Extracted {len(text)} characters from image for AI processing")
+        return text
@@ -0,0 +1,167 @@
+"""
+Content-addressed cache for OCR results.
+
+Entries are keyed on the SHA-256 of the uploaded file bytes plus the OCR
+settings that influence the output (DPI, language, Tesseract version), so a
+re-uploaded marksheet skips rasterization and OCR entirely. Results live in
+a size-bounded on-disk store (least recently used files are evicted first)
+with an optional in-process LRU tier in front of it.
+"""
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+import logging
+import os
+import threading
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _tesseract_version() -> str:
+    try:
+        import pytesseract
+        return str(pytesseract.get_tesseract_version())
+    except Exception:
+        return "unknown"
+
+
+class OCRCache:
+    def __init__(self, cache_dir: str, max_bytes: int, memory_entries: int) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes: int | None = None
+        self._engine_version: str | None = None
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+
+    # --- Keys ---
+
+    def settings_fingerprint(self) -> str:
+        """OCR settings that change the output; part of every cache key."""
+        if self._engine_version is None:
+            self._engine_version = _tesseract_version()
+        return f"dpi={settings.OCR_DPI};lang={settings.OCR_LANG};tesseract={self._engine_version}"
+
+    def key_for_file(self, file_path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        digest.update(self.settings_fingerprint().encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.txt"
+
+    # --- Lookup / store ---
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return self._memory[key]
+
+        entry = self._entry_path(key)
+        try:
+            text = entry.read_text(encoding='utf-8')
+            os.utime(entry)  # mark as recently used for LRU eviction
+        except FileNotFoundError:
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        except Exception as e:
+            logger.warning(f"OCR cache read failed for {key}: {str(e)}")
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+
+        with self._lock:
+            self.stats["disk_hits"] += 1
+            self._remember(key, text)
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        with self._lock:
+            self._remember(key, text)
+            self.stats["stores"] += 1
+
+        entry = self._entry_path(key)
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            tmp = entry.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(text, encoding='utf-8')
+            os.replace(tmp, entry)  # atomic, so concurrent readers never see partial files
+        except Exception as e:
+            logger.warning(f"OCR cache write failed for {key}: {str(e)}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += entry.stat().st_size
+            if self._disk_bytes is None or self._disk_bytes > self.max_bytes:
+                self._evict()
+
+    def _remember(self, key: str, text: str) -> None:
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        """Recount the disk store and delete least recently used entries until it fits."""
+        entries = []
+        total = 0
+        for entry in self.cache_dir.glob("*/*.txt"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+
+        if total > self.max_bytes:
+            # Trim to 90% so that eviction does not run on every subsequent store
+            target = int(self.max_bytes * 0.9)
+            for _, size, entry in sorted(entries):
+                if total <= target:
+                    break
+                entry.unlink(missing_ok=True)
+                self._memory.pop(entry.stem, None)
+                total -= size
+                self.stats["evictions"] += 1
+        self._disk_bytes = total
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            lookups = hits + self.stats["misses"]
+            return {
+                **self.stats,
+                "hits": hits,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+ocr_cache = OCRCache(
+    cache_dir=settings.OCR_CACHE_DIR,
+    max_bytes=settings.OCR_CACHE_MAX_BYTES,
+    memory_entries=settings.OCR_CACHE_MEMORY_ENTRIES
+)
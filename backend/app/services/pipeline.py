@@ -0,0 +1,294 @@
+"""
+Certificate processing pipeline shared by the synchronous upload endpoint
+and the background job workers.
+"""
+from pathlib import Path
+from typing import Callable, Optional
+import logging
+import threading
+
+from app.core.config import settings
+from app.db.models import Certificate, ExtractedField, CertificateVerification, CertificateSummary
+from app.services.ocr import run_ocr
+from app.services.extract import extract_fields_and_summary, verify_certificate_with_university
+from app.utils.normalization import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Extracted fields copied into certificate_summaries for the listing endpoints
+SUMMARY_LISTING_FIELDS = (
+    "student_name", "enrollment_number", "degree", "branch", "university_name",
+    "semester", "academic_year", "cgpa", "sgpa"
+)
+SUMMARY_SNIPPET_LENGTH = 200
+
+# Stage slots shared by every upload in the process (sync requests and job
+# workers): OCR is bounded by cores, extraction by provider rate limits, so
+# with many job workers items overlap across stages instead of piling onto one
+_ocr_slots = threading.BoundedSemaphore(max(1, settings.OCR_MAX_CONCURRENCY))
+_llm_slots = threading.BoundedSemaphore(max(1, settings.LLM_MAX_CONCURRENCY))
+
+
+class NoTextExtractedError(ValueError):
+    """Raised when OCR produced no usable text for a certificate."""
+
+
+def _parse_float(val):
+    try:
+        if val is None:
+            return None
+        s = str(val).strip()
+        if s == "" or s.lower() in {"na", "n/a", "null", "none", "-"}:
+            return None
+        return float(s)
+    except Exception:
+        return None
+
+def compute_mismatch_report(extracted_fields: dict, verification: dict) -> dict:
+    """Compare extracted vs university data and compute simple status + per-field mismatches."""
+    report = {
+        "name": "not_available",
+        "cgpa": "not_available",
+        "sgpa": "not_available",
+    }
+
+    if not verification or not verification.get("student_verified"):
+        return {
+            "report": report,
+            "simple_status": "not verified",
+        }
+
+    matched = verification.get("matched_student") or verification.get("matched_certificate") or {}
+
+    # Name comparison
+    ext_name = extracted_fields.get("student_name")
+    uni_name = matched.get("student_name") or matched.get("name")
+    if ext_name and uni_name:
+        report["name"] = "match" if normalize_text(ext_name) == normalize_text(uni_name) else "mismatch"
+    else:
+        report["name"] = "not_available"
+
+    # CGPA comparison
+    ext_cgpa = _parse_float(extracted_fields.get("cgpa"))
+    uni_cgpa = _parse_float(matched.get("cgpa"))
+    if ext_cgpa is not None and uni_cgpa is not None:
+        report["cgpa"] = "match" if abs(ext_cgpa - uni_cgpa) <= 0.05 else "mismatch"
+    else:
+        report["cgpa"] = "not_available"
+
+    # SGPA comparison - usually not available in university summary; mark not_available if uni missing
+    ext_sgpa = _parse_float(extracted_fields.get("sgpa"))
+    uni_sgpa = _parse_float(matched.get("sgpa"))
+    if ext_sgpa is not None and uni_sgpa is not None:
+        report["sgpa"] = "match" if abs(ext_sgpa - uni_sgpa) <= 0.05 else "mismatch"
+    else:
+        report["sgpa"] = "not_available"
+
+    any_mismatch = any(v == "mismatch" for v in report.values())
+    simple_status = "mismatch" if any_mismatch else "verified"
+    return {"report": report, "simple_status": simple_status}
+
+
+def save_verification_record(
+    session,
+    certificate_id: int,
+    verification: dict,
+    mismatch: dict,
+    extracted: Optional[dict] = None
+) -> CertificateVerification:
+    """
+    Create or update the JSON verification record of a certificate.
+
+    Args:
+        session: SQLAlchemy session (caller commits)
+        certificate_id: Certificate the results belong to
+        verification: Result of verify_certificate_with_university
+        mismatch: Result of compute_mismatch_report
+        extracted: Validated extraction result; left unchanged when None
+    """
+    record = session.query(CertificateVerification).filter(
+        CertificateVerification.certificate_id == certificate_id
+    ).first()
+    if record is None:
+        record = CertificateVerification(certificate_id=certificate_id)
+        session.add(record)
+    _apply_verification(record, verification, mismatch, extracted)
+    return record
+
+
+def save_verification_records(session, results: list[tuple[int, dict, dict]]) -> None:
+    """
+    Bulk variant of save_verification_record for (certificate_id, verification, mismatch)
+    tuples: existing records are loaded with one query and the rest inserted.
+    """
+    existing = {
+        record.certificate_id: record for record in session.query(CertificateVerification)
+        .filter(CertificateVerification.certificate_id.in_([cert_id for cert_id, _, _ in results]))
+        .all()
+    }
+    for certificate_id, verification, mismatch in results:
+        record = existing.get(certificate_id)
+        if record is None:
+            record = CertificateVerification(certificate_id=certificate_id)
+            session.add(record)
+        _apply_verification(record, verification, mismatch)
+
+
+def _apply_verification(record: CertificateVerification, verification: dict, mismatch: dict, extracted: Optional[dict] = None) -> None:
+    record.verification = verification
+    record.mismatch_report = mismatch.get('report')
+    record.simple_status = mismatch.get('simple_status')
+    record.confidence_score = verification.get('confidence_score', 0.0)
+    if extracted is not None:
+        record.extracted = extracted
+
+
+def save_certificate_summary(
+    session,
+    cert: Certificate,
+    extracted: Optional[dict] = None,
+    summary: Optional[str] = None,
+    simple_status: Optional[str] = None
+) -> CertificateSummary:
+    """
+    Create or update the denormalized listing row of a certificate.
+
+    Only the parts that are passed are changed, so reverify can update the
+    status without touching the extracted values or the summary.
+    """
+    record = session.get(CertificateSummary, cert.id)
+    if record is None:
+        record = CertificateSummary(certificate_id=cert.id, simple_status="not verified")
+        session.add(record)
+
+    record.created_at = cert.created_at
+    record.status = cert.status
+    record.original_filename = cert.original_filename
+
+    if extracted is not None:
+        columns = CertificateSummary.__table__.c
+        for key in SUMMARY_LISTING_FIELDS:
+            value = extracted.get(key)
+            if value is None or value == "" or value == "null":
+                setattr(record, key, None)
+            else:
+                setattr(record, key, str(value)[:columns[key].type.length])
+    if summary is not None:
+        record.summary = summary[:SUMMARY_SNIPPET_LENGTH] + "..." if len(summary) > SUMMARY_SNIPPET_LENGTH else summary
+    if simple_status is not None:
+        record.simple_status = simple_status
+    return record
+
+
+def process_certificate(
+    session,
+    processed_path: Path,
+    filename: str,
+    file_type: str,
+    on_stage: Optional[Callable[[str], None]] = None
+) -> dict:
+    """
+    Run OCR -> AI extraction/summary -> university verification for a
+    saved upload, persist the certificate with its fields and return the
+    upload response payload.
+
+    Args:
+        session: SQLAlchemy session used to persist the certificate
+        processed_path: Path of the saved (and validated) upload
+        filename: Sanitized original filename
+        file_type: 'pdf' or 'image' as returned by save_and_process_file
+        on_stage: Optional callback invoked with the name of each stage as it starts
+
+    Returns:
+        dict: Response payload (id, summary, tabular_data, verification, ...)
+    """
+    def _stage(name: str):
+        if on_stage:
+            on_stage(name)
+
+    _stage("ocr")
+    with _ocr_slots:
+        ocr_text = run_ocr(processed_path)
+
+    if not ocr_text.strip():
+        raise NoTextExtractedError("No text could be extracted from the certificate. Please ensure the image is clear and readable.")
+
+    _stage("extraction")
+    with _llm_slots:
+        extracted_fields, summary = extract_fields_and_summary(ocr_text)
+
+    # Verify certificate against university database
+    _stage("verification")
+    verification = verify_certificate_with_university(extracted_fields)
+
+    # Compute simple status + mismatch report (name, cgpa, sgpa)
+    mismatch = compute_mismatch_report(extracted_fields, verification)
+
+    _stage("saving")
+    cert = Certificate(
+        image_path=str(processed_path),
+        status='processed',
+        user_id=None,  # No authentication required
+        original_filename=filename
+    )
+    session.add(cert)
+    session.flush()
+
+    # Store extracted fields with proper typing
+    for key, value in extracted_fields.items():
+        if value and value != "null":
+            field = ExtractedField(
+                certificate_id=cert.id,
+                key=key,
+                value=str(value),
+                confidence=0.9,  # High confidence for AI extraction
+                field_type='extracted'
+            )
+            session.add(field)
+
+    # Store AI summary
+    summary_field = ExtractedField(
+        certificate_id=cert.id,
+        key='ai_summary',
+        value=summary,
+        confidence=1.0,
+        field_type='ai_summary'
+    )
+    session.add(summary_field)
+
+    # Store verification results, mismatch report and extraction as native JSON
+    save_verification_record(session, cert.id, verification, mismatch, extracted=extracted_fields)
+    save_certificate_summary(session, cert, extracted_fields, summary, mismatch.get('simple_status'))
+
+    session.commit()
+
+    # Create structured tabular response with enhanced fields
+    tabular_data = {
+        "student_name": extracted_fields.get("student_name", "-"),
+        "enrollment_number": extracted_fields.get("enrollment_number", "-"),
+        "degree": extracted_fields.get("degree", "-"),
+        "branch": extracted_fields.get("branch", "-"),
+        "university_name": extracted_fields.get("university_name", "-"),
+        "graduation_date": extracted_fields.get("graduation_date", "-"),
+        "date_of_birth": extracted_fields.get("date_of_birth", "-"),
+        "grade": extracted_fields.get("grade", "-"),
+        "certificate_type": extracted_fields.get("certificate_type", "-"),
+        "semester": extracted_fields.get("semester", "-"),
+        "academic_year": extracted_fields.get("academic_year", "-"),
+        "sgpa": extracted_fields.get("sgpa", "-"),
+        "cgpa": extracted_fields.get("cgpa", "-"),
+        "total_credits": extracted_fields.get("total_credits", "-"),
+        "earned_credits": extracted_fields.get("earned_credits", "-"),
+        "subjects": extracted_fields.get("subjects", [])
+    }
+
+    return {
+        "id": cert.id,
+        "file_type": file_type,
+        "summary": summary,
+        "tabular_data": tabular_data,
+        "verification": verification,
+        "mismatch": mismatch.get('report'),
+        "simple_status": mismatch.get('simple_status'),
+        "confidence_score": verification.get('confidence_score', 0.0)
+    }
@@ -0,0 +1,283 @@
+"""
+Bulk re-verification of stored certificates (POST /certificates/reverify-all).
+
+A job is a row in reverification_jobs, claimed and run by the same worker
+threads as background uploads (see jobs.py). It pages the listing rows in
+certificate_summaries in id order, which already hold the student name,
+enrollment number and grades, sends each page to the portal as one
+/api/verify/batch call with no transaction open, and then upserts the
+verification records and listing statuses of the page in one short commit.
+The id of the last certificate written is the job's checkpoint, so a job
+re-queued after a worker died resumes there.
+"""
+from datetime import datetime, timedelta
+import logging
+import time
+
+from sqlalchemy import func, update
+
+from app.core.config import settings
+from app.core.constants import JobStatus
+from app.db.models import CertificateSummary, ReverificationJob
+from app.db.session import get_db_session
+from app.services.extract import refresh_verification_cache_version, verify_certificates_with_university_batch
+from app.services.pipeline import compute_mismatch_report, save_verification_records
+
+logger = logging.getLogger(__name__)
+
+SIMPLE_STATUSES = ("verified", "mismatch", "not verified")
+
+
+def parse_filters(args: dict) -> dict:
+    """
+    Validate reverify-all filters (raises ValueError).
+
+    Accepted keys: simple_status (verified / mismatch / not verified), status
+    (certificate status), created_from / created_to (ISO dates, inclusive)
+    and refresh (bypass the verification cache).
+    """
+    filters = {}
+    simple_status = (args.get('simple_status') or '').strip().lower()
+    if simple_status:
+        if simple_status not in SIMPLE_STATUSES:
+            raise ValueError(f"simple_status must be one of: {', '.join(SIMPLE_STATUSES)}")
+        filters['simple_status'] = simple_status
+    status = (args.get('status') or '').strip()
+    if status:
+        filters['status'] = status
+    for key in ('created_from', 'created_to'):
+        value = (args.get(key) or '').strip()
+        if value:
+            try:
+                filters[key] = datetime.fromisoformat(value).isoformat()
+            except ValueError:
+                raise ValueError(f"{key} must be an ISO date (YYYY-MM-DD) or datetime")
+    if str(args.get('refresh', '')).lower() in ('1', 'true', 'yes'):
+        filters['refresh'] = True
+    return filters
+
+
+def _filtered_query(session, filters: dict):
+    query = session.query(CertificateSummary)
+    if filters.get('simple_status'):
+        query = query.filter(CertificateSummary.simple_status == filters['simple_status'])
+    if filters.get('status'):
+        query = query.filter(CertificateSummary.status == filters['status'])
+    if filters.get('created_from'):
+        query = query.filter(CertificateSummary.created_at >= datetime.fromisoformat(filters['created_from']))
+    if filters.get('created_to'):
+        created_to = datetime.fromisoformat(filters['created_to'])
+        if created_to.time() == datetime.min.time():
+            # A bare date includes the whole day
+            query = query.filter(CertificateSummary.created_at < created_to + timedelta(days=1))
+        else:
+            query = query.filter(CertificateSummary.created_at <= created_to)
+    return query
+
+
+def enqueue_reverify_job(job_id: str, filters: dict) -> tuple[dict, bool]:
+    """
+    Queue a re-verification job, unless one is already queued or running.
+
+    Returns:
+        tuple: (job info, whether a new job was created)
+    """
+    from app.services.jobs import ensure_workers, wake_workers
+
+    with get_db_session() as session:
+        active = (
+            session.query(ReverificationJob)
+            .filter(ReverificationJob.status.in_((JobStatus.QUEUED, JobStatus.RUNNING)))
+            .order_by(ReverificationJob.created_at)
+            .first()
+        )
+        if active:
+            return _serialize_job(active), False
+        job = ReverificationJob(id=job_id, status=JobStatus.QUEUED, filters=filters)
+        session.add(job)
+        session.flush()
+        job_info = _serialize_job(job)
+
+    ensure_workers()
+    wake_workers()
+    logger.info(f"Queued re-verification job {job_id} (filters: {filters})")
+    return job_info, True
+
+
+def get_reverify_job(job_id: str) -> dict | None:
+    with get_db_session() as session:
+        job = session.get(ReverificationJob, job_id)
+        return _serialize_job(job) if job else None
+
+
+def _serialize_job(job: ReverificationJob) -> dict:
+    elapsed = None
+    if job.started_at:
+        elapsed = ((job.finished_at or job.updated_at) - job.started_at).total_seconds()
+    throughput = round(job.processed / elapsed, 1) if elapsed else None
+    remaining = max(0, job.total - job.processed)
+    data = {
+        "job_id": job.id,
+        "status": job.status,
+        "filters": job.filters or {},
+        "total": job.total,
+        "processed": job.processed,
+        "progress": int(job.processed * 100 / job.total) if job.total else (100 if job.status == JobStatus.COMPLETED else 0),
+        "results": {
+            "verified": job.verified,
+            "mismatch": job.mismatched,
+            "not_verified": job.not_verified,
+        },
+        "certificates_per_second": throughput,
+        "eta_seconds": round(remaining / throughput) if throughput and job.status == JobStatus.RUNNING else None,
+        "attempts": job.attempts,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+    if job.status == JobStatus.FAILED:
+        data["error"] = job.error
+    return data
+
+
+def requeue_stale_reverify_jobs() -> None:
+    """Put running jobs that stopped reporting progress back in the queue; they resume from their checkpoint."""
+    try:
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.JOB_STALE_SECONDS)
+        with get_db_session() as session:
+            result = session.execute(
+                update(ReverificationJob)
+                .where(ReverificationJob.status == JobStatus.RUNNING, ReverificationJob.updated_at < cutoff)
+                .values(status=JobStatus.QUEUED, updated_at=datetime.utcnow())
+            )
+            if result.rowcount:
+                logger.warning(f"Re-queued {result.rowcount} stale re-verification job(s)")
+    except Exception as e:
+        logger.error(f"Failed to re-queue stale re-verification jobs: {str(e)}")
+
+
+def claim_next_reverify_job() -> str | None:
+    """Atomically move the oldest queued re-verification job to 'running' and return its id."""
+    with get_db_session() as session:
+        candidates = (
+            session.query(ReverificationJob.id)
+            .filter(ReverificationJob.status == JobStatus.QUEUED)
+            .order_by(ReverificationJob.created_at)
+            .limit(5)
+            .all()
+        )
+        for (job_id,) in candidates:
+            result = session.execute(
+                update(ReverificationJob)
+                .where(ReverificationJob.id == job_id, ReverificationJob.status == JobStatus.QUEUED)
+                .values(
+                    status=JobStatus.RUNNING,
+                    attempts=ReverificationJob.attempts + 1,
+                    updated_at=datetime.utcnow()
+                )
+            )
+            if result.rowcount == 1:
+                return job_id
+    return None
+
+
+def run_reverify_job(job_id: str) -> None:
+    with get_db_session() as session:
+        job = session.get(ReverificationJob, job_id)
+        filters = job.filters or {}
+        if job.started_at is None:
+            job.started_at = datetime.utcnow()
+            job.total = _filtered_query(session, filters).with_entities(func.count(CertificateSummary.certificate_id)).scalar()
+        total = job.total
+
+    use_cache = not filters.get('refresh')
+    if use_cache:
+        # Drop cached portal answers if the registry changed since they were fetched
+        refresh_verification_cache_version()
+
+    batch_size = max(1, settings.REVERIFY_BATCH_SIZE)
+    start = time.perf_counter()
+    written = 0
+    try:
+        while True:
+            # Read the chunk and release the connection before calling the portal
+            with get_db_session() as session:
+                job = session.get(ReverificationJob, job_id)
+                rows = (
+                    _filtered_query(session, filters)
+                    .filter(CertificateSummary.certificate_id > job.last_certificate_id)
+                    .order_by(CertificateSummary.certificate_id)
+                    .limit(batch_size)
+                    .all()
+                )
+                if not rows:
+                    job.status = JobStatus.COMPLETED
+                    job.finished_at = job.updated_at = datetime.utcnow()
+                    break
+
+                certificate_ids = [row.certificate_id for row in rows]
+                extracted_items = [
+                    {
+                        'student_name': row.student_name,
+                        'enrollment_number': row.enrollment_number,
+                        'cgpa': row.cgpa,
+                        'sgpa': row.sgpa,
+                    }
+                    for row in rows
+                ]
+
+            verifications = verify_certificates_with_university_batch(extracted_items, use_cache=use_cache)
+            mismatches = [
+                compute_mismatch_report(extracted, verification)
+                for extracted, verification in zip(extracted_items, verifications)
+            ]
+
+            # Results, listing statuses and the checkpoint in one short transaction
+            with get_db_session() as session:
+                job = session.get(ReverificationJob, job_id)
+                summaries = {
+                    summary.certificate_id: summary for summary in session.query(CertificateSummary)
+                    .filter(CertificateSummary.certificate_id.in_(certificate_ids))
+                    .all()
+                }
+                results = []
+                for certificate_id, verification, mismatch in zip(certificate_ids, verifications, mismatches):
+                    summary = summaries.get(certificate_id)
+                    if summary is None:
+                        # Deleted while the portal was being asked
+                        continue
+                    results.append((certificate_id, verification, mismatch))
+                    summary.simple_status = mismatch.get('simple_status')
+                    if summary.simple_status == 'verified':
+                        job.verified += 1
+                    elif summary.simple_status == 'mismatch':
+                        job.mismatched += 1
+                    else:
+                        job.not_verified += 1
+                save_verification_records(session, results)
+
+                job.processed += len(certificate_ids)
+                job.last_certificate_id = certificate_ids[-1]
+                job.updated_at = datetime.utcnow()
+                written += len(certificate_ids)
+                logger.info(f"Re-verification job {job_id}: {job.processed}/{total} certificates")
+
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Re-verification job {job_id} completed: {written} certificate(s) in {elapsed:.1f}s"
+            f" ({written / elapsed if elapsed else 0:.1f}/s)"
+        )
+    except Exception as e:
+        logger.error(f"Re-verification job {job_id} failed: {str(e)}")
+        with get_db_session() as session:
+            session.execute(
+                update(ReverificationJob)
+                .where(ReverificationJob.id == job_id)
+                .values(
+                    status=JobStatus.FAILED,
+                    error=f"Re-verification failed: {str(e)}",
+                    updated_at=datetime.utcnow(),
+                    finished_at=datetime.utcnow()
+                )
+            )
@@ -0,0 +1,135 @@
+"""
+In-process cache of university portal verification results.
+
+Entries are keyed on the normalized enrollment number and student name, so
+re-uploads and re-verifications of the same student skip the portal round
+trip. "Verified" results live for VERIFICATION_CACHE_TTL_SECONDS and "not
+found" results for the shorter VERIFICATION_CACHE_NEGATIVE_TTL_SECONDS, so a
+student added to the registry shows up soon; failed attempts (portal down,
+timeouts) are never cached. The least recently used entries are evicted
+beyond max_entries.
+
+The cache is tied to a version of the portal registry (its /api/stats ETag,
+derived from metadata.last_updated). Each entry records the version it was
+cached under and only serves lookups while that is still the current one;
+set_version() with a new value (including the first one a process sees) also
+drops every entry, so callers such as bulk re-verification can check the
+portal once and then trust the cache.
+"""
+from collections import OrderedDict
+import copy
+import threading
+import time
+
+from app.core.config import settings
+from app.utils.normalization import normalize_text
+
+
+class VerificationCache:
+    def __init__(self, max_entries: int, ttl: float, negative_ttl: float, enabled: bool = True) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.enabled = enabled
+        self._entries: OrderedDict[tuple[str, str], tuple[float, str | None, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: str | None = None
+        self.stats = {
+            "hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "expired": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    @staticmethod
+    def make_key(enrollment_number: str, student_name: str) -> tuple[str, str]:
+        return normalize_text(enrollment_number), normalize_text(student_name)
+
+    def get(self, enrollment_number: str, student_name: str) -> dict | None:
+        """Return a copy of the cached result, or None on a miss, expired or stale entry."""
+        if not self.enabled:
+            return None
+        key = self.make_key(enrollment_number, student_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            expires_at, version, result = entry
+            if expires_at <= time.monotonic() or version != self._version:
+                del self._entries[key]
+                self.stats["expired" if version == self._version else "invalidations"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits" if result.get('student_verified') else "negative_hits"] += 1
+            return copy.deepcopy(result)
+
+    def put(self, enrollment_number: str, student_name: str, result: dict) -> None:
+        """Cache a portal answer; results of failed attempts are ignored."""
+        if not self.enabled or not result.get('verification_attempted'):
+            return
+        ttl = self.ttl if result.get('student_verified') else self.negative_ttl
+        if ttl <= 0:
+            return
+        key = self.make_key(enrollment_number, student_name)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, self._version, copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            self.stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, enrollment_number: str | None = None, student_name: str | None = None) -> int:
+        """Drop one student's entry, or everything when called without arguments."""
+        with self._lock:
+            if enrollment_number is None and student_name is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+            else:
+                dropped = int(self._entries.pop(self.make_key(enrollment_number or "", student_name or ""), None) is not None)
+            self.stats["invalidations"] += dropped
+            return dropped
+
+    def set_version(self, version: str | None) -> bool:
+        """
+        Record the portal registry version; a change invalidates every entry.
+
+        Entries cached before any version was known are dropped too, since
+        nothing says which registry state they came from.
+
+        Returns True if the cache was invalidated.
+        """
+        if version is None:
+            return False
+        with self._lock:
+            changed = version != self._version
+            self._version = version
+        if changed:
+            self.invalidate()
+        return changed
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            hits = self.stats["hits"] + self.stats["negative_hits"]
+            lookups = hits + self.stats["misses"]
+            return {
+                **self.stats,
+                "enabled": self.enabled,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "portal_version": self._version,
+            }
+
+
+verification_cache = VerificationCache(
+    max_entries=settings.VERIFICATION_CACHE_MAX_ENTRIES,
+    ttl=settings.VERIFICATION_CACHE_TTL_SECONDS,
+    negative_ttl=settings.VERIFICATION_CACHE_NEGATIVE_TTL_SECONDS,
+    enabled=settings.VERIFICATION_CACHE_ENABLED
+)
@@ -0,0 +1,156 @@
+"""
+Circuit breaker for calls to external dependencies (university portal, LLM provider).
+
+A breaker is CLOSED while the dependency is healthy and records the outcome of
+every call in a sliding time window. Once the window holds at least
+min_calls outcomes and the failure rate reaches failure_rate, it trips OPEN:
+calls are refused immediately (callers return their "unavailable" result)
+instead of waiting for a connection error or timeout. After open_seconds it
+goes HALF_OPEN and lets a few trial calls through; a successful trial closes
+it again, a failed one re-opens it.
+
+State is per process, so each gunicorn worker keeps its own breakers.
+"""
+import threading
+import time
+from collections import deque
+
+
+class CircuitState:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"{name} is temporarily unavailable (circuit open, retry in {retry_after:.0f}s)")
+
+
+_breakers: dict[str, "CircuitBreaker"] = {}
+
+
+class CircuitBreaker:
+    """
+    Args:
+        name: Dependency name used in errors and health output
+        failure_rate: Fraction of failed calls in the window that trips the breaker
+        min_calls: Calls the window must hold before the failure rate is trusted
+        window_seconds: Length of the sliding outcome window
+        open_seconds: How long to refuse calls before trying the dependency again
+        half_open_calls: Concurrent trial calls allowed while half-open
+    """
+
+    def __init__(self, name: str, failure_rate: float = 0.5, min_calls: int = 5,
+                 window_seconds: float = 60.0, open_seconds: float = 30.0, half_open_calls: int = 1):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._outcomes: deque[tuple[float, bool]] = deque()   # (monotonic time, failed)
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._stats = {"short_circuited": 0, "times_opened": 0}
+        _breakers[name] = self
+
+    def _prune(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            _, failed = self._outcomes.popleft()
+            self._failures -= failed
+
+    def _open(self, now: float):
+        self._state = CircuitState.OPEN
+        self._opened_at = now
+        self._trials = 0
+        self._stats["times_opened"] += 1
+
+    def _close(self):
+        self._state = CircuitState.CLOSED
+        self._outcomes.clear()
+        self._failures = 0
+        self._trials = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                return CircuitState.HALF_OPEN
+            return self._state
+
+    def before_call(self):
+        """Admit a call or raise CircuitOpenError. Every admitted call must be followed by record_success/record_failure/release."""
+        with self._lock:
+            now = time.monotonic()
+            if self._state == CircuitState.OPEN:
+                remaining = self.open_seconds - (now - self._opened_at)
+                if remaining > 0:
+                    self._stats["short_circuited"] += 1
+                    raise CircuitOpenError(self.name, remaining)
+                self._state = CircuitState.HALF_OPEN
+                self._trials = 0
+            if self._state == CircuitState.HALF_OPEN:
+                if self._trials >= self.half_open_calls:
+                    self._stats["short_circuited"] += 1
+                    raise CircuitOpenError(self.name, 0)
+                self._trials += 1
+
+    def release(self):
+        """
+        End an admitted call that produced no verdict on the dependency's health
+        (interrupted, or an error in our request): frees its half-open trial
+        slot without closing or opening the breaker.
+        """
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def record_success(self):
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._close()
+                return
+            now = time.monotonic()
+            self._outcomes.append((now, False))
+            self._prune(now)
+
+    def record_failure(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._state == CircuitState.HALF_OPEN:
+                self._open(now)
+                return
+            if self._state == CircuitState.OPEN:
+                return
+            self._outcomes.append((now, True))
+            self._failures += 1
+            self._prune(now)
+            if len(self._outcomes) >= self.min_calls and self._failures / len(self._outcomes) >= self.failure_rate:
+                self._open(now)
+
+    def get_stats(self) -> dict:
+        state = self.state
+        with self._lock:
+            self._prune(time.monotonic())
+            calls = len(self._outcomes)
+            return {
+                "state": state,
+                "window_calls": calls,
+                "window_failures": self._failures,
+                "failure_rate": round(self._failures / calls, 3) if calls else 0.0,
+                **self._stats
+            }
+
+
+def get_circuit_breaker_stats() -> dict:
+    """State and counters of every breaker created in this process."""
+    return {name: breaker.get_stats() for name, breaker in _breakers.items()}
@@ -0,0 +1,20 @@
+"""
+Text normalization shared by the verification and caching code.
+
+Patterns are compiled once at import time instead of on every call.
+"""
+import re
+
+_WHITESPACE = re.compile(r"\s+")
+_NON_ALNUM = re.compile(r"[^a-z0-9\s]")
+
+
+def normalize_text(s: str) -> str:
+    """Lowercase, collapse whitespace and drop punctuation, for name/enrollment comparison."""
+    s = _WHITESPACE.sub(" ", (s or "").lower().strip())
+    return _NON_ALNUM.sub("", s)
+
+
+def normalize_ocr_text(text: str) -> str:
+    """Collapse whitespace so re-OCR'd or re-extracted copies of a document hash identically."""
+    return _WHITESPACE.sub(" ", text or "").strip()
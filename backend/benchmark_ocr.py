@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-page OCR throughput for scanned (image-only) PDFs.
+
+Builds a synthetic multi-page scanned transcript, then OCRs it with an
+increasing number of pool workers and reports pages/sec and speedup over
+the single-worker run.
+
+Usage:
+  python benchmark_ocr.py [--pages 6] [--dpi 300] [--max-workers N] [--repeat 2]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import fitz  # PyMuPDF
+
+from app.services.ocr import ocr_pdf_pages, _reset_page_pool
+
+
+def build_scanned_pdf(dest: Path, pages: int) -> None:
+    """Write a PDF whose pages are raster images only, forcing the OCR path."""
+    src = fitz.open()
+    for n in range(pages):
+        page = src.new_page()
+        lines = [
+            "Jaypee University of Engineering & Technology",
+            f"Semester {n + 1} Examination Result",
+            "Student Name : Prashant Singh",
+            "Enrollment No : 231B225",
+        ] + [f"CS{n}{i:02d}  Subject {i}  Grade A  Credits 4" for i in range(20)] + [
+            f"SGPA : {6 + n * 0.3:.1f}    CGPA : 6.1",
+        ]
+        page.insert_text((50, 60), "\n".join(lines), fontsize=11)
+
+    scanned = fitz.open()
+    for page in src:
+        pix = page.get_pixmap(dpi=150)
+        out = scanned.new_page(width=page.rect.width, height=page.rect.height)
+        out.insert_image(out.rect, pixmap=pix)
+    scanned.save(str(dest))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=6, help="Number of pages in the synthetic PDF")
+    parser.add_argument("--dpi", type=int, default=300, help="Rasterization DPI used for OCR")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="Largest pool size to try")
+    parser.add_argument("--repeat", type=int, default=2, help="Timed runs per worker count (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "scanned.pdf"
+        build_scanned_pdf(pdf_path, args.pages)
+
+        worker_counts = sorted({1, *[w for w in (2, 4, 8, 16) if w <= args.max_workers], args.max_workers})
+        print(f"OCR benchmark: {args.pages} pages @ {args.dpi} DPI, {os.cpu_count()} CPU(s)")
+        print(f"{'workers':>8} {'best (s)':>10} {'pages/sec':>10} {'speedup':>8}")
+
+        baseline = None
+        for workers in worker_counts:
+            # Warm-up run starts the pool processes so spawn cost is not timed
+            ocr_pdf_pages(pdf_path, args.pages, dpi=args.dpi, workers=workers)
+
+            best = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                texts = ocr_pdf_pages(pdf_path, args.pages, dpi=args.dpi, workers=workers)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+
+            assert len(texts) == args.pages
+            baseline = baseline or best
+            print(f"{workers:>8} {best:>10.2f} {args.pages / best:>10.2f} {baseline / best:>7.2f}x")
+
+        _reset_page_pool()
+
+
+if __name__ == "__main__":
+    main()
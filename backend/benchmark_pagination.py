@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark deep-page latency of the certificate listing: OFFSET vs keyset cursor.
+
+Seeds a throwaway SQLite database with N certificate summary rows, then
+times fetching one page at increasing depths with both modes. Offset cost
+grows with the depth; keyset cost should stay flat.
+
+Usage:
+  python benchmark_pagination.py [--rows 200000] [--limit 20] [--repeat 5]
+  python benchmark_pagination.py --db-url postgresql://...   (use an existing database)
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+def seed(session, rows: int) -> None:
+    from app.db.models import Certificate, CertificateSummary
+
+    start = datetime(2020, 1, 1)
+    batch = 10000
+    for first in range(0, rows, batch):
+        count = min(batch, rows - first)
+        session.bulk_insert_mappings(Certificate, [
+            {"id": i + 1, "image_path": f"cert_{i}.png", "status": "processed",
+             "created_at": start + timedelta(seconds=i)}
+            for i in range(first, first + count)
+        ])
+        session.bulk_insert_mappings(CertificateSummary, [
+            {"certificate_id": i + 1, "created_at": start + timedelta(seconds=i), "status": "processed",
+             "student_name": f"Student {i}", "enrollment_number": f"E{i:07d}", "simple_status": "verified",
+             "updated_at": start}
+            for i in range(first, first + count)
+        ])
+        session.commit()
+
+
+def best_time(fn, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000, help="Rows to seed in the temporary database")
+    parser.add_argument("--limit", type=int, default=20, help="Page size")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement (best is reported)")
+    parser.add_argument("--db-url", type=str, default=None, help="Benchmark an existing database instead of seeding")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    db_url = args.db_url or f"sqlite:///{os.path.join(tmp_dir, 'pagination_bench.db')}"
+
+    from app.db.session import init_engine, get_engine, get_db_session, Base
+    from app.db import models
+    from app.services.listing import fetch_summary_page, encode_cursor
+
+    init_engine(db_url)
+    Base.metadata.create_all(bind=get_engine())
+
+    with get_db_session() as session:
+        if not args.db_url:
+            print(f"Seeding {args.rows} rows...")
+            seed(session, args.rows)
+        total = session.query(models.CertificateSummary).count()
+
+        depths = [d for d in (0, 1000, 10000, 50000, 100000, 190000) if d < total]
+        print(f"Listing benchmark: {total} rows, page size {args.limit}")
+        print(f"{'depth':>8} {'offset (ms)':>12} {'keyset (ms)':>12}")
+
+        for depth in depths:
+            cursor = ""
+            if depth:
+                # Cursor pointing just before the row at this depth
+                anchor, _ = fetch_summary_page(session, 1, offset=depth - 1)
+                cursor = encode_cursor(anchor[0].created_at, anchor[0].certificate_id)
+
+            offset_rows, _ = fetch_summary_page(session, args.limit, offset=depth)
+            keyset_rows, _ = fetch_summary_page(session, args.limit, cursor=cursor)
+            assert [r.certificate_id for r in offset_rows] == [r.certificate_id for r in keyset_rows]
+
+            offset_ms = best_time(lambda: fetch_summary_page(session, args.limit, offset=depth), args.repeat) * 1000
+            keyset_ms = best_time(lambda: fetch_summary_page(session, args.limit, cursor=cursor), args.repeat) * 1000
+            print(f"{depth:>8} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
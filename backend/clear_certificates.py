@@ -8,7 +8,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app.db.session import db_session, init_engine
-from app.db.models import Certificate, ExtractedField
+from app.db.models import Certificate, CertificateSummary, CertificateVerification, ExtractedField
 from app.core.config import settings
 import logging
 
@@ -31,9 +31,13 @@ def delete_all_certificates():
             logger.info("No certificates to delete.")
             return
         
-        # Delete all certificates (cascade will delete extracted fields)
+        # Delete child rows first; SQLite does not enforce the ON DELETE CASCADE
+        # foreign keys, so listing summaries would otherwise outlive their certificates
         logger.info("Deleting all certificates...")
-        db_session.query(Certificate).delete()
+        db_session.query(CertificateSummary).delete(synchronize_session=False)
+        db_session.query(CertificateVerification).delete(synchronize_session=False)
+        db_session.query(ExtractedField).delete(synchronize_session=False)
+        db_session.query(Certificate).delete(synchronize_session=False)
         db_session.commit()
         
         logger.info(f"✓ Successfully deleted {cert_count} certificates and their associated data")
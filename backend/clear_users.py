@@ -10,7 +10,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app.db.session import init_engine, db_session
 from app.core.config import settings
-from app.db.models import User, Certificate, ExtractedField, Student
+from app.db.models import User, Certificate, CertificateSummary, CertificateVerification, ExtractedField, Student
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -36,6 +36,10 @@ def clear_all_users():
                 return
             
             # Delete in order to respect foreign key constraints
+            logger.info("Deleting certificate summaries and verification records...")
+            db_session.query(CertificateSummary).delete(synchronize_session=False)
+            db_session.query(CertificateVerification).delete(synchronize_session=False)
+            
             logger.info("Deleting extracted fields...")
             deleted_fields = db_session.query(ExtractedField).delete(synchronize_session=False)
             logger.info(f"Deleted {deleted_fields} extracted fields")
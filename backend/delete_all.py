@@ -37,7 +37,11 @@ if 'certificates' in tables:
     if cert_count > 0:
         confirm = input("\nAre you sure you want to delete ALL certificates? (yes/no): ")
         if confirm.lower() == 'yes':
-            # Delete extracted fields first (foreign key)
+            # Delete child rows first (foreign keys; SQLite does not cascade)
+            for table in ('certificate_summaries', 'certificate_verifications'):
+                if table in tables:
+                    cursor.execute(f'DELETE FROM {table}')
+                    print(f"Deleted {table}")
             if 'extracted_fields' in tables:
                 cursor.execute('DELETE FROM extracted_fields')
                 print(f"Deleted extracted fields")
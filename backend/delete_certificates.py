@@ -28,6 +28,15 @@ def delete_all_certificates():
             
             try:
                 # Check if tables exist and delete records
+                # Listing summaries and verification records first (SQLite does not cascade)
+                for table in ("certificate_summaries", "certificate_verifications"):
+                    try:
+                        logger.info(f"Deleting all {table}...")
+                        result = conn.execute(text(f"DELETE FROM {table};"))
+                        logger.info(f"Deleted {result.rowcount} {table} records")
+                    except Exception as e:
+                        logger.warning(f"Could not delete {table}: {str(e)}")
+                
                 try:
                     # Delete all extracted fields first (foreign key dependency)
                     logger.info("Deleting all extracted fields...")
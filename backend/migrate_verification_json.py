@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Migrate verification results from str()-encoded extracted_fields rows into
+the certificate_verifications table (JSONB on PostgreSQL, JSON on SQLite).
+
+The same conversion runs automatically at application startup; this script
+is for running it ahead of a deploy.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import init_engine, get_engine, get_db_session, Base
+from app.core.config import settings
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def migrate_verification_json():
+    """Create certificate_verifications and convert legacy rows"""
+    try:
+        init_engine(settings.DB_URL)
+
+        from app.db import models
+        from app.db.migrations import convert_legacy_verification_fields
+
+        Base.metadata.create_all(bind=get_engine(), tables=[models.CertificateVerification.__table__])
+
+        with get_db_session() as session:
+            converted = convert_legacy_verification_fields(session)
+
+        logger.info(f"Migration completed - converted {converted} certificate(s)")
+
+    except Exception as e:
+        logger.error(f"Verification JSON migration failed: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    migrate_verification_json()
@@ -29,6 +29,8 @@ def reset_database():
             try:
                 # Drop all tables
                 logger.info("Dropping all tables...")
+                conn.execute(text("DROP TABLE IF EXISTS certificate_summaries CASCADE;"))
+                conn.execute(text("DROP TABLE IF EXISTS certificate_verifications CASCADE;"))
                 conn.execute(text("DROP TABLE IF EXISTS extracted_fields CASCADE;"))
                 conn.execute(text("DROP TABLE IF EXISTS certificates CASCADE;"))
                 conn.execute(text("DROP TABLE IF EXISTS students CASCADE;"))
@@ -0,0 +1,95 @@
+"""
+Query-count regression test for the certificate listing endpoints.
+Listing a page of N certificates must cost a constant number of SELECTs,
+not one extra query per certificate (N+1).
+
+Run with:  python -m pytest test_query_count.py   (or: python test_query_count.py)
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp()
+os.environ["DB_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'query_count.db')}"
+os.environ["DATABASE_URL"] = os.environ["DB_URL"]
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp_dir, "uploads")
+os.environ["LLM_CACHE_PATH"] = os.path.join(_tmp_dir, "llm_cache.db")
+
+from sqlalchemy import event
+
+from app.main import create_app
+from app.db.session import get_engine, get_db_session
+from app.db.models import Certificate, CertificateSummary, CertificateVerification, ExtractedField
+from app.services.pipeline import save_verification_record, save_certificate_summary
+
+
+def _seed_certificates(count: int):
+    with get_db_session() as session:
+        session.query(CertificateSummary).delete()
+        session.query(CertificateVerification).delete()
+        session.query(ExtractedField).delete()
+        session.query(Certificate).delete()
+        for i in range(count):
+            cert = Certificate(image_path=f"cert_{i}.png", original_filename=f"cert_{i}.png")
+            session.add(cert)
+            session.flush()
+            for key, value in (("student_name", f"Student {i}"), ("enrollment_number", f"E{i:05d}"), ("cgpa", "7.5")):
+                session.add(ExtractedField(certificate_id=cert.id, key=key, value=value, field_type="extracted"))
+            session.add(ExtractedField(certificate_id=cert.id, key="ai_summary", value=f"Summary {i}", field_type="ai_summary"))
+            save_verification_record(
+                session, cert.id,
+                {"student_verified": False, "confidence_score": 0.0},
+                {"report": {}, "simple_status": "not verified"}
+            )
+            save_certificate_summary(
+                session, cert,
+                {"student_name": f"Student {i}", "enrollment_number": f"E{i:05d}", "cgpa": "7.5"},
+                f"Summary {i}", "not verified"
+            )
+
+
+def _count_selects(client, url: str) -> int:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(get_engine(), "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get(url)
+        assert response.status_code == 200, response.get_json()
+    finally:
+        event.remove(get_engine(), "before_cursor_execute", before_cursor_execute)
+    return len(statements)
+
+
+def _assert_constant_queries(url: str):
+    app = create_app()
+    client = app.test_client()
+
+    _seed_certificates(2)
+    small_page = _count_selects(client, url)
+
+    _seed_certificates(50)
+    large_page = _count_selects(client, url)
+
+    print(f"{url}: {small_page} queries for 2 certificates, {large_page} for 50")
+    assert large_page == small_page, f"{url} issued {large_page} queries for 50 rows vs {small_page} for 2 (N+1)"
+
+
+def test_list_certificates_query_count():
+    _assert_constant_queries("/api/v1/certificates?limit=100")
+
+
+def test_my_certificates_query_count():
+    _assert_constant_queries("/api/v1/certificates/my-certificates?limit=100")
+
+
+if __name__ == "__main__":
+    test_list_certificates_query_count()
+    test_my_certificates_query_count()
+    print("✅ Listing endpoints issue a constant number of queries")
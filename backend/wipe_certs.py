@@ -1,11 +1,13 @@
 ﻿from app.db.session import init_engine, db_session
 from app.core.config import settings
-from app.db.models import Certificate, ExtractedField
+from app.db.models import Certificate, CertificateSummary, CertificateVerification, ExtractedField
 
 init_engine(settings.DB_URL)
 
-# Delete child rows first to avoid FK violations
+# Delete child rows first to avoid FK violations (and orphaned listing rows on SQLite)
+fs = db_session.query(CertificateSummary).delete(synchronize_session=False)
+fv = db_session.query(CertificateVerification).delete(synchronize_session=False)
 fe = db_session.query(ExtractedField).delete(synchronize_session=False)
 fc = db_session.query(Certificate).delete(synchronize_session=False)
 db_session.commit()
-print(f"deleted certificates={fc}, deleted fields={fe}")
+print(f"deleted certificates={fc}, deleted fields={fe}, deleted summaries={fs}, deleted verifications={fv}")
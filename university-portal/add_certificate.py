@@ -5,58 +5,21 @@ Script to add a certificate to the university database
 
 import json
 import os
+import sys
 from datetime import datetime
 
 # Database file path
-import os
 script_dir = os.path.dirname(os.path.abspath(__file__))
 DB_FILE = os.path.join(script_dir, 'database', 'certificates.json')
 
-def load_certificates():
-    """Load certificates from database"""
-    try:
-        with open(DB_FILE, 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Error loading certificates: {e}")
-        return {"certificates": [], "metadata": {}}
+sys.path.append(os.path.join(script_dir, 'backend'))
 
-def save_certificates(data):
-    """Save certificates to database"""
-    try:
-        with open(DB_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
-        return True
-    except Exception as e:
-        print(f"Error saving certificates: {e}")
-        return False
+from storage import JSONStorage, format_certificate_id
 
-def generate_certificate_id(certificates):
-    """Generate next certificate ID"""
-    if not certificates:
-        return "JUET001"
-    
-    max_id = 0
-    for cert in certificates:
-        cert_id = cert.get('id', '')
-        if cert_id.startswith('JUET'):
-            try:
-                num = int(cert_id[4:])
-                max_id = max(max_id, num)
-            except ValueError:
-                continue
-    
-    return f"JUET{str(max_id + 1).zfill(3)}"
+storage = JSONStorage(DB_FILE)
 
-def add_certificate(student_name, enrollment_number, branch, academic_year, cgpa="N/A", status="Active"):
-    """Add a new certificate to the database"""
-    
-    # Load existing data
-    data = load_certificates()
-    certificates = data.get("certificates", [])
-    
-    # Generate certificate data
-    cert_id = generate_certificate_id(certificates)
+def build_certificate(cert_id, student_name, enrollment_number, branch, academic_year, cgpa="N/A", status="Active"):
+    """Build a certificate record for an allocated ID"""
     current_time = datetime.utcnow().isoformat() + 'Z'
     
     # Extract branch abbreviation
@@ -77,7 +40,7 @@ def add_certificate(student_name, enrollment_number, branch, academic_year, cgpa
     
     cert_number = f"JUET/{branch_abbrev}/{year}/{cert_id[4:]}"
     
-    new_certificate = {
+    return {
         "id": cert_id,
         "student_name": student_name.strip(),
         "enrollment_number": enrollment_number.strip(),
@@ -94,30 +57,44 @@ def add_certificate(student_name, enrollment_number, branch, academic_year, cgpa
         "status": status,
         "upload_timestamp": current_time
     }
+
+def add_certificate(student_name, enrollment_number, branch, academic_year, cgpa="N/A", status="Active"):
+    """Add a new certificate to the database"""
     
-    # Add the new certificate
-    certificates.append(new_certificate)
+    # Allocate the next ID from the persisted sequence
+    cert_id = format_certificate_id(storage.allocate_ids(1))
+    new_certificate = build_certificate(cert_id, student_name, enrollment_number, branch, academic_year, cgpa, status)
     
-    # Update metadata
-    metadata = data.get("metadata", {})
-    metadata['total_certificates'] = len(certificates)
-    metadata['last_updated'] = current_time
+    try:
+        # One journal append; the portal (or the next --bulk run) folds it into certificates.json
+        storage.add_certificate(new_certificate, new_certificate["upload_timestamp"])
+    except Exception as e:
+        print(f"❌ Failed to save certificate to database: {e}")
+        return False
     
-    data['certificates'] = certificates
-    data['metadata'] = metadata
+    print(f"✅ Certificate added successfully!")
+    print(f"   Certificate ID: {cert_id}")
+    print(f"   Certificate Number: {new_certificate['certificate_number']}")
+    print(f"   Student: {student_name}")
+    print(f"   Enrollment: {enrollment_number}")
+    print(f"   Total certificates in DB: {len(storage.load()['certificates'])}")
+    return True
+
+def add_certificates_bulk(records):
+    """Add many certificates, allocating one block of IDs for the whole load"""
+    if not records:
+        return 0
     
-    # Save to file
-    if save_certificates(data):
-        print(f"✅ Certificate added successfully!")
-        print(f"   Certificate ID: {cert_id}")
-        print(f"   Certificate Number: {cert_number}")
-        print(f"   Student: {student_name}")
-        print(f"   Enrollment: {enrollment_number}")
-        print(f"   Total certificates in DB: {len(certificates)}")
-        return True
-    else:
-        print("❌ Failed to save certificate to database")
-        return False
+    first = storage.allocate_ids(len(records))
+    for offset, record in enumerate(records):
+        certificate = build_certificate(format_certificate_id(first + offset), **record)
+        storage.add_certificate(certificate, certificate["upload_timestamp"])
+    # Fold the whole load into certificates.json once
+    storage.compact()
+    
+    print(f"✅ Added {len(records)} certificates "
+          f"({format_certificate_id(first)} - {format_certificate_id(first + len(records) - 1)})")
+    return len(records)
 
 if __name__ == '__main__':
     import sys
@@ -125,7 +102,11 @@ if __name__ == '__main__':
     print("🎓 University Certificate Database Manager")
     print("=" * 50)
     
-    if len(sys.argv) > 1 and sys.argv[1] == '--interactive':
+    if len(sys.argv) > 2 and sys.argv[1] == '--bulk':
+        # Bulk mode - JSON list of {student_name, enrollment_number, branch, academic_year, cgpa?, status?}
+        with open(sys.argv[2], 'r') as f:
+            add_certificates_bulk(json.load(f))
+    elif len(sys.argv) > 1 and sys.argv[1] == '--interactive':
         # Interactive mode
         print("\nEnter certificate details:")
         student_name = input("Student Name: ").strip()
@@ -156,3 +137,4 @@ if __name__ == '__main__':
         
         print("\n💡 To add more certificates interactively, run:")
         print("   python add_certificate.py --interactive")
+        print("   python add_certificate.py --bulk certificates_to_add.json")
@@ -1,11 +1,15 @@
-from flask import Flask, jsonify, request, send_from_directory, send_file
+from flask import Flask, Response, jsonify, request, send_from_directory, send_file, stream_with_context
 from flask_cors import CORS
 import json
 import os
-from datetime import datetime
+from datetime import datetime, timezone
+import hashlib
 import logging
 from werkzeug.utils import secure_filename
 
+from registry import CertificateRegistry
+from storage import create_storage, format_certificate_id
+
 app = Flask(__name__)
 CORS(app)
 
@@ -17,6 +21,13 @@ logger = logging.getLogger(__name__)
 UPLOAD_FOLDER = os.environ.get('UPLOAD_DIR', '/tmp/certificates')
 ALLOWED_EXTENSIONS = {'pdf', 'png', 'jpg', 'jpeg'}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+VERIFY_BATCH_MAX_ITEMS = int(os.environ.get('VERIFY_BATCH_MAX_ITEMS', 100000))
+CERTIFICATES_PAGE_SIZE = int(os.environ.get('CERTIFICATES_PAGE_SIZE', 100))
+CERTIFICATES_MAX_PAGE_SIZE = int(os.environ.get('CERTIFICATES_MAX_PAGE_SIZE', 1000))
+SEARCH_DEFAULT_LIMIT = int(os.environ.get('SEARCH_DEFAULT_LIMIT', 50))
+SEARCH_MAX_LIMIT = int(os.environ.get('SEARCH_MAX_LIMIT', 500))
+# Minimum OCR-weighted similarity for a fuzzy (near miss) verification match
+FUZZY_MIN_SIMILARITY = float(os.environ.get('FUZZY_MIN_SIMILARITY', 0.8))
 
 # Create upload folder if it doesn't exist and we have permissions
 try:
@@ -34,8 +45,17 @@ def allowed_file(filename):
 DB_FILE = os.environ.get('DB_FILE', '/tmp/certificates.json')
 SOURCE_DB_FILE = '../database/certificates.json'
 
+# Storage backend: 'json' (single file, small demos) or 'sqlite' (WAL, indexed)
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'json').lower()
+SQLITE_DB_FILE = os.environ.get('SQLITE_DB_FILE', '/tmp/certificates.db')
+
+# JSON backend journal: group-commit window and compaction cadence
+JOURNAL_FSYNC_WINDOW_MS = float(os.environ.get('JOURNAL_FSYNC_WINDOW_MS', 0))
+JOURNAL_COMPACT_INTERVAL = int(os.environ.get('JOURNAL_COMPACT_INTERVAL', 60))
+JOURNAL_COMPACT_ENTRIES = int(os.environ.get('JOURNAL_COMPACT_ENTRIES', 500))
+
 # Initialize database file if it doesn't exist
-if not os.path.exists(DB_FILE):
+if STORAGE_BACKEND == 'json' and not os.path.exists(DB_FILE):
     try:
         # Try to load from source database first
         if os.path.exists(SOURCE_DB_FILE):
@@ -65,41 +85,33 @@ if not os.path.exists(DB_FILE):
     except Exception as e:
         logger.error(f"Could not initialize database: {e}")
 
-# Load certificate database
-def load_certificates():
-    try:
-        with open(DB_FILE, 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        logger.error(f"Error loading certificates: {e}")
-        return {"certificates": [], "metadata": {}}
+storage = create_storage(
+    STORAGE_BACKEND, DB_FILE, SQLITE_DB_FILE,
+    fsync_window=JOURNAL_FSYNC_WINDOW_MS / 1000,
+    compact_interval=JOURNAL_COMPACT_INTERVAL,
+    compact_entries=JOURNAL_COMPACT_ENTRIES
+)
 
-# Save certificate database
-def save_certificates(data):
+# Seed an empty SQLite database from the source JSON (import_certificates.py re-imports on demand)
+if storage.name == 'sqlite':
     try:
-        with open(DB_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
-        return True
+        if storage.count() == 0 and os.path.exists(SOURCE_DB_FILE):
+            with open(SOURCE_DB_FILE, 'r') as source:
+                imported = storage.import_data(json.load(source))
+            logger.info(f"SQLite database initialized from source: {SQLITE_DB_FILE} with {imported} certificates")
     except Exception as e:
-        logger.error(f"Error saving certificates: {e}")
-        return False
+        logger.error(f"Could not initialize SQLite database: {e}")
 
-# Generate next certificate ID
-def generate_certificate_id(certificates):
-    if not certificates:
-        return "JUET001"
-    
-    max_id = 0
-    for cert in certificates:
-        cert_id = cert.get('id', '')
-        if cert_id.startswith('JUET'):
-            try:
-                num = int(cert_id[4:])  # Extract number after 'JUET'
-                max_id = max(max_id, num)
-            except ValueError:
-                continue
-    
-    return f"JUET{str(max_id + 1).zfill(3)}"
+# Fold the insert journal into DB_FILE in the background
+if storage.name == 'json':
+    storage.start_compactor()
+
+# In-memory certificate registry, reloaded only when the stored data changes
+registry = CertificateRegistry(storage, fuzzy_min_similarity=FUZZY_MIN_SIMILARITY)
+
+# Generate next certificate ID from the persisted sequence (atomic across workers)
+def generate_certificate_id():
+    return format_certificate_id(storage.allocate_ids(1))
 
 @app.route('/')
 def home():
@@ -141,11 +153,14 @@ def info():
                 
                 <div class="api-info">
                     <h3>📚 Available API Endpoints:</h3>
-                    <div class="endpoint"><strong>GET</strong> /api/certificates - Get all certificates</div>
+                    <div class="endpoint"><strong>GET</strong> /api/certificates?limit=&amp;cursor= - List certificates (paginated; ?stream=1 for NDJSON)</div>
                     <div class="endpoint"><strong>POST</strong> /api/certificates - Upload new certificate</div>
                     <div class="endpoint"><strong>GET</strong> /api/certificates/&lt;enrollment&gt; - Get certificate by enrollment</div>
                     <div class="endpoint"><strong>POST</strong> /api/verify - Verify certificate data</div>
+                    <div class="endpoint"><strong>POST</strong> /api/verify/batch - Verify many certificates (JSON or NDJSON stream)</div>
+                    <div class="endpoint"><strong>GET</strong> /api/match - Fuzzy match candidates for OCR-noisy input</div>
                     <div class="endpoint"><strong>GET</strong> /api/stats - Get university statistics</div>
+                    <div class="endpoint"><strong>GET</strong> /api/search?q=&amp;branch=&amp;year=&amp;limit=&amp;offset= - Search certificates (paginated, with facets)</div>
                     <div class="endpoint"><strong>GET</strong> /health - Health check</div>
                 </div>
                 
@@ -168,14 +183,31 @@ def health():
 
 @app.route('/api/certificates', methods=['GET'])
 def get_all_certificates():
-    """Get all certificates in the database"""
+    """Get certificates page by page (limit/cursor), or stream them all as NDJSON"""
     try:
-        data = load_certificates()
+        cursor = request.args.get('cursor', 0, type=int)
+        if cursor < 0:
+            return jsonify({"success": False, "error": "cursor must be a non-negative integer"}), 400
+        
+        # Streaming mode: one certificate per line, generated as the response is written
+        if request.args.get('stream') in ('1', 'true') or 'application/x-ndjson' in request.headers.get('Accept', ''):
+            logger.info(f"Streaming certificates from cursor {cursor}")
+            return Response(
+                stream_with_context(json.dumps(cert) + '\n' for cert in registry.iter_certificates(cursor)),
+                mimetype='application/x-ndjson'
+            )
+        
+        limit = min(max(request.args.get('limit', CERTIFICATES_PAGE_SIZE, type=int), 1), CERTIFICATES_MAX_PAGE_SIZE)
+        certificates, next_cursor, total = registry.page(cursor, limit)
         return jsonify({
             "success": True,
-            "certificates": data.get("certificates", []),
-            "total": len(data.get("certificates", [])),
-            "metadata": data.get("metadata", {})
+            "certificates": certificates,
+            "total": total,
+            "count": len(certificates),
+            "cursor": cursor,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+            "metadata": registry.metadata
         })
     except Exception as e:
         logger.error(f"Error getting certificates: {e}")
@@ -221,15 +253,11 @@ def upload_certificate():
                     "error": f"Missing required field: {field}"
                 }), 400
         
-        # Load existing data
-        data = load_certificates()
-        certificates = data.get("certificates", [])
-        
         # Get enrollment number
         enrollment = request_data['enrollment_number'].strip()
         
         # Generate certificate data
-        cert_id = generate_certificate_id(certificates)
+        cert_id = generate_certificate_id()
         current_time = datetime.utcnow().isoformat() + 'Z'
         
         # Extract branch abbreviation for certificate number
@@ -283,30 +311,22 @@ def upload_certificate():
             "certificate_file": saved_filename
         }
         
-        # Add the new certificate
-        certificates.append(new_certificate)
-        
-        # Update metadata
-        metadata = data.get("metadata", {})
-        metadata['total_certificates'] = len(certificates)
-        metadata['last_updated'] = current_time
-        
-        data['certificates'] = certificates
-        data['metadata'] = metadata
-        
-        # Save to file
-        if save_certificates(data):
-            logger.info(f"Certificate added successfully: {enrollment}")
-            return jsonify({
-                "success": True,
-                "message": "Certificate uploaded successfully",
-                "certificate": new_certificate
-            }), 201
-        else:
+        # Persist the new certificate
+        try:
+            registry.add_certificate(new_certificate, current_time)
+        except Exception as e:
+            logger.error(f"Error saving certificate: {e}")
             return jsonify({
                 "success": False,
                 "error": "Failed to save certificate to database"
             }), 500
+        
+        logger.info(f"Certificate added successfully: {enrollment}")
+        return jsonify({
+            "success": True,
+            "message": "Certificate uploaded successfully",
+            "certificate": new_certificate
+        }), 201
             
     except Exception as e:
         logger.error(f"Error uploading certificate: {e}")
@@ -330,15 +350,11 @@ def add_certificate():
                     "error": f"Missing required field: {field}"
                 }), 400
         
-        # Load existing data
-        data = load_certificates()
-        certificates = data.get("certificates", [])
-        
         # Get enrollment number
         enrollment = request_data['enrollment_number'].strip()
         
         # Generate certificate data
-        cert_id = generate_certificate_id(certificates)
+        cert_id = generate_certificate_id()
         current_time = datetime.utcnow().isoformat() + 'Z'
         
         # Extract branch abbreviation for certificate number
@@ -377,30 +393,22 @@ def add_certificate():
             "upload_timestamp": current_time
         }
         
-        # Add the new certificate
-        certificates.append(new_certificate)
-        
-        # Update metadata
-        metadata = data.get("metadata", {})
-        metadata['total_certificates'] = len(certificates)
-        metadata['last_updated'] = current_time
-        
-        data['certificates'] = certificates
-        data['metadata'] = metadata
-        
-        # Save to file
-        if save_certificates(data):
-            logger.info(f"Certificate added successfully: {enrollment}")
-            return jsonify({
-                "success": True,
-                "message": "Certificate uploaded successfully",
-                "certificate": new_certificate
-            }), 201
-        else:
+        # Persist the new certificate
+        try:
+            registry.add_certificate(new_certificate, current_time)
+        except Exception as e:
+            logger.error(f"Error saving certificate: {e}")
             return jsonify({
                 "success": False,
                 "error": "Failed to save certificate to database"
             }), 500
+        
+        logger.info(f"Certificate added successfully: {enrollment}")
+        return jsonify({
+            "success": True,
+            "message": "Certificate uploaded successfully",
+            "certificate": new_certificate
+        }), 201
             
     except Exception as e:
         logger.error(f"Error adding certificate: {e}")
@@ -410,14 +418,11 @@ def add_certificate():
 def get_certificate_by_enrollment(enrollment_number):
     """Get all certificates for a student by enrollment number"""
     try:
-        data = load_certificates()
-        certificates = data.get("certificates", [])
-        
         # Search for all certificates by enrollment number
-        matched_certificates = []
-        for cert in certificates:
-            if cert.get("enrollment_number", "").lower() == enrollment_number.lower():
-                matched_certificates.append(cert)
+        matched_certificates = [
+            cert for cert in registry.find_by_enrollment(enrollment_number)
+            if cert.get("enrollment_number", "").lower() == enrollment_number.lower()
+        ]
         
         if matched_certificates:
             return jsonify({
@@ -438,6 +443,46 @@ def get_certificate_by_enrollment(enrollment_number):
         logger.error(f"Error getting certificate by enrollment: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+def build_verification_result(student_name, enrollment_number, matched_certificate, confidence_score, cgpa=None):
+    """Build the /api/verify response body for one lookup"""
+    if not matched_certificate:
+        return {
+            "success": True,
+            "verified": False,
+            "confidence_score": 0.0,
+            "message": "Certificate not found in university database",
+            "searched_for": {
+                "student_name": student_name,
+                "enrollment_number": enrollment_number
+            },
+            "verification_timestamp": datetime.utcnow().isoformat()
+        }
+    
+    result = {
+        "success": True,
+        "verified": True,
+        "confidence_score": confidence_score,
+        "matched_certificate": {
+            "student_name": matched_certificate["student_name"],
+            "enrollment_number": matched_certificate["enrollment_number"],
+            "degree": matched_certificate["degree"],
+            "branch": matched_certificate["branch"],
+            "graduation_date": matched_certificate["graduation_date"],
+            "cgpa": matched_certificate["cgpa"],
+            "certificate_number": matched_certificate["certificate_number"],
+            "status": matched_certificate["status"]
+        },
+        "verification_timestamp": datetime.utcnow().isoformat()
+    }
+    
+    # Optional CGPA check (same 0.05 tolerance as the verifier's mismatch report)
+    if cgpa not in (None, ""):
+        try:
+            result["cgpa_match"] = abs(float(cgpa) - float(matched_certificate["cgpa"])) <= 0.05
+        except (TypeError, ValueError):
+            result["cgpa_match"] = None
+    return result
+
 @app.route('/api/verify', methods=['POST'])
 def verify_certificate():
     """Verify certificate data against university database"""
@@ -457,133 +502,141 @@ def verify_certificate():
                 "error": "student_name and enrollment_number are required"
             }), 400
         
-        # Load university database
-        data = load_certificates()
-        certificates = data.get("certificates", [])
-        
-        # Helper function to normalize strings for comparison
-        def normalize_string(s):
-            """Normalize string by removing extra spaces, special chars, and lowercasing"""
-            import re
-            # Convert to lowercase and strip
-            s = s.lower().strip()
-            # Remove multiple spaces
-            s = re.sub(r'\s+', ' ', s)
-            # Remove common special characters that might cause mismatch
-            s = re.sub(r'[^a-z0-9\s]', '', s)
-            return s
-        
-        # Normalize input
-        normalized_input_name = normalize_string(student_name)
-        normalized_input_enrollment = normalize_string(enrollment_number)
-        
-        logger.info(f"Verification request - Name: '{student_name}' (normalized: '{normalized_input_name}'), Enrollment: '{enrollment_number}' (normalized: '{normalized_input_enrollment}')")
-        
-        # Search for matching certificate
-        matched_certificate = None
-        best_match_score = 0
-        
-        logger.info(f"Searching {len(certificates)} certificates in database")
-        
-        for cert in certificates:
-            cert_name = normalize_string(cert.get("student_name", ""))
-            cert_enrollment = normalize_string(cert.get("enrollment_number", ""))
-            
-            logger.debug(f"Comparing with DB cert - Name: '{cert.get('student_name', '')}' (normalized: '{cert_name}'), Enrollment: '{cert.get('enrollment_number', '')}' (normalized: '{cert_enrollment}')")
-            
-            # Check for exact match on enrollment (most reliable)
-            if cert_enrollment == normalized_input_enrollment:
-                # If enrollment matches, check name similarity
-                # Calculate simple match score
-                name_match = cert_name == normalized_input_name
-                
-                if name_match:
-                    # Perfect match
-                    matched_certificate = cert
-                    best_match_score = 1.0
-                    break
-                elif best_match_score < 0.9:
-                    # Enrollment matches but name doesn't - still count as match
-                    # (enrollment is unique identifier)
-                    matched_certificate = cert
-                    best_match_score = 0.9
-            
-            # Also check if name matches and enrollment is similar
-            # (in case of OCR errors in enrollment number)
-            elif cert_name == normalized_input_name:
-                # Check if enrollment numbers are similar
-                if best_match_score < 0.7:
-                    # Name matches - possible match
-                    matched_certificate = cert
-                    best_match_score = 0.7
-        
-        if matched_certificate:
-            # Use the calculated match score as confidence
-            confidence_score = best_match_score
+        logger.info(f"Verification request - Name: '{student_name}', Enrollment: '{enrollment_number}'")
+        
+        # Index lookup: enrollment + name, enrollment only, then name only
+        matched_certificate, best_match_score = registry.match(student_name, enrollment_number)
+        
+        logger.info(f"Verification score: {best_match_score}")
+        
+        return jsonify(build_verification_result(student_name, enrollment_number, matched_certificate, best_match_score))
             
+    except Exception as e:
+        logger.error(f"Error verifying certificate: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/verify/batch', methods=['POST'])
+def verify_certificates_batch():
+    """
+    Verify many certificates in one request.
+    
+    Body: {"items": [{"student_name", "enrollment_number", "cgpa"?}, ...]} (or a bare list).
+    Results come back in input order, each with its "index". Send
+    `Accept: application/x-ndjson` (or ?stream=1) to receive one JSON line per
+    item as it is resolved instead of a single JSON document.
+    """
+    try:
+        request_data = request.get_json(silent=True)
+        items = request_data.get('items') if isinstance(request_data, dict) else request_data
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({"success": False, "error": "items must be a non-empty list"}), 400
+        
+        if len(items) > VERIFY_BATCH_MAX_ITEMS:
             return jsonify({
-                "success": True,
-                "verified": True,
-                "confidence_score": confidence_score,
-                "matched_certificate": {
-                    "student_name": matched_certificate["student_name"],
-                    "enrollment_number": matched_certificate["enrollment_number"],
-                    "degree": matched_certificate["degree"],
-                    "branch": matched_certificate["branch"],
-                    "graduation_date": matched_certificate["graduation_date"],
-                    "cgpa": matched_certificate["cgpa"],
-                    "certificate_number": matched_certificate["certificate_number"],
-                    "status": matched_certificate["status"]
-                },
-                "verification_timestamp": datetime.utcnow().isoformat()
-            })
-        else:
+                "success": False,
+                "error": f"Too many items (max {VERIFY_BATCH_MAX_ITEMS})"
+            }), 413
+        
+        def parse(item):
+            if not isinstance(item, dict):
+                return "", ""
+            return (str(item.get('student_name') or '').strip(),
+                    str(item.get('enrollment_number') or '').strip())
+        
+        queries = [parse(item) for item in items]
+        
+        def results():
+            # One registry view for the whole batch; invalid items are not looked up
+            matches = registry.match_many(q for q in queries if q[0] and q[1])
+            for index, (item, (student_name, enrollment_number)) in enumerate(zip(items, queries)):
+                if not student_name or not enrollment_number:
+                    yield {
+                        "index": index,
+                        "success": False,
+                        "error": "student_name and enrollment_number are required"
+                    }
+                    continue
+                matched_certificate, score = next(matches)
+                result = build_verification_result(
+                    student_name, enrollment_number, matched_certificate, score, cgpa=item.get('cgpa')
+                )
+                yield {"index": index, **result}
+        
+        logger.info(f"Batch verification request - {len(items)} items")
+        
+        if request.args.get('stream') in ('1', 'true') or 'application/x-ndjson' in request.headers.get('Accept', ''):
+            return Response(
+                stream_with_context(json.dumps(result) + '\n' for result in results()),
+                mimetype='application/x-ndjson'
+            )
+        
+        batch_results = list(results())
+        return jsonify({
+            "success": True,
+            "results": batch_results,
+            "total": len(batch_results),
+            "verified": sum(1 for r in batch_results if r.get("verified"))
+        })
+        
+    except Exception as e:
+        logger.error(f"Error verifying certificate batch: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/match')
+def match_candidates():
+    """Top-k fuzzy candidates for an OCR-noisy name and/or enrollment number"""
+    try:
+        student_name = request.args.get('student_name', '').strip()
+        enrollment_number = request.args.get('enrollment_number', '').strip()
+        k = min(max(request.args.get('k', 5, type=int), 1), 50)
+        
+        if not student_name and not enrollment_number:
             return jsonify({
-                "success": True,
-                "verified": False,
-                "confidence_score": 0.0,
-                "message": "Certificate not found in university database",
-                "searched_for": {
-                    "student_name": student_name,
-                    "enrollment_number": enrollment_number
-                },
-                "verification_timestamp": datetime.utcnow().isoformat()
-            })
-            
+                "success": False,
+                "error": "student_name or enrollment_number is required"
+            }), 400
+        
+        candidates = registry.candidates(student_name, enrollment_number, k=k)
+        return jsonify({
+            "success": True,
+            "candidates": candidates,
+            "total": len(candidates),
+            "searched_for": {
+                "student_name": student_name,
+                "enrollment_number": enrollment_number
+            }
+        })
+        
     except Exception as e:
-        logger.error(f"Error verifying certificate: {e}")
+        logger.error(f"Error finding match candidates: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+def parse_timestamp(value):
+    """Parse an ISO timestamp like metadata.last_updated ('2025-10-27T09:14:09.664913Z')"""
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
 @app.route('/api/stats')
 def get_university_stats():
     """Get university statistics"""
     try:
-        data = load_certificates()
-        certificates = data.get("certificates", [])
-        metadata = data.get("metadata", {})
-        
-        # Calculate statistics
-        branches = {}
-        years = {}
-        degrees = {}
-        
-        for cert in certificates:
-            branch = cert.get("branch", "Unknown")
-            year = cert.get("academic_year", "Unknown")
-            degree = cert.get("degree", "Unknown")
-            
-            branches[branch] = branches.get(branch, 0) + 1
-            years[year] = years.get(year, 0) + 1
-            degrees[degree] = degrees.get(degree, 0) + 1
+        # Counters are maintained by the registry on insert, so this is O(number of buckets)
+        stats = registry.stats()
+        metadata = stats["metadata"]
+        last_updated = metadata.get("last_updated")
         
-        return jsonify({
+        response = jsonify({
             "success": True,
             "statistics": {
-                "total_certificates": len(certificates),
-                "branches": branches,
-                "academic_years": years,
-                "degrees": degrees,
-                "last_updated": metadata.get("last_updated"),
+                "total_certificates": stats["total_certificates"],
+                "branches": stats["branches"],
+                "academic_years": stats["academic_years"],
+                "degrees": stats["degrees"],
+                "last_updated": last_updated,
                 "university_info": {
                     "name": metadata.get("university_name"),
                     "code": metadata.get("university_code"),
@@ -593,6 +646,14 @@ def get_university_stats():
             }
         })
         
+        # Let dashboard polling revalidate with If-None-Match / If-Modified-Since (304)
+        response.set_etag(hashlib.sha1(f"{stats['total_certificates']}:{last_updated}".encode()).hexdigest()[:16])
+        modified = parse_timestamp(last_updated)
+        if modified:
+            response.last_modified = modified
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+        
     except Exception as e:
         logger.error(f"Error getting statistics: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
@@ -608,46 +669,26 @@ def serve_admin_page():
 
 @app.route('/api/search')
 def search_certificates():
-    """Search certificates by various parameters"""
+    """Search certificates by name/enrollment/certificate number, branch and year (paginated)"""
     try:
         # Get search parameters
-        query = request.args.get('q', '').lower()
-        branch = request.args.get('branch', '').lower()
-        year = request.args.get('year', '')
-        
-        data = load_certificates()
-        certificates = data.get("certificates", [])
+        query = request.args.get('q', '').strip().lower()
+        branch = request.args.get('branch', '').strip().lower()
+        year = request.args.get('year', '').strip()
+        limit = min(max(request.args.get('limit', SEARCH_DEFAULT_LIMIT, type=int), 1), SEARCH_MAX_LIMIT)
+        offset = max(request.args.get('offset', 0, type=int), 0)
         
-        # Filter certificates
-        results = []
-        for cert in certificates:
-            match = False
-            
-            # Text search in name, enrollment, or certificate number
-            if query:
-                searchable_text = f"{cert.get('student_name', '')} {cert.get('enrollment_number', '')} {cert.get('certificate_number', '')}".lower()
-                if query in searchable_text:
-                    match = True
-            
-            # Branch filter
-            if branch and branch in cert.get('branch', '').lower():
-                match = True
-            
-            # Year filter
-            if year and year in cert.get('academic_year', ''):
-                match = True
-                
-            # If no filters provided, return all
-            if not query and not branch and not year:
-                match = True
-            
-            if match:
-                results.append(cert)
+        # Query tokens prefix-match name/enrollment/certificate number; all filters must match
+        results, total, facets = registry.search(query, branch=branch, year=year, limit=limit, offset=offset)
         
         return jsonify({
             "success": True,
             "results": results,
-            "total": len(results),
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "has_more": offset + len(results) < total,
+            "facets": facets,
             "search_params": {
                 "query": query,
                 "branch": branch,
@@ -0,0 +1,154 @@
+"""
+Fuzzy matching index for OCR-noisy enrollment numbers and student names.
+
+OCR regularly swaps look-alike characters (0/O, 1/I/L, 8/B, 5/S, 2/Z, 6/G),
+so "231B225" comes back as "2318225". Keys are indexed by the trigrams of
+their confusion-folded form (every look-alike mapped to one character), so
+such swaps do not change the trigrams at all, and candidates are ranked with
+an edit distance in which a look-alike substitution costs CONFUSION_COST
+instead of 1. A search only scores the keys that share the most (rarest)
+trigrams with the query, never the whole registry.
+"""
+from collections import Counter
+
+CONFUSION_COST = 0.25
+
+# Look-alike groups; each character folds to the first one of its group
+_CONFUSION_GROUPS = ("0o", "1il", "8b", "5s", "2z", "6g")
+_FOLD = str.maketrans({ch: group[0] for group in _CONFUSION_GROUPS for ch in group[1:]})
+_CONFUSABLE = {
+    (a, b) for group in _CONFUSION_GROUPS for a in group for b in group if a != b
+}
+
+
+def fold_confusions(s):
+    """Map OCR look-alike characters to a single representative ('231b225' -> '2318225')."""
+    return s.translate(_FOLD)
+
+
+def ocr_edit_distance(a, b, max_distance=None):
+    """
+    Levenshtein distance where OCR look-alike substitutions cost CONFUSION_COST.
+
+    With max_distance set, gives up early and returns a value above it as soon
+    as the distance is known to exceed the bound.
+    """
+    if a == b:
+        return 0.0
+    if max_distance is not None and abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1.0
+    previous = [float(j) for j in range(len(b) + 1)]
+    for i, ca in enumerate(a, 1):
+        left = row_min = float(i)
+        current = [left]
+        for j, cb in enumerate(b, 1):
+            cost = previous[j - 1]
+            if ca != cb:
+                cost += CONFUSION_COST if (ca, cb) in _CONFUSABLE else 1.0
+            if previous[j] + 1.0 < cost:
+                cost = previous[j] + 1.0
+            if left + 1.0 < cost:
+                cost = left + 1.0
+            current.append(cost)
+            left = cost
+            if cost < row_min:
+                row_min = cost
+        if max_distance is not None and row_min > max_distance:
+            return max_distance + 1.0
+        previous = current
+    return previous[-1]
+
+
+def ocr_similarity(a, b, min_similarity=0.0):
+    """1.0 for identical strings, falling towards 0.0 with OCR-weighted edits."""
+    longest = max(len(a), len(b))
+    if longest == 0:
+        return 0.0
+    max_distance = (1.0 - min_similarity) * longest if min_similarity > 0 else None
+    return max(0.0, 1.0 - ocr_edit_distance(a, b, max_distance) / longest)
+
+
+def _trigrams(s):
+    padded = f"  {s} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    """
+    Trigram index over normalized keys, each mapping to the items stored under it.
+
+    Args:
+        max_posting: Trigrams shared by more keys than this are skipped once
+            rarer trigrams have produced candidates (they carry little signal)
+        candidate_pool: Number of top trigram-overlap keys that get scored
+    """
+
+    def __init__(self, max_posting=1000, candidate_pool=10):
+        self.max_posting = max_posting
+        self.candidate_pool = candidate_pool
+        self._keys = []         # key id -> normalized key
+        self._items = []        # key id -> items stored under the key
+        self._key_ids = {}      # normalized key -> key id
+        self._folded = {}       # folded key -> [key id, ...] (keys differing only by look-alikes)
+        self._postings = {}     # trigram of folded key -> [key id, ...]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, key, item):
+        if not key:
+            return
+        key_id = self._key_ids.get(key)
+        if key_id is not None:
+            self._items[key_id].append(item)
+            return
+        key_id = len(self._keys)
+        self._key_ids[key] = key_id
+        self._keys.append(key)
+        self._items.append([item])
+        folded = fold_confusions(key)
+        self._folded.setdefault(folded, []).append(key_id)
+        for gram in _trigrams(folded):
+            self._postings.setdefault(gram, []).append(key_id)
+
+    def search(self, key, k=5, min_similarity=0.0):
+        """
+        Return up to k (key, items, similarity) tuples, best first.
+
+        Keys that differ from the query only by look-alike characters are
+        found with one dict lookup; the trigram search runs only when they do
+        not fill the k results.
+
+        Args:
+            key: Normalized query key
+            k: Maximum number of candidates
+            min_similarity: Drop candidates scoring below this
+        """
+        if not key or not self._keys:
+            return []
+
+        folded = fold_confusions(key)
+        scored = {}
+
+        def score(key_ids):
+            for key_id in key_ids:
+                if key_id not in scored:
+                    similarity = ocr_similarity(key, self._keys[key_id], min_similarity)
+                    if similarity >= min_similarity:
+                        scored[key_id] = similarity
+
+        score(self._folded.get(folded, ()))
+        if len(scored) < k:
+            postings = sorted(
+                (self._postings[gram] for gram in _trigrams(folded) if gram in self._postings),
+                key=len
+            )
+            overlap = Counter()
+            for posting in postings:
+                if len(posting) > self.max_posting and overlap:
+                    break
+                overlap.update(posting)
+            score(key_id for key_id, _ in overlap.most_common(self.candidate_pool))
+
+        best = sorted(scored.items(), key=lambda entry: entry[1], reverse=True)[:k]
+        return [(self._keys[key_id], self._items[key_id], similarity) for key_id, similarity in best]
@@ -0,0 +1,16 @@
+"""
+Text normalization shared by the portal's registry, storage and matching code.
+
+Patterns are compiled once at import time; records are normalized once when
+they are loaded or inserted, never per verification request.
+"""
+import re
+
+_WHITESPACE = re.compile(r'\s+')
+_NON_ALNUM = re.compile(r'[^a-z0-9\s]')
+
+
+def normalize_string(s):
+    """Normalize string by removing extra spaces, special chars, and lowercasing"""
+    s = _WHITESPACE.sub(' ', (s or "").lower().strip())
+    return _NON_ALNUM.sub('', s)
@@ -0,0 +1,356 @@
+"""
+Process-resident certificate registry for the university portal.
+
+The registry keeps the parsed certificate database in memory together with
+hash indexes on normalized enrollment number, normalized student name and
+certificate number, so lookups are O(1) instead of a scan over every record,
+plus OCR-tolerant fuzzy indexes (fuzzy.py) for near misses.
+The data is read through a storage backend (see storage.py) and only
+reloaded when the backend's signature changes, for example after another
+gunicorn worker saved a new certificate.
+"""
+from contextlib import contextmanager
+import logging
+import threading
+
+from fuzzy import FuzzyIndex, fold_confusions, ocr_similarity
+from normalization import normalize_string
+from search import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+
+class IndexedCertificate:
+    """A certificate with its normalized keys, computed once at load/insert time."""
+    __slots__ = ("certificate", "name_key", "enrollment_key")
+
+    def __init__(self, certificate):
+        self.certificate = certificate
+        self.name_key = normalize_string(certificate.get("student_name", ""))
+        self.enrollment_key = normalize_string(certificate.get("enrollment_number", ""))
+
+
+class RegistryIndexes:
+    """All in-memory lookup structures for one load of the registry."""
+
+    def __init__(self):
+        self.by_enrollment = {}
+        self.by_name = {}
+        self.by_certificate_number = {}
+        self.fuzzy_enrollment = FuzzyIndex()
+        self.fuzzy_name = FuzzyIndex()
+        self.search = SearchIndex()
+        # /api/stats counters, maintained on insert
+        self.branch_counts = {}
+        self.year_counts = {}
+        self.degree_counts = {}
+
+    def add(self, cert, record_id, bulk=False):
+        entry = IndexedCertificate(cert)
+        self.by_enrollment.setdefault(entry.enrollment_key, []).append(entry)
+        self.by_name.setdefault(entry.name_key, []).append(entry)
+        if cert.get("certificate_number"):
+            self.by_certificate_number[cert["certificate_number"]] = cert
+        self.fuzzy_enrollment.add(entry.enrollment_key, entry)
+        self.fuzzy_name.add(entry.name_key, entry)
+        self.search.add(record_id, cert, keep_sorted=not bulk)
+        for counts, field in ((self.branch_counts, "branch"), (self.year_counts, "academic_year"),
+                              (self.degree_counts, "degree")):
+            value = cert.get(field, "Unknown")
+            counts[value] = counts.get(value, 0) + 1
+
+
+class CertificateRegistry:
+    def __init__(self, storage, fuzzy_min_similarity=0.8):
+        self.storage = storage
+        self.fuzzy_min_similarity = fuzzy_min_similarity
+        self._lock = threading.RLock()
+        self._signature = None
+        self._loaded = False
+        self._certificates = []
+        self._metadata = {}
+        self._indexes = RegistryIndexes()
+
+    # --- Loading ---
+
+    def refresh(self):
+        """
+        Reload from storage if the stored data changed since the last load.
+
+        If reading storage fails, the previous data and signature are kept
+        (the next call retries); only a registry that never loaded raises.
+        """
+        signature = self.storage.signature()
+        if self._loaded and signature == self._signature:
+            return
+        with self._lock:
+            if self._loaded and signature == self._signature:
+                return
+            try:
+                # Inserts by other workers are applied in place when the backend can list them
+                changes = self.storage.changes_since(self._signature) if self._loaded else None
+                data = self.storage.load() if changes is None else None
+            except Exception as e:
+                if self._signature is None:
+                    raise
+                logger.error(f"Certificate registry reload failed, serving the previous data: {e}")
+                return
+            if changes is not None:
+                certificates, last_updated, self._signature = changes
+                for cert in certificates:
+                    self._append(cert, last_updated)
+                logger.info(f"Certificate registry applied {len(certificates)} new certificates")
+                return
+            self._rebuild(data)
+            self._signature = signature
+            self._loaded = True
+            logger.info(f"Certificate registry loaded: {len(self._certificates)} certificates ({self.storage.name})")
+
+    def _rebuild(self, data):
+        # Build fresh indexes first so concurrent readers never see a partial one
+        certificates = data.get("certificates", [])
+        indexes = RegistryIndexes()
+        for record_id, cert in enumerate(certificates):
+            indexes.add(cert, record_id, bulk=True)
+        indexes.search.sort_tokens()
+        self._indexes = indexes
+        self._certificates = certificates
+        self._metadata = data.get("metadata", {})
+
+    def _append(self, cert, last_updated):
+        self._certificates.append(cert)
+        self._indexes.add(cert, len(self._certificates) - 1)
+        self._metadata['total_certificates'] = len(self._certificates)
+        if last_updated:
+            self._metadata['last_updated'] = last_updated
+
+    @contextmanager
+    def _reading(self):
+        """
+        Refresh, then yield the current indexes with the lock held.
+
+        _append grows the live indexes in place, so readers hold the lock to
+        never iterate a dict that an incremental reload is adding keys to.
+        """
+        self.refresh()
+        with self._lock:
+            yield self._indexes
+
+    # --- Writes ---
+
+    def add_certificate(self, certificate, last_updated):
+        """
+        Persist a new certificate and add it to the in-memory indexes.
+
+        If another process wrote to storage since our last load, the insert is
+        left to the next refresh(), whose changes_since() picks up both writes.
+        """
+        self.refresh()
+        with self._lock:
+            before, after = self.storage.add_certificate(certificate, last_updated)
+            if before == self._signature:
+                self._append(certificate, last_updated)
+                self._signature = after
+        return certificate
+
+    # --- Read access ---
+
+    @property
+    def certificates(self):
+        self.refresh()
+        return self._certificates
+
+    @property
+    def metadata(self):
+        self.refresh()
+        with self._lock:
+            return dict(self._metadata)
+
+    def snapshot(self):
+        """Return a copy of the database that callers may modify and save."""
+        self.refresh()
+        with self._lock:
+            return {"certificates": list(self._certificates), "metadata": dict(self._metadata)}
+
+    def page(self, cursor=0, limit=100):
+        """
+        One page of certificates in insertion order.
+
+        Certificates are only ever appended, so a position is a stable cursor.
+
+        Returns:
+            tuple: (certificates, next cursor or None at the end, total)
+        """
+        self.refresh()
+        with self._lock:
+            certificates = self._certificates
+            total = len(certificates)
+            page = certificates[cursor:cursor + limit]
+        next_cursor = cursor + len(page)
+        return page, (next_cursor if next_cursor < total else None), total
+
+    def iter_certificates(self, cursor=0):
+        """
+        Yield the certificates present when iteration starts, one at a time.
+
+        Holds a reference to the current list instead of copying it, so
+        streaming the whole registry costs constant extra memory.
+        """
+        self.refresh()
+        with self._lock:
+            certificates = self._certificates
+            total = len(certificates)
+        for position in range(cursor, total):
+            yield certificates[position]
+
+    def stats(self):
+        """Per-branch, per-year and per-degree counts plus metadata, without touching the records."""
+        with self._reading() as indexes:
+            return {
+                "total_certificates": len(self._certificates),
+                "branches": dict(indexes.branch_counts),
+                "academic_years": dict(indexes.year_counts),
+                "degrees": dict(indexes.degree_counts),
+                "metadata": dict(self._metadata)
+            }
+
+    def search(self, query="", branch="", year="", limit=50, offset=0):
+        """
+        Inverted-index search (see search.py) with AND semantics across the query and filters.
+
+        Returns:
+            tuple: (page of certificates, total matches, facet counts over all matches)
+        """
+        with self._reading() as indexes:
+            certificates = self._certificates
+            record_ids = indexes.search.search(query, {"branch": branch, "academic_year": year})
+
+            if record_ids is None:
+                # No filters: every record matches and the stats counters are the facets
+                return certificates[offset:offset + limit], len(certificates), {
+                    "branch": dict(indexes.branch_counts),
+                    "academic_year": dict(indexes.year_counts)
+                }
+
+            facets = {"branch": {}, "academic_year": {}}
+            for record_id in record_ids:
+                cert = certificates[record_id]
+                for field, counts in facets.items():
+                    value = cert.get(field, "Unknown")
+                    counts[value] = counts.get(value, 0) + 1
+            page = [certificates[record_id] for record_id in record_ids[offset:offset + limit]]
+            return page, len(record_ids), facets
+
+    def find_by_enrollment(self, enrollment_number):
+        """Certificates whose normalized enrollment number matches, in database order."""
+        with self._reading() as indexes:
+            return [entry.certificate for entry in indexes.by_enrollment.get(normalize_string(enrollment_number), [])]
+
+    def find_by_name(self, student_name):
+        """Certificates whose normalized student name matches, in database order."""
+        with self._reading() as indexes:
+            return [entry.certificate for entry in indexes.by_name.get(normalize_string(student_name), [])]
+
+    def find_by_certificate_number(self, certificate_number):
+        with self._reading() as indexes:
+            return indexes.by_certificate_number.get(certificate_number)
+
+    # --- Verification matching ---
+
+    def _match(self, indexes, student_name, enrollment_number):
+        normalized_name = normalize_string(student_name)
+        normalized_enrollment = normalize_string(enrollment_number)
+
+        # Check for exact match on enrollment (most reliable)
+        enrollment_matches = indexes.by_enrollment.get(normalized_enrollment, [])
+        for entry in enrollment_matches:
+            if entry.name_key == normalized_name:
+                # Perfect match
+                return entry.certificate, 1.0
+
+        if enrollment_matches:
+            # Enrollment matches but name doesn't - still count as match
+            # (enrollment is unique identifier)
+            return enrollment_matches[0].certificate, 0.9
+
+        # Name matches but enrollment doesn't
+        name_matches = indexes.by_name.get(normalized_name, [])
+        best_cert, best_score = (name_matches[0].certificate, 0.7) if name_matches else (None, 0.0)
+
+        # OCR-tolerant enrollment match: the 1.0 / 0.9 tiers scaled by similarity.
+        # Enrollment numbers are sequential, so a near miss is only trusted when
+        # every difference is an OCR look-alike swap (231B225 read as 2318225)
+        # or the name matches too; otherwise "231B226" would verify the
+        # neighbouring student. Other near misses are left to /api/match.
+        folded_enrollment = fold_confusions(normalized_enrollment)
+        for _, entries, similarity in indexes.fuzzy_enrollment.search(
+            normalized_enrollment, k=1, min_similarity=self.fuzzy_min_similarity
+        ):
+            for entry in entries:
+                same_name = entry.name_key == normalized_name
+                if not same_name and fold_confusions(entry.enrollment_key) != folded_enrollment:
+                    continue
+                score = round(similarity * (1.0 if same_name else 0.9), 3)
+                if score > best_score:
+                    best_cert, best_score = entry.certificate, score
+
+        # A near-miss name with an unrelated enrollment number is another
+        # person; name-only fuzzy lookups are left to /api/match as well
+        return best_cert, best_score
+
+    def match(self, student_name, enrollment_number):
+        """
+        Find the best matching certificate for verification.
+
+        Returns:
+            tuple: (certificate or None, score) where score is 1.0 for an
+            enrollment + name match, 0.9 for enrollment only, 0.7 for name
+            only, and proportionally less for OCR-tolerant (fuzzy) enrollment matches
+        """
+        with self._reading() as indexes:
+            return self._match(indexes, student_name, enrollment_number)
+
+    def match_many(self, items):
+        """
+        Match (student_name, enrollment_number) pairs in one pass over a single
+        registry view. Yields (certificate or None, score) in input order.
+        """
+        self.refresh()
+        indexes = self._indexes
+        for student_name, enrollment_number in items:
+            # Locked per item, not across the yield: the caller may be streaming
+            with self._lock:
+                result = self._match(indexes, student_name, enrollment_number)
+            yield result
+
+    def candidates(self, student_name, enrollment_number, k=5):
+        """
+        Top-k fuzzy candidates for a (possibly OCR-garbled) name and enrollment.
+
+        Returns:
+            list: dicts with the certificate, per-field similarities and their
+            mean as "score", best first
+        """
+        normalized_name = normalize_string(student_name)
+        normalized_enrollment = normalize_string(enrollment_number)
+
+        found = {}
+        with self._reading() as indexes:
+            for index in (indexes.fuzzy_enrollment, indexes.fuzzy_name):
+                query = normalized_enrollment if index is indexes.fuzzy_enrollment else normalized_name
+                for _, entries, _ in index.search(query, k=k):
+                    for entry in entries:
+                        found[id(entry)] = entry
+
+        results = []
+        for entry in found.values():
+            enrollment_similarity = ocr_similarity(normalized_enrollment, entry.enrollment_key)
+            name_similarity = ocr_similarity(normalized_name, entry.name_key)
+            results.append({
+                "certificate": entry.certificate,
+                "enrollment_similarity": round(enrollment_similarity, 3),
+                "name_similarity": round(name_similarity, 3),
+                "score": round((enrollment_similarity + name_similarity) / 2, 3)
+            })
+        results.sort(key=lambda result: result["score"], reverse=True)
+        return results[:k]
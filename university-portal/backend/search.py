@@ -0,0 +1,92 @@
+"""
+Inverted index behind the portal's /api/search.
+
+Student names, enrollment numbers and certificate numbers are split into
+lowercase alphanumeric tokens ("JUET/CSE/2023/001" -> juet, cse, 2023, 001).
+Each token maps to the ids of the records containing it, and a sorted list
+of the distinct tokens answers prefix queries with a binary search. Branch
+and academic year get facet postings of their own. A query intersects the
+postings of every term and filter (AND semantics), smallest set first.
+"""
+import bisect
+import re
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+SEARCH_FIELDS = ("student_name", "enrollment_number", "certificate_number")
+FACET_FIELDS = ("branch", "academic_year")
+
+
+def tokenize(s):
+    return _TOKEN.findall((s or "").lower())
+
+
+class SearchIndex:
+    def __init__(self):
+        self._postings = {}     # token -> [record id, ...] in insertion order
+        self._tokens = []       # sorted distinct tokens, for prefix lookups
+        self._facets = {field: {} for field in FACET_FIELDS}   # field -> value -> [record id, ...]
+
+    def add(self, record_id, cert, keep_sorted=True):
+        """
+        Index one record. Bulk loads pass keep_sorted=False and call
+        sort_tokens() once at the end instead of inserting every new token
+        into the sorted list (quadratic over a full build).
+        """
+        tokens = set()
+        for field in SEARCH_FIELDS:
+            tokens.update(tokenize(cert.get(field)))
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                self._postings[token] = [record_id]
+                if keep_sorted:
+                    bisect.insort(self._tokens, token)
+            else:
+                posting.append(record_id)
+        for field, values in self._facets.items():
+            values.setdefault(cert.get(field, "Unknown"), []).append(record_id)
+
+    def sort_tokens(self):
+        self._tokens = sorted(self._postings)
+
+    def _prefix_matches(self, prefix):
+        ids = set()
+        i = bisect.bisect_left(self._tokens, prefix)
+        while i < len(self._tokens) and self._tokens[i].startswith(prefix):
+            ids.update(self._postings[self._tokens[i]])
+            i += 1
+        return ids
+
+    def _facet_matches(self, field, value):
+        # Case-insensitive substring over the (few) distinct facet values,
+        # so "computer" still selects "Computer Science Engineering"
+        value = value.lower()
+        ids = set()
+        for facet_value, posting in self._facets[field].items():
+            if value in str(facet_value).lower():
+                ids.update(posting)
+        return ids
+
+    def search(self, query="", facets=None):
+        """
+        Record ids matching every query token (as a prefix) and every facet filter.
+
+        Args:
+            query: Free text; each token must prefix-match a name, enrollment or certificate number token
+            facets: {field: value} filters for FACET_FIELDS; empty values are ignored
+
+        Returns:
+            list: Matching record ids in insertion order, or None when there is
+            nothing to filter on (every record matches)
+        """
+        candidate_sets = [self._prefix_matches(token) for token in tokenize(query)]
+        for field, value in (facets or {}).items():
+            if value:
+                candidate_sets.append(self._facet_matches(field, value))
+        if not candidate_sets:
+            return None
+
+        candidate_sets.sort(key=len)
+        matched = candidate_sets[0].intersection(*candidate_sets[1:])
+        return sorted(matched)
@@ -0,0 +1,615 @@
+"""
+Storage backends for the university portal certificate database.
+
+- JSONStorage keeps the original certificates.json format for small demos.
+  Inserts go to an append-only journal that is compacted into the file in
+  the background.
+- SQLiteStorage keeps one row per certificate in a WAL-mode SQLite database
+  with indexed enrollment number, student name and certificate number
+  columns. An insert is a single-row transaction that concurrent gunicorn
+  workers can share safely.
+
+Both backends expose the interface used by CertificateRegistry:
+    load()                              -> {"certificates": [...], "metadata": {...}}
+    signature()                         -> changes whenever the stored data changes
+    add_certificate(cert, last_updated) -> (signature_before, signature_after)
+    changes_since(signature)            -> (new certificates, last_updated, signature),
+                                           or None when a full load() is needed
+    allocate_ids(count)                 -> first number of a block of `count` new ids
+
+Certificate ids ("JUET001", ...) come from a persisted monotonic sequence
+that is allocated atomically across worker processes, so inserts never scan
+the database for the current maximum and concurrent inserts cannot collide.
+"""
+from contextlib import contextmanager
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from normalization import normalize_string
+
+logger = logging.getLogger(__name__)
+
+_LOCK_SH = fcntl.LOCK_SH if fcntl else 1
+_LOCK_EX = fcntl.LOCK_EX if fcntl else 2
+# Journal and sequence files hold raw bytes; Windows would otherwise translate newlines
+_O_BINARY = getattr(os, 'O_BINARY', 0)
+
+
+def _lock_fd(fd, mode=_LOCK_EX):
+    """Block until `fd` is locked. msvcrt has no shared locks, so a shared lock is exclusive on Windows."""
+    if fcntl:
+        fcntl.flock(fd, mode)
+        return
+    os.lseek(fd, 0, os.SEEK_SET)
+    while True:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            time.sleep(0.01)
+
+
+def _unlock_fd(fd):
+    if fcntl:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return
+    os.lseek(fd, 0, os.SEEK_SET)
+    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def _pread(fd, size, offset):
+    if hasattr(os, 'pread'):
+        return os.pread(fd, size, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, size)
+
+
+def _pwrite(fd, data, offset):
+    if hasattr(os, 'pwrite'):
+        return os.pwrite(fd, data, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.write(fd, data)
+
+
+def _fsync_dir(path):
+    """Make a rename in `path` durable (directories cannot be opened for fsync on Windows)."""
+    if os.name == 'nt':
+        return
+    dir_fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+CERTIFICATE_ID_PREFIX = "JUET"
+
+
+def format_certificate_id(number):
+    return f"{CERTIFICATE_ID_PREFIX}{str(number).zfill(3)}"
+
+
+def max_certificate_number(certificate_ids):
+    """Largest numeric suffix among JUET### ids (used once to seed the sequence)."""
+    max_id = 0
+    for cert_id in certificate_ids:
+        if cert_id and cert_id.startswith(CERTIFICATE_ID_PREFIX):
+            try:
+                max_id = max(max_id, int(cert_id[len(CERTIFICATE_ID_PREFIX):]))
+            except ValueError:
+                continue
+    return max_id
+
+
+class JSONStorage:
+    """
+    certificates.json snapshot plus an append-only JSONL journal of inserts.
+
+    An insert appends one line to the journal and waits for it to be fsynced,
+    so its cost does not depend on the size of the database. Threads that
+    insert while an fsync is in flight share the next one (group commit).
+    A background thread periodically folds the journal into the snapshot;
+    load() replays whatever is still in the journal on top of the snapshot.
+    Replay skips certificate ids that are already present, so a crash between
+    replacing the snapshot and truncating the journal cannot duplicate rows.
+
+    Compaction also keeps the journal it folded, in DB_FILE's .compacted.jsonl
+    next to the snapshot, so changes_since() can continue across one
+    compaction instead of forcing every worker to reload the whole snapshot.
+    """
+    name = "json"
+
+    def __init__(self, db_file, fsync_window=0.0, compact_interval=60, compact_entries=500):
+        self.db_file = db_file
+        self.journal_file = os.path.splitext(db_file)[0] + '.journal.jsonl'
+        self.compacted_file = os.path.splitext(db_file)[0] + '.compacted.jsonl'
+        self.lock_file = db_file + '.lock'
+        self.sequence_file = db_file + '.seq'
+        self.fsync_window = fsync_window
+        self.compact_interval = compact_interval
+        self.compact_entries = compact_entries
+        self._fd = None
+        self._fd_pid = None
+        self._write_lock = threading.Lock()
+        self._sync_cond = threading.Condition()
+        self._syncing = False
+        self._written = 0
+        self._synced = 0
+        self._pending_entries = 0
+        self._compact_wakeup = threading.Event()
+        self._compactor_pid = None
+        self.stats = {"appends": 0, "fsyncs": 0, "compactions": 0}
+
+    # --- File locking (serializes appends and compaction across workers) ---
+
+    @contextmanager
+    def _file_lock(self, mode=_LOCK_EX):
+        with open(self.lock_file, 'a') as lock:
+            _lock_fd(lock.fileno(), mode)
+            try:
+                yield
+            finally:
+                _unlock_fd(lock.fileno())
+
+    def _journal_fd(self):
+        if self._fd is None or self._fd_pid != os.getpid():
+            self._fd = os.open(self.journal_file, os.O_RDWR | os.O_APPEND | os.O_CREAT | _O_BINARY, 0o644)
+            self._fd_pid = os.getpid()
+        return self._fd
+
+    # --- Reading ---
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+            return st.st_ino, st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return None
+
+    def signature(self):
+        return self._stat(self.db_file), self._stat(self.journal_file)
+
+    def _read_snapshot(self):
+        try:
+            with open(self.db_file, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"certificates": [], "metadata": {}}
+
+    def _replay_journal(self, data):
+        """Apply journal entries to a snapshot. Returns the number of entries applied."""
+        try:
+            with open(self.journal_file, 'rb') as f:
+                lines = f.read().split(b'\n')
+        except FileNotFoundError:
+            return 0
+
+        certificates = data.setdefault("certificates", [])
+        metadata = data.setdefault("metadata", {})
+        known_ids = {cert.get("id") for cert in certificates}
+        applied = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Torn write from a crash; the insert was never acknowledged
+                logger.warning("Skipping incomplete journal entry")
+                continue
+            certificate = entry["certificate"]
+            if certificate.get("id") not in known_ids:
+                certificates.append(certificate)
+                known_ids.add(certificate.get("id"))
+                applied += 1
+            metadata['last_updated'] = entry.get("last_updated", metadata.get('last_updated'))
+        metadata['total_certificates'] = len(certificates)
+        return applied
+
+    def load(self):
+        """Snapshot plus journal. Read errors propagate: an empty result would look like an empty registry."""
+        try:
+            with self._file_lock(_LOCK_SH):
+                data = self._read_snapshot()
+                replayed = self._replay_journal(data)
+        except Exception as e:
+            logger.error(f"Error loading certificates: {e}")
+            raise
+        if replayed:
+            logger.info(f"Replayed {replayed} journal entries from {self.journal_file}")
+        return data
+
+    def _folded_since(self, signature, snapshot):
+        """
+        Journal bytes after `signature` that the last compaction folded into
+        `snapshot`, or None if that compaction did not start from `signature`.
+        """
+        try:
+            with open(self.compacted_file, 'rb') as f:
+                header = json.loads(f.readline())
+                folded = f.read()
+        except (FileNotFoundError, ValueError):
+            return None
+        old_snapshot, old_journal = signature
+        from_snapshot, from_journal = (tuple(sig) if sig else None for sig in header["from"])
+        if tuple(header["to"]) != snapshot or old_snapshot != from_snapshot:
+            return None
+        if old_journal is None:
+            return folded
+        if from_journal is None or old_journal[0] != from_journal[0] or old_journal[2] > len(folded):
+            return None
+        return folded[old_journal[2]:]
+
+    def changes_since(self, signature):
+        """Journal entries appended since `signature`; None when a full load() is needed."""
+        if not signature:
+            return None
+        with self._file_lock(_LOCK_SH):
+            current = self.signature()
+            (old_snapshot, old_journal), (new_snapshot, new_journal) = signature, current
+            if new_journal is None:
+                return None
+            chunk = b''
+            start = 0
+            if old_snapshot != new_snapshot:
+                # Compacted since: the entries we missed are in the compaction record
+                chunk = self._folded_since(signature, new_snapshot)
+                if chunk is None:
+                    return None
+            elif old_journal is not None:
+                if old_journal[0] != new_journal[0] or new_journal[2] < old_journal[2]:
+                    return None
+                start = old_journal[2]
+            with open(self.journal_file, 'rb') as f:
+                f.seek(start)
+                chunk += f.read(new_journal[2] - start)
+
+        certificates = []
+        last_updated = None
+        for line in chunk.split(b'\n'):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logger.warning("Skipping incomplete journal entry")
+                continue
+            certificates.append(entry["certificate"])
+            last_updated = entry.get("last_updated", last_updated)
+        return certificates, last_updated, current
+
+    # --- Inserts ---
+
+    def add_certificate(self, certificate, last_updated):
+        line = (json.dumps({"op": "add", "certificate": certificate, "last_updated": last_updated}) + '\n').encode('utf-8')
+        with self._write_lock, self._file_lock():
+            before = self.signature()
+            fd = self._journal_fd()
+            self._truncate_torn_tail(fd)
+            os.write(fd, line)
+            after = self.signature()
+            self._written += 1
+            seq = self._written
+        self._wait_durable(seq)
+
+        self.stats["appends"] += 1
+        self._pending_entries += 1
+        if self._pending_entries >= self.compact_entries:
+            self._compact_wakeup.set()
+        return before, after
+
+    def _truncate_torn_tail(self, fd):
+        """Drop a partial last line left by a crash so the next entry starts on its own line."""
+        size = os.fstat(fd).st_size
+        if size == 0 or _pread(fd, 1, size - 1) == b'\n':
+            return
+        keep = _pread(fd, size, 0).rfind(b'\n') + 1
+        os.ftruncate(fd, keep)
+        logger.warning(f"Truncated incomplete journal entry ({size - keep} bytes)")
+
+    def _wait_durable(self, seq):
+        """Group commit: return once entry `seq` has been fsynced, sharing fsyncs between threads."""
+        with self._sync_cond:
+            while self._synced < seq:
+                if self._syncing:
+                    self._sync_cond.wait()
+                    continue
+                self._syncing = True
+                self._sync_cond.release()
+                try:
+                    if self.fsync_window:
+                        # Give concurrent inserts a moment to join this fsync
+                        time.sleep(self.fsync_window)
+                    target = self._written
+                    os.fsync(self._journal_fd())
+                    self.stats["fsyncs"] += 1
+                finally:
+                    self._sync_cond.acquire()
+                    self._syncing = False
+                self._synced = max(self._synced, target)
+                self._sync_cond.notify_all()
+
+    # --- Id sequence ---
+
+    def allocate_ids(self, count=1):
+        """
+        Reserve `count` consecutive certificate numbers and return the first.
+
+        The last allocated number lives in DB_FILE.seq and is read-modify-written
+        under an exclusive flock, so every worker process gets a distinct block.
+        The file is seeded from the highest existing id the first time.
+        """
+        fd = os.open(self.sequence_file, os.O_RDWR | os.O_CREAT | _O_BINARY, 0o644)
+        try:
+            _lock_fd(fd)
+            raw = _pread(fd, 64, 0).strip()
+            if raw:
+                last = int(raw)
+            else:
+                last = max_certificate_number(cert.get("id", "") for cert in self.load()["certificates"])
+            value = str(last + count).encode('ascii')
+            os.ftruncate(fd, 0)
+            _pwrite(fd, value, 0)
+            os.fsync(fd)
+            return last + 1
+        finally:
+            os.close(fd)
+
+    # --- Compaction ---
+
+    def compact(self):
+        """
+        Fold the journal into the certificates.json snapshot.
+
+        Returns:
+            int: Number of journal entries folded (0 if there was nothing to do)
+        """
+        with self._file_lock():
+            before = self.signature()
+            if before[1] is None or before[1][2] == 0:
+                return 0
+
+            data = self._read_snapshot()
+            folded = self._replay_journal(data)
+            with open(self.journal_file, 'rb') as f:
+                journal = f.read()
+
+            tmp_file = self.db_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.db_file)
+            _fsync_dir(os.path.dirname(os.path.abspath(self.db_file)))
+
+            # Record what was folded so readers at `before` can catch up without a
+            # full load. Not fsynced: a missing or stale record only costs a reload.
+            header = {"from": before, "to": self._stat(self.db_file)}
+            with open(self.compacted_file + '.tmp', 'wb') as f:
+                f.write(json.dumps(header).encode('utf-8') + b'\n' + journal)
+            os.replace(self.compacted_file + '.tmp', self.compacted_file)
+
+            # Appenders keep O_APPEND descriptors, so truncate in place rather than replace
+            os.truncate(self.journal_file, 0)
+
+        self._pending_entries = 0
+        self.stats["compactions"] += 1
+        logger.info(f"Compacted {folded} journal entries into {self.db_file}")
+        return folded
+
+    def _compactor_loop(self):
+        while True:
+            self._compact_wakeup.wait(self.compact_interval)
+            self._compact_wakeup.clear()
+            try:
+                self.compact()
+            except Exception as e:
+                logger.error(f"Journal compaction failed: {e}")
+
+    def start_compactor(self):
+        """Start the background compaction thread for this process (idempotent, fork-aware)."""
+        if self._compactor_pid == os.getpid():
+            return
+        self._compactor_pid = os.getpid()
+        threading.Thread(target=self._compactor_loop, name="journal-compactor", daemon=True).start()
+
+
+class SQLiteStorage:
+    name = "sqlite"
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        """Return this thread's connection, opening a new one after a fork."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            self._ensure_schema(conn)
+        return conn
+
+    def _ensure_schema(self, conn):
+        with self._schema_lock:
+            if self._initialized:
+                return
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS certificates (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT NOT NULL UNIQUE,
+                    student_name TEXT,
+                    name_key TEXT,
+                    enrollment_number TEXT,
+                    enrollment_key TEXT,
+                    certificate_number TEXT,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_certificates_enrollment_key ON certificates (enrollment_key);
+                CREATE INDEX IF NOT EXISTS idx_certificates_name_key ON certificates (name_key);
+                CREATE INDEX IF NOT EXISTS idx_certificates_certificate_number ON certificates (certificate_number);
+                CREATE TABLE IF NOT EXISTS metadata (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO counters (name, value) VALUES ('generation', 0);
+            """)
+            self._initialized = True
+
+    _SIGNATURE_SQL = (
+        "SELECT (SELECT value FROM counters WHERE name = 'generation'), "
+        "(SELECT COALESCE(MAX(seq), 0) FROM certificates)"
+    )
+
+    def signature(self, conn=None):
+        """(generation, last seq): inserts advance the seq, bulk imports bump the generation."""
+        return tuple((conn or self._connect()).execute(self._SIGNATURE_SQL).fetchone())
+
+    def load(self):
+        conn = self._connect()
+        certificates = [json.loads(row[0]) for row in conn.execute("SELECT data FROM certificates ORDER BY seq")]
+        metadata = {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM metadata")}
+        metadata['total_certificates'] = len(certificates)
+        return {"certificates": certificates, "metadata": metadata}
+
+    def changes_since(self, signature):
+        """Rows inserted since `signature`; None after an import rewrote existing rows."""
+        if not signature:
+            return None
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            current = self.signature(conn)
+            if current[0] != signature[0]:
+                return None
+            certificates = [
+                json.loads(row[0])
+                for row in conn.execute("SELECT data FROM certificates WHERE seq > ? ORDER BY seq", (signature[1],))
+            ]
+            row = conn.execute("SELECT value FROM metadata WHERE key = 'last_updated'").fetchone()
+        finally:
+            conn.execute("COMMIT")
+        return certificates, json.loads(row[0]) if row else None, current
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM certificates").fetchone()[0]
+
+    @staticmethod
+    def _row(certificate):
+        return (
+            certificate["id"],
+            certificate.get("student_name"),
+            normalize_string(certificate.get("student_name", "")),
+            certificate.get("enrollment_number"),
+            normalize_string(certificate.get("enrollment_number", "")),
+            certificate.get("certificate_number"),
+            json.dumps(certificate),
+        )
+
+    def allocate_ids(self, count=1):
+        """Reserve `count` consecutive certificate numbers from the counters table and return the first."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT value FROM counters WHERE name = 'certificate_id'").fetchone()
+            if row is None:
+                # First allocation: seed the sequence from the ids already stored
+                last = max_certificate_number(r[0] for r in conn.execute("SELECT id FROM certificates"))
+                conn.execute("INSERT INTO counters (name, value) VALUES ('certificate_id', ?)", (last + count,))
+            else:
+                last = row[0]
+                conn.execute("UPDATE counters SET value = value + ? WHERE name = 'certificate_id'", (count,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return last + 1
+
+    def add_certificate(self, certificate, last_updated):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = self.signature(conn)
+            conn.execute(
+                "INSERT INTO certificates "
+                "(id, student_name, name_key, enrollment_number, enrollment_key, certificate_number, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._row(certificate)
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES ('last_updated', ?)",
+                (json.dumps(last_updated),)
+            )
+            after = self.signature(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return before, after
+
+    def import_data(self, data):
+        """
+        Import a certificates.json document. Certificates are upserted by id,
+        so running the import twice does not create duplicates.
+
+        Returns:
+            int: Number of certificates imported
+        """
+        certificates = data.get("certificates", [])
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO certificates "
+                "(id, student_name, name_key, enrollment_number, enrollment_key, certificate_number, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET student_name = excluded.student_name, "
+                "name_key = excluded.name_key, enrollment_number = excluded.enrollment_number, "
+                "enrollment_key = excluded.enrollment_key, certificate_number = excluded.certificate_number, "
+                "data = excluded.data",
+                [self._row(cert) for cert in certificates]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in data.get("metadata", {}).items()
+                 if key != 'total_certificates']
+            )
+            # Keep an existing sequence ahead of the imported ids
+            conn.execute(
+                "UPDATE counters SET value = MAX(value, ?) WHERE name = 'certificate_id'",
+                (max_certificate_number(cert.get("id", "") for cert in certificates),)
+            )
+            conn.execute("UPDATE counters SET value = value + 1 WHERE name = 'generation'")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(certificates)
+
+
+def create_storage(backend, json_file, sqlite_file, **json_options):
+    """Build the storage backend selected by STORAGE_BACKEND ('json' or 'sqlite')."""
+    if backend == "sqlite":
+        return SQLiteStorage(sqlite_file)
+    if backend != "json":
+        logger.warning(f"Unknown storage backend '{backend}', falling back to json")
+    return JSONStorage(json_file, **json_options)
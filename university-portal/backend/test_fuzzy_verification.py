@@ -0,0 +1,79 @@
+"""
+Regression tests for OCR-tolerant matching in /api/verify.
+
+A near-miss enrollment number may only verify a certificate when the
+difference is an OCR look-alike swap or the student name matches as well;
+a different digit or an extra digit names a different (sequential) student.
+A near-miss name alone never verifies.
+
+Run with:  python -m pytest test_fuzzy_verification.py
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp()
+_db_file = os.path.join(_tmp_dir, "certificates.json")
+shutil.copy(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "database", "certificates.json"),
+    _db_file
+)
+os.environ["DB_FILE"] = _db_file
+os.environ["STORAGE_BACKEND"] = "json"
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp_dir, "uploads")
+
+from app import app
+
+
+def _verify(student_name, enrollment_number):
+    client = app.test_client()
+    response = client.post(
+        "/api/verify",
+        data=json.dumps({"student_name": student_name, "enrollment_number": enrollment_number}),
+        content_type="application/json"
+    )
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_other_digit_with_wrong_name_is_not_verified():
+    result = _verify("Totally Other", "231B226")
+    assert result["verified"] is False
+
+
+def test_extra_digit_with_wrong_name_is_not_verified():
+    result = _verify("Totally Other", "231B2250")
+    assert result["verified"] is False
+
+
+def test_near_miss_name_with_unrelated_enrollment_is_not_verified():
+    result = _verify("Prashanth Singh", "111A111")
+    assert result["verified"] is False
+
+
+def test_ocr_lookalike_enrollment_still_verifies():
+    result = _verify("Someone Else", "2318225")
+    assert result["verified"] is True
+    assert result["matched_certificate"]["enrollment_number"] == "231B225"
+
+
+def test_near_miss_with_matching_name_still_verifies():
+    result = _verify("Prashant Singh", "231B226")
+    assert result["verified"] is True
+
+
+def test_near_miss_is_still_a_match_candidate():
+    client = app.test_client()
+    response = client.get("/api/match?student_name=Totally%20Other&enrollment_number=231B226")
+    enrollments = [c["certificate"]["enrollment_number"] for c in response.get_json()["candidates"]]
+    assert "231B225" in enrollments
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
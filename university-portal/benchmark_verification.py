@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark /api/verify matching against a large certificate registry.
+
+Seeds a throwaway certificates.json with N synthetic records, loads it into
+the in-memory registry and times verification lookups of several kinds
+(exact, enrollment only, name only, OCR-garbled enrollment, miss). For
+comparison it also times the original per-request linear scan, which
+normalized every stored record on every request.
+
+Usage:
+  python benchmark_verification.py [--records 100000] [--queries 2000] [--legacy-queries 20]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(script_dir, 'backend'))
+
+from registry import CertificateRegistry
+from storage import JSONStorage
+
+FIRST_NAMES = ["Prashant", "Rahul", "Amit", "Priya", "Neha", "Rohit", "Ankit", "Sneha", "Vikas", "Pooja",
+               "Arjun", "Kavya", "Ishaan", "Meera", "Karan", "Divya", "Sahil", "Ritika", "Aman", "Tanvi"]
+LAST_NAMES = ["Singh", "Sharma", "Verma", "Gupta", "Patel", "Kumar", "Yadav", "Jain", "Mishra", "Rao"]
+OCR_SWAPS = {"0": "O", "1": "I", "B": "8", "5": "S", "2": "Z"}
+
+
+def make_certificates(count):
+    random.seed(42)
+    certificates = []
+    for i in range(count):
+        certificates.append({
+            "id": f"JUET{i + 1:03d}",
+            "student_name": f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)} {i}",
+            "enrollment_number": f"{random.randint(19, 24)}{random.randint(1, 3)}B{i:06d}",
+            "degree": "Bachelor of Technology",
+            "branch": "Computer Science Engineering",
+            "graduation_date": "2023-06-15",
+            "cgpa": f"{random.uniform(5, 10):.1f}",
+            "academic_year": "2019-2023",
+            "certificate_number": f"JUET/CSE/2023/{i + 1:03d}",
+            "status": "Active"
+        })
+    return certificates
+
+
+def ocr_garble(enrollment):
+    return "".join(OCR_SWAPS.get(ch, ch) for ch in enrollment)
+
+
+def legacy_verify(certificates, student_name, enrollment_number):
+    """The original /api/verify loop: normalize every record on every request."""
+    def normalize_string(s):
+        import re
+        s = s.lower().strip()
+        s = re.sub(r'\s+', ' ', s)
+        s = re.sub(r'[^a-z0-9\s]', '', s)
+        return s
+
+    name, enrollment = normalize_string(student_name), normalize_string(enrollment_number)
+    matched, best = None, 0
+    for cert in certificates:
+        cert_name = normalize_string(cert.get("student_name", ""))
+        cert_enrollment = normalize_string(cert.get("enrollment_number", ""))
+        if cert_enrollment == enrollment:
+            if cert_name == name:
+                return cert, 1.0
+            elif best < 0.9:
+                matched, best = cert, 0.9
+        elif cert_name == name and best < 0.7:
+            matched, best = cert, 0.7
+    return matched, best
+
+
+def time_queries(fn, queries):
+    start = time.perf_counter()
+    for student_name, enrollment_number in queries:
+        fn(student_name, enrollment_number)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100000, help="Synthetic certificates to seed")
+    parser.add_argument("--queries", type=int, default=2000, help="Timed lookups per query kind")
+    parser.add_argument("--legacy-queries", type=int, default=20, help="Lookups timed with the legacy linear scan")
+    args = parser.parse_args()
+
+    certificates = make_certificates(args.records)
+    tmp_dir = tempfile.mkdtemp(prefix="portal_bench_")
+    db_file = os.path.join(tmp_dir, "certificates.json")
+    with open(db_file, "w") as f:
+        json.dump({"certificates": certificates, "metadata": {}}, f)
+
+    registry = CertificateRegistry(JSONStorage(db_file))
+    start = time.perf_counter()
+    registry.refresh()
+    print(f"Records: {args.records}")
+    print(f"Registry load + index build: {time.perf_counter() - start:.2f}s")
+
+    random.seed(7)
+    sample = random.sample(certificates, min(args.queries, len(certificates)))
+    kinds = {
+        "exact (name + enrollment)": [(c["student_name"], c["enrollment_number"]) for c in sample],
+        "enrollment only": [("Someone Else", c["enrollment_number"]) for c in sample],
+        "name only": [(c["student_name"], "000X000") for c in sample],
+        "OCR-garbled enrollment": [(c["student_name"], ocr_garble(c["enrollment_number"])) for c in sample],
+        "miss": [(f"Nobody {i}", f"99Q{i:06d}") for i in range(len(sample))],
+    }
+
+    print(f"\n{'query kind':<28}{'indexed':>12}")
+    for kind, queries in kinds.items():
+        per_query = time_queries(registry.match, queries)
+        print(f"{kind:<28}{per_query * 1e6:>10.1f}us")
+
+    batch = kinds["exact (name + enrollment)"]
+    start = time.perf_counter()
+    list(registry.match_many(batch))
+    print(f"{'match_many (batch)':<28}{(time.perf_counter() - start) / len(batch) * 1e6:>10.1f}us")
+
+    if args.legacy_queries:
+        queries = kinds["exact (name + enrollment)"][:args.legacy_queries]
+        legacy = time_queries(lambda name, enrollment: legacy_verify(certificates, name, enrollment), queries)
+        indexed = time_queries(registry.match, queries)
+        print(f"\nLegacy linear scan: {legacy * 1e3:.1f}ms per verification "
+              f"({legacy / indexed:.0f}x slower than indexed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+One-shot import of database/certificates.json into the SQLite storage backend.
+
+Certificates are upserted by id, so the import can be re-run safely.
+
+Usage:
+    python import_certificates.py [--source database/certificates.json] [--db /tmp/certificates.db]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(script_dir, 'backend'))
+
+from storage import SQLiteStorage
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Import certificates.json into SQLite")
+    parser.add_argument('--source', default=os.path.join(script_dir, 'database', 'certificates.json'))
+    parser.add_argument('--db', default=os.environ.get('SQLITE_DB_FILE', '/tmp/certificates.db'))
+    args = parser.parse_args()
+
+    print("🎓 University Certificate Database Import")
+    print("=" * 50)
+
+    try:
+        with open(args.source, 'r') as f:
+            data = json.load(f)
+    except Exception as e:
+        print(f"❌ Could not read {args.source}: {e}")
+        sys.exit(1)
+
+    storage = SQLiteStorage(args.db)
+    imported = storage.import_data(data)
+    print(f"✅ Imported {imported} certificates from {args.source}")
+    print(f"   SQLite database: {args.db}")
+    print(f"   Total certificates in DB: {storage.count()}")